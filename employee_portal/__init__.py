@@ -22,7 +22,8 @@ def create_app(config_object: str | type[object] = DevelopmentConfig) -> Flask:
     db.init_app(app)
     login_manager.init_app(app)
     csrf.init_app(app)
-    socketio.init_app(app, cors_allowed_origins="*")
+    # A message queue lets every worker emit to clients connected to the others
+    socketio.init_app(app, cors_allowed_origins="*", message_queue=app.config.get("SOCKETIO_MESSAGE_QUEUE"))
 
     login_manager.login_view = "auth.login"
     login_manager.login_message_category = "warning"
@@ -41,5 +42,50 @@ def create_app(config_object: str | type[object] = DevelopmentConfig) -> Flask:
     with app.app_context():
         db.create_all()
 
+        from .utils.job_categories import ensure_role_categories
+        from .utils.job_requirements import ensure_requirement_hashes, ensure_requirement_links
+        from .utils.job_search import ensure_search_index
+
+        ensure_requirement_links()
+        ensure_requirement_hashes()
+        ensure_search_index()
+        ensure_role_categories()
+
+    from .utils.fragment_cache import init_fragment_cache
+
+    init_fragment_cache(app)
+
+    from .utils.candidate_index import init_candidate_index
+
+    init_candidate_index(app)
+
+    from .services.job_sync_scheduler import init_job_sync
+
+    init_job_sync(app)
+
+    from .services.application_outbox_service import init_application_outbox
+
+    init_application_outbox(app)
+
+    from .services.application_reconciler import init_application_reconciler
+
+    init_application_reconciler(app)
+
     return app
 
+
+def start_background_tasks(app: Flask) -> None:
+    """
+    Start the enabled background loops. Only server entry points call this,
+    so CLI commands never run a loop next to the work they do themselves.
+    """
+    from .services.application_outbox_service import start_outbox_dispatcher
+    from .services.application_reconciler import start_reconciler
+    from .services.job_sync_scheduler import start_job_sync_scheduler
+
+    if app.config.get("JOB_SYNC_SCHEDULER_ENABLED", True):
+        start_job_sync_scheduler(app)
+    if app.config.get("APPLICATION_OUTBOX_DISPATCHER_ENABLED", True):
+        start_outbox_dispatcher(app)
+    if app.config.get("APPLICATION_RECONCILER_ENABLED", True):
+        start_reconciler(app)
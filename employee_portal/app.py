@@ -3,7 +3,7 @@ from __future__ import annotations
 import argparse
 import os
 
-from employee_portal import create_app, socketio
+from employee_portal import create_app, socketio, start_background_tasks
 
 DEFAULT_PORT = int(os.getenv("FLASK_RUN_PORT", "5000"))
 
@@ -31,6 +31,7 @@ app = create_app()
 def main() -> None:
     args = parser.parse_args()
     app.debug = args.debug or app.config.get("DEBUG", False)
+    start_background_tasks(app)
     socketio.run(
         app,
         host=args.host,
@@ -25,6 +25,29 @@ class Config:
     REMEMBER_COOKIE_SECURE = False
     SOCKETIO_MESSAGE_QUEUE = os.getenv("SOCKETIO_MESSAGE_QUEUE")
     JOB_CACHE_TIMEOUT = int(os.getenv("JOB_CACHE_TIMEOUT", "900"))
+    # Jobs are refreshed by a background scheduler, never inside a request
+    JOB_SYNC_SCHEDULER_ENABLED = os.getenv("JOB_SYNC_SCHEDULER_ENABLED", "true").lower() == "true"
+    JOB_SYNC_POLL_SECONDS = int(os.getenv("JOB_SYNC_POLL_SECONDS", "30"))
+    JOB_SYNC_LEASE_SECONDS = int(os.getenv("JOB_SYNC_LEASE_SECONDS", "300"))
+    # Fetch only jobs updated since the last sync, with a full resync (which
+    # also removes deleted postings) every JOB_SYNC_FULL_INTERVAL seconds
+    JOB_SYNC_DELTA_ENABLED = os.getenv("JOB_SYNC_DELTA_ENABLED", "true").lower() == "true"
+    JOB_SYNC_FULL_INTERVAL = int(os.getenv("JOB_SYNC_FULL_INTERVAL", "3600"))
+    JOB_SYNC_BATCH_SIZE = int(os.getenv("JOB_SYNC_BATCH_SIZE", "500"))
+    # Trace the sync's allocations with tracemalloc (slow; the process peak RSS is always logged)
+    JOB_SYNC_TRACK_MEMORY = os.getenv("JOB_SYNC_TRACK_MEMORY", "false").lower() == "true"
+    # Jobs per page of the job list (keyset-paginated)
+    JOB_LIST_PAGE_SIZE = int(os.getenv("JOB_LIST_PAGE_SIZE", "24"))
+    # Comma-separated emails of the accounts allowed on the admin dashboard and exports
+    ADMIN_EMAILS = frozenset(
+        email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()
+    )
+    # Applications per page of the admin dashboard (keyset-paginated)
+    ADMIN_PAGE_SIZE = int(os.getenv("ADMIN_PAGE_SIZE", "50"))
+    # Per-user page fragments (dashboard); in-process LRU unless a Redis URL is set
+    FRAGMENT_CACHE_URL = os.getenv("FRAGMENT_CACHE_URL")
+    FRAGMENT_CACHE_TTL = int(os.getenv("FRAGMENT_CACHE_TTL", "300"))
+    FRAGMENT_CACHE_MAX_ENTRIES = int(os.getenv("FRAGMENT_CACHE_MAX_ENTRIES", "1000"))
     
     # Employer API Configuration
     # Set EMPLOYER_API_ENABLED=true to use real API instead of mock
@@ -32,6 +55,44 @@ class Config:
     EMPLOYER_API_BASE_URL = os.getenv("EMPLOYER_API_BASE_URL", "")
     EMPLOYER_API_KEY = os.getenv("EMPLOYER_API_KEY", "")
     EMPLOYER_API_TIMEOUT = int(os.getenv("EMPLOYER_API_TIMEOUT", "10"))
+    # Requested jobs per page (sent as page_size); 0 leaves paging to the API
+    EMPLOYER_API_PAGE_SIZE = int(os.getenv("EMPLOYER_API_PAGE_SIZE", "0"))
+    # Shared keep-alive pool; idempotent calls retry with jittered backoff
+    EMPLOYER_API_POOL_SIZE = int(os.getenv("EMPLOYER_API_POOL_SIZE", "10"))
+    EMPLOYER_API_MAX_RETRIES = int(os.getenv("EMPLOYER_API_MAX_RETRIES", "3"))
+    EMPLOYER_API_BACKOFF_SECONDS = float(os.getenv("EMPLOYER_API_BACKOFF_SECONDS", "0.5"))
+    EMPLOYER_API_BACKOFF_MAX = float(os.getenv("EMPLOYER_API_BACKOFF_MAX", "8"))
+    # Stop calling the API for a while after this many failures in a row
+    EMPLOYER_API_BREAKER_THRESHOLD = int(os.getenv("EMPLOYER_API_BREAKER_THRESHOLD", "5"))
+    EMPLOYER_API_BREAKER_RESET_SECONDS = float(os.getenv("EMPLOYER_API_BREAKER_RESET_SECONDS", "30"))
+    # Total seconds one web request may spend on Employer API calls; 0 = no limit
+    EMPLOYER_API_REQUEST_BUDGET = float(os.getenv("EMPLOYER_API_REQUEST_BUDGET", "5"))
+    # Company ratings are refetched once expired; fallback ratings sooner
+    COMPANY_RATING_TTL = int(os.getenv("COMPANY_RATING_TTL", str(7 * 24 * 3600)))
+    COMPANY_RATING_FALLBACK_TTL = int(os.getenv("COMPANY_RATING_FALLBACK_TTL", str(24 * 3600)))
+    # Signs POST /applications/webhooks/status; the webhook is off when unset
+    EMPLOYER_WEBHOOK_SECRET = os.getenv("EMPLOYER_WEBHOOK_SECRET", "")
+    EMPLOYER_WEBHOOK_TOLERANCE_SECONDS = int(os.getenv("EMPLOYER_WEBHOOK_TOLERANCE_SECONDS", "300"))
+    EMPLOYER_WEBHOOK_MAX_UPDATES = int(os.getenv("EMPLOYER_WEBHOOK_MAX_UPDATES", "1000"))
+    # Applications are delivered to the Employer API from an outbox table
+    APPLICATION_OUTBOX_DISPATCHER_ENABLED = (
+        os.getenv("APPLICATION_OUTBOX_DISPATCHER_ENABLED", "true").lower() == "true"
+    )
+    APPLICATION_OUTBOX_POLL_SECONDS = int(os.getenv("APPLICATION_OUTBOX_POLL_SECONDS", "10"))
+    APPLICATION_OUTBOX_CONCURRENCY = int(os.getenv("APPLICATION_OUTBOX_CONCURRENCY", "4"))
+    # >1 sends applications through POST /applications/batch when the API has it
+    APPLICATION_OUTBOX_BATCH_SIZE = int(os.getenv("APPLICATION_OUTBOX_BATCH_SIZE", "1"))
+    APPLICATION_OUTBOX_CLAIM_LIMIT = int(os.getenv("APPLICATION_OUTBOX_CLAIM_LIMIT", "100"))
+    APPLICATION_OUTBOX_CLAIM_SECONDS = int(os.getenv("APPLICATION_OUTBOX_CLAIM_SECONDS", "120"))
+    APPLICATION_OUTBOX_MAX_ATTEMPTS = int(os.getenv("APPLICATION_OUTBOX_MAX_ATTEMPTS", "8"))
+    APPLICATION_OUTBOX_BACKOFF_SECONDS = int(os.getenv("APPLICATION_OUTBOX_BACKOFF_SECONDS", "30"))
+    APPLICATION_OUTBOX_BACKOFF_MAX = int(os.getenv("APPLICATION_OUTBOX_BACKOFF_MAX", "3600"))
+    # Job ids accepted by one POST /applications/apply/bulk
+    BULK_APPLY_MAX_JOBS = int(os.getenv("BULK_APPLY_MAX_JOBS", "50"))
+    # Applications whose job disappeared are reattached in the background
+    APPLICATION_RECONCILER_ENABLED = os.getenv("APPLICATION_RECONCILER_ENABLED", "true").lower() == "true"
+    APPLICATION_RECONCILE_POLL_SECONDS = int(os.getenv("APPLICATION_RECONCILE_POLL_SECONDS", "300"))
+    APPLICATION_RECONCILE_BATCH_SIZE = int(os.getenv("APPLICATION_RECONCILE_BATCH_SIZE", "500"))
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
     PROFILE_UPLOAD_FOLDER = os.getenv(
@@ -53,6 +114,9 @@ class DevelopmentConfig(Config):
 class TestingConfig(Config):
     TESTING = True
     DEBUG = False
+    JOB_SYNC_SCHEDULER_ENABLED = False
+    APPLICATION_OUTBOX_DISPATCHER_ENABLED = False
+    APPLICATION_RECONCILER_ENABLED = False
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
 
 
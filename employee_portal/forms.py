@@ -2,6 +2,7 @@ from flask_wtf import FlaskForm
 from flask_wtf.file import FileAllowed, FileField
 from wtforms import (
     BooleanField,
+    DateField,
     PasswordField,
     SelectField,
     StringField,
@@ -78,6 +79,12 @@ class ApplicationForm(FlaskForm):
 
 
 class JobFilterForm(FlaskForm):
+    """Submitted by GET so filtered pages can be linked and paged."""
+
+    class Meta:
+        csrf = False
+
+    keywords = StringField("Keywords", validators=[Optional(), Length(max=200)])
     role = StringField("Role", validators=[Optional(), Length(max=120)])
     location = StringField("Location", validators=[Optional(), Length(max=120)])
     skill = StringField("Skill", validators=[Optional(), Length(max=120)])
@@ -85,6 +92,7 @@ class JobFilterForm(FlaskForm):
         "Sort By",
         choices=[
             ("match_score", "Best Match"),
+            ("relevance", "Search Relevance"),
             ("rating", "Highest Rated"),
             ("posted_at", "Most Recent"),
             ("title", "Title"),
@@ -94,6 +102,20 @@ class JobFilterForm(FlaskForm):
     submit = SubmitField("Filter")
 
 
+class ApplicationFilterForm(FlaskForm):
+    """Admin dashboard filters; submitted by GET like JobFilterForm."""
+
+    class Meta:
+        csrf = False
+
+    status = SelectField("Status", choices=[("", "Any status")], default="")
+    job = StringField("Job", validators=[Optional(), Length(max=120)])
+    company = StringField("Company", validators=[Optional(), Length(max=120)])
+    submitted_from = DateField("Submitted From", validators=[Optional()])
+    submitted_to = DateField("Submitted To", validators=[Optional()])
+    submit = SubmitField("Filter")
+
+
 class MessageForm(FlaskForm):
     content = TextAreaField(
         "Message",
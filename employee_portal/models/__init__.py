@@ -1,18 +1,33 @@
 from .application import Application
+from .application_outbox import ApplicationOutbox
+from .company_rating import CompanyRating
 from .connection import Connection
 from .connection_request import ConnectionRequest
 from .job import Job
+from .job_match_score import JobMatchScore
+from .job_role_category import JobRoleCategory
 from .message import Message
 from .profile import Profile
+from .requirement import Certification, Skill, job_certifications, job_skills
+from .sync_state import SyncState
 from .user import User
 
 __all__ = [
     "Application",
+    "ApplicationOutbox",
+    "Certification",
+    "CompanyRating",
     "Connection",
     "ConnectionRequest",
     "Job",
+    "JobMatchScore",
+    "JobRoleCategory",
     "Message",
     "Profile",
+    "Skill",
+    "SyncState",
     "User",
+    "job_certifications",
+    "job_skills",
 ]
 
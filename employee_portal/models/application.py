@@ -9,6 +9,9 @@ class Application(db.Model):
     __tablename__ = "applications"
     __table_args__ = (
         UniqueConstraint("user_id", "job_id", name="uq_applications_user_job"),
+        # Keyset pagination of the admin dashboard, unfiltered and by status
+        db.Index("ix_applications_submitted_at_id", "submitted_at", "id"),
+        db.Index("ix_applications_status_submitted_at", "status", "submitted_at", "id"),
     )
 
     id = db.Column(db.Integer, primary_key=True)
@@ -29,9 +32,18 @@ class Application(db.Model):
     certifications = db.Column(db.JSON, nullable=False)
     status = db.Column(db.String(50), default="submitted", nullable=False)
     submitted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    # Id the Employer API assigned once the application was delivered
+    external_id = db.Column(db.String(64), index=True)
 
     user = db.relationship("User", back_populates="applications")
     job = db.relationship("Job", back_populates="applications")
+    outbox = db.relationship(
+        "ApplicationOutbox",
+        back_populates="application",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
     def __repr__(self) -> str:
         return f"<Application user={self.user_id} job={self.job_id}>"
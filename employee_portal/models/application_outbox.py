@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import uuid4
+
+from employee_portal import db
+
+
+class ApplicationOutbox(db.Model):
+    """
+    An application waiting to be delivered to the Employer API.
+    Written in the same transaction as the Application and drained by the
+    background dispatcher; ``idempotency_key`` is sent with every attempt so
+    a retried delivery is never stored twice upstream.
+    """
+
+    __tablename__ = "application_outbox"
+    __table_args__ = (
+        db.Index("ix_application_outbox_due", "status", "next_attempt_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    application_id = db.Column(
+        db.Integer,
+        db.ForeignKey("applications.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    idempotency_key = db.Column(
+        db.String(64),
+        default=lambda: uuid4().hex,
+        nullable=False,
+        unique=True,
+    )
+    payload = db.Column(db.JSON, nullable=False)
+    status = db.Column(db.String(20), default="pending", nullable=False)  # pending, sent, failed
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    last_error = db.Column(db.Text)
+    # Set while a dispatcher is delivering the row; expired claims are retaken
+    claimed_by = db.Column(db.String(64))
+    claimed_until = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = db.Column(db.DateTime)
+
+    application = db.relationship("Application", back_populates="outbox")
+
+    def __repr__(self) -> str:
+        return f"<ApplicationOutbox application={self.application_id} status={self.status}>"
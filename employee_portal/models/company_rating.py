@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from employee_portal import db
+
+
+class CompanyRating(db.Model):
+    """
+    Last fetched rating of a company, shared by all its jobs. Each row
+    expires on its own (``expires_at``); only expired companies are fetched
+    again, and ``Job.rating`` is copied from here with one UPDATE.
+    """
+
+    __tablename__ = "company_ratings"
+
+    company = db.Column(db.String(120), primary_key=True)  # Job.company
+    rating = db.Column(db.Float, nullable=False)
+    source = db.Column(db.String(40), nullable=False)  # yelp, web_scrape, ai_fallback, ...
+    reviews = db.Column(db.JSON, default=list, nullable=False)  # Review snippets
+    fetched_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<CompanyRating {self.company} {self.rating} ({self.source})>"
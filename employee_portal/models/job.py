@@ -1,22 +1,46 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import load_only, query_expression, with_expression
 
 from employee_portal import db
 
+# Job cards show at most this many characters of the description
+EXCERPT_LENGTH = 140
+# Jobs posted longer ago than this are archived
+ARCHIVE_AFTER = timedelta(days=30)
+
+
+def archive_threshold() -> datetime:
+    """Jobs posted before this are archived; later ones are active."""
+    return datetime.utcnow() - ARCHIVE_AFTER
+
 
 class Job(db.Model):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Keyset pagination of the job list (see routes/job_routes.py)
+        db.Index("ix_jobs_posted_at_id", "posted_at", "id"),
+        db.Index("ix_jobs_title_id", "title", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     external_id = db.Column(db.String(64), unique=True, nullable=False, index=True)
     title = db.Column(db.String(120), nullable=False)
     role = db.Column(db.String(120), nullable=False, index=True)
+    # utils.helpers.role_slug(role), written by the sync; groups job categories
+    role_slug = db.Column(db.String(120), index=True)
     company = db.Column(db.String(120), nullable=False, default="Acme Corp")
     location = db.Column(db.String(120), nullable=False, index=True)
     description = db.Column(db.Text, nullable=False)
     required_skills = db.Column(db.JSON, default=list, nullable=False)
     required_certifications = db.Column(db.JSON, default=list, nullable=False)
     rating = db.Column(db.Float, default=3.0)  # Company rating (1-5 stars)
-    match_score = db.Column(db.Float, default=0.0)  # Profile match score (0-5)
+    content_version = db.Column(db.Integer, default=1, nullable=False)
+    content_hash = db.Column(db.String(64))  # SHA-256 of the normalized feed payload
+    # utils.job_requirements.requirements_hash(skills, certifications); None on placeholders
+    requirements_hash = db.Column(db.String(64), index=True)
+    # Normalized skills/certs/keywords/role written at sync time for the scorer
+    match_features = db.Column(db.JSON)
     posted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     last_synced_at = db.Column(
         db.DateTime,
@@ -30,7 +54,43 @@ class Job(db.Model):
         back_populates="job",
         cascade="all, delete-orphan",
     )
+    match_scores = db.relationship(
+        "JobMatchScore",
+        back_populates="job",
+        cascade="all, delete-orphan",
+    )
+    # Only set by queries using job_card_options(); None otherwise
+    description_excerpt = query_expression()
 
     def __repr__(self) -> str:
         return f"<Job {self.title} ({self.role})>"
 
+
+def job_card_options() -> tuple:
+    """
+    Query options for list views: load only the columns job cards show and
+    the start of the description (one character more than EXCERPT_LENGTH,
+    so templates can tell whether it was cut), not the full text and JSON.
+    """
+    return (
+        load_only(
+            Job.id,
+            Job.external_id,
+            Job.title,
+            Job.role,
+            Job.company,
+            Job.location,
+            Job.rating,
+            Job.posted_at,
+        ),
+        with_expression(Job.description_excerpt, db.func.substr(Job.description, 1, EXCERPT_LENGTH + 1)),
+    )
+
+
+def listed_jobs_filter():  # noqa: ANN201
+    """Jobs shown in listings: every job but the reconciler's placeholders."""
+    return Job.external_id.notlike("restored_%")
+
+
+# Expression index for the "Highest Rated" order, which sorts missing ratings as 0
+db.Index("ix_jobs_rating_sort", db.func.coalesce(Job.rating, 0.0), Job.posted_at, Job.id)
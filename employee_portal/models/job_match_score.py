@@ -0,0 +1,44 @@
+from datetime import datetime
+
+from employee_portal import db
+
+
+class JobMatchScore(db.Model):
+    """Match score of one user's profile against one job.
+
+    A row is current while ``profile_updated_at`` equals ``Profile.updated_at``
+    and ``job_version`` equals ``Job.content_version``.
+    """
+
+    __tablename__ = "job_match_scores"
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "job_id", name="uq_job_match_scores_user_job"),
+        db.Index("ix_job_match_scores_user_score", "user_id", "score", "job_id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(
+        db.Integer,
+        db.ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    job_id = db.Column(
+        db.Integer,
+        db.ForeignKey("jobs.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    score = db.Column(db.Float, default=0.0, nullable=False)  # Profile match score (0-5)
+    profile_updated_at = db.Column(db.DateTime, nullable=False)
+    job_version = db.Column(db.Integer, nullable=False)
+    computed_at = db.Column(
+        db.DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False,
+    )
+
+    job = db.relationship("Job", back_populates="match_scores")
+
+    def __repr__(self) -> str:
+        return f"<JobMatchScore user={self.user_id} job={self.job_id} score={self.score}>"
@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from employee_portal import db
+
+
+class JobRoleCategory(db.Model):
+    """
+    Rollup of listed jobs per normalized role (``Job.role_slug``), rebuilt
+    from a GROUP BY whenever a sync changes the catalog.
+    """
+
+    __tablename__ = "job_role_categories"
+
+    slug = db.Column(db.String(120), primary_key=True)
+    role = db.Column(db.String(120), nullable=False)  # Display label
+    job_count = db.Column(db.Integer, nullable=False, index=True)
+    refreshed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<JobRoleCategory {self.slug} ({self.job_count})>"
@@ -0,0 +1,48 @@
+from employee_portal import db
+
+# Links from jobs to the interned skills/certifications they require. The
+# second index serves "jobs requiring X" lookups.
+job_skills = db.Table(
+    "job_skills",
+    db.Column("job_id", db.Integer, db.ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("skill_id", db.Integer, db.ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True),
+    db.Index("ix_job_skills_skill_job", "skill_id", "job_id"),
+)
+
+job_certifications = db.Table(
+    "job_certifications",
+    db.Column("job_id", db.Integer, db.ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True),
+    db.Column(
+        "certification_id",
+        db.Integer,
+        db.ForeignKey("certifications.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    db.Index("ix_job_certifications_certification_job", "certification_id", "job_id"),
+)
+
+
+class Skill(db.Model):
+    """One distinct skill name; ``normalized_name`` is the lowercase form jobs are linked by."""
+
+    __tablename__ = "skills"
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(120), nullable=False)
+    normalized_name = db.Column(db.String(120), unique=True, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<Skill {self.normalized_name}>"
+
+
+class Certification(db.Model):
+    """One distinct certification name, interned like Skill."""
+
+    __tablename__ = "certifications"
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(120), nullable=False)
+    normalized_name = db.Column(db.String(120), unique=True, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<Certification {self.normalized_name}>"
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from employee_portal import db
+
+
+class SyncState(db.Model):
+    """
+    Shared state of a background sync, one row per sync name.
+    The lease columns make sure only one process runs the sync at a time.
+    """
+
+    __tablename__ = "sync_state"
+
+    name = db.Column(db.String(64), primary_key=True)
+    lease_owner = db.Column(db.String(128))
+    lease_expires_at = db.Column(db.DateTime)
+    last_success_at = db.Column(db.DateTime)
+    # Conditional/delta fetch bookkeeping for feeds that support it
+    feed_etag = db.Column(db.String(255))
+    feed_last_modified = db.Column(db.String(64))
+    delta_cursor = db.Column(db.DateTime)
+    last_full_sync_at = db.Column(db.DateTime)
+    # Bumped by every sync that changes the data; part of cached fragments' keys
+    catalog_version = db.Column(db.Integer, default=0, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<SyncState {self.name} owner={self.lease_owner}>"
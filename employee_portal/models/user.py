@@ -1,5 +1,6 @@
 from datetime import datetime
 
+from flask import current_app
 from flask_login import UserMixin
 
 from employee_portal import db
@@ -75,6 +76,11 @@ class User(UserMixin, db.Model):
 
         return check_password_hash(self.password_hash, password)
 
+    @property
+    def is_admin(self) -> bool:
+        """Whether the account's email is listed in ADMIN_EMAILS."""
+        return self.email.lower() in current_app.config.get("ADMIN_EMAILS", frozenset())
+
     @property
     def connections(self):
         return list(self.connections_one + self.connections_two)
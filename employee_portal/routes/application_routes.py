@@ -1,13 +1,49 @@
-from flask import Blueprint, current_app, flash, jsonify, redirect, render_template, request, url_for
+import csv
+import io
+import json
+from collections.abc import Iterator
+from datetime import datetime, time, timedelta
+
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    stream_with_context,
+    url_for,
+)
 from flask_login import current_user, login_required
-from sqlalchemy.orm import joinedload
+from flask_socketio import join_room
+from sqlalchemy import distinct, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import contains_eager, joinedload, load_only
 
-from employee_portal import csrf, db
-from employee_portal.forms import ApplicationForm
+from employee_portal import csrf, db, socketio
+from employee_portal.forms import ApplicationFilterForm, ApplicationForm
 from employee_portal.models.application import Application
+from employee_portal.models.application_outbox import ApplicationOutbox
 from employee_portal.models.job import Job
+from employee_portal.models.user import User
+from employee_portal.services.application_status_service import (
+    NOTIFICATIONS_NAMESPACE,
+    apply_status_updates,
+    normalize_status,
+    user_room,
+    verify_signature,
+)
 from employee_portal.services.cover_letter_service import generate_cover_letter_safe
-from employee_portal.services.employer_api_service import post_application
+from employee_portal.services.application_outbox_service import (
+    claim_for_delivery,
+    enqueue_application,
+    submit_claimed,
+    wake_outbox_dispatcher,
+)
+from employee_portal.utils.helpers import admin_required
+from employee_portal.utils.pagination import InvalidCursor, KeysetOrder, keyset_page
 
 application_bp = Blueprint("applications", __name__, url_prefix="/applications")
 
@@ -15,95 +51,14 @@ application_bp = Blueprint("applications", __name__, url_prefix="/applications")
 @application_bp.route("/")
 @login_required
 def list_applications():
-    # Try to restore missing jobs for orphaned applications
-    from employee_portal.routes.job_routes import _sync_jobs_if_needed
-    
-    # Sync jobs first to get latest from API
-    _sync_jobs_if_needed(force=True)
-    
-    # Find applications with missing jobs and try to restore them
-    orphaned_applications = (
-        Application.query
-        .filter_by(user_id=current_user.id)
-        .outerjoin(Job, Application.job_id == Job.id)
-        .filter(Job.id.is_(None))
-        .all()
-    )
-    
-    # Try to restore jobs by creating placeholder jobs
-    if orphaned_applications:
-        try:
-            from employee_portal.services.employer_api_service import fetch_jobs
-            from datetime import datetime
-            
-            api_jobs = fetch_jobs()
-            existing_job_ids = {job.id for job in Job.query.all()}
-            
-            # Try to match orphaned applications with jobs from API
-            for app in orphaned_applications:
-                if app.job_id not in existing_job_ids:
-                    # Try to find a matching job in API based on skills/certifications
-                    matched = False
-                    app_skills = set(app.skills) if isinstance(app.skills, list) else set()
-                    app_certs = set(app.certifications) if isinstance(app.certifications, list) else set()
-                    
-                    for api_job in api_jobs:
-                        api_skills = set(api_job.get("required_skills", []))
-                        api_certs = set(api_job.get("required_certifications", []))
-                        
-                        # If skills and certs match, this might be the same job
-                        if app_skills == api_skills and app_certs == api_certs:
-                            # Create the job from API data
-                            job = Job(
-                                external_id=str(api_job["id"]),
-                                title=api_job.get("title", "Unknown Job"),
-                                role=api_job.get("role", "Unknown"),
-                                company=api_job.get("company", "Unknown Company"),
-                                location=api_job.get("location", "Unknown"),
-                                description=api_job.get("description", ""),
-                                required_skills=api_job.get("required_skills", []),
-                                required_certifications=api_job.get("required_certifications", []),
-                            )
-                            posted_at = api_job.get("posted_at")
-                            if posted_at:
-                                if isinstance(posted_at, str):
-                                    job.posted_at = datetime.fromisoformat(posted_at)
-                                else:
-                                    job.posted_at = posted_at
-                            
-                            db.session.add(job)
-                            db.session.flush()  # Get the new job ID
-                            
-                            # Update application to point to the restored job
-                            app.job_id = job.id
-                            matched = True
-                            break
-                    
-                    # If no match found, create a minimal placeholder
-                    if not matched:
-                        placeholder_job = Job(
-                            external_id=f"restored_{app.id}",
-                            title="Job (Details Unavailable)",
-                            role="Unknown",
-                            company="Unknown Company",
-                            location="Unknown",
-                            description="This job listing is no longer available. The application was preserved for your records.",
-                            required_skills=app.skills if isinstance(app.skills, list) else [],
-                            required_certifications=app.certifications if isinstance(app.certifications, list) else [],
-                            posted_at=app.submitted_at,  # Use application date as fallback
-                        )
-                        db.session.add(placeholder_job)
-                        db.session.flush()
-                        app.job_id = placeholder_job.id
-            
-            db.session.commit()
-        except Exception as e:
-            # If restoration fails, just continue - we'll show the error message
-            current_app.logger.warning(f"Failed to restore missing jobs: {e}")
-            db.session.rollback()
-    
+    # Orphaned applications are reattached by services/application_reconciler.py;
+    # only the columns the table shows are read, the snapshots and job texts stay unloaded
     applications = (
-        Application.query.options(joinedload(Application.job))
+        Application.query.options(
+            load_only(Application.id, Application.job_id, Application.status, Application.submitted_at, Application.resume_link),
+            joinedload(Application.job).load_only(Job.id, Job.title, Job.company),
+            joinedload(Application.outbox).load_only(ApplicationOutbox.id, ApplicationOutbox.status),
+        )
         .filter_by(user_id=current_user.id)
         .order_by(Application.submitted_at.desc())
         .all()
@@ -111,6 +66,17 @@ def list_applications():
     return render_template("applications.html", applications=applications)
 
 
+def _application_payload(job: Job, profile, resume_link: str, cover_letter: str | None) -> dict:  # noqa: ANN001
+    return {
+        "job_id": int(job.external_id),  # Convert to int for API
+        "user_id": current_user.id,
+        "resume_link": resume_link or "",  # API might need empty string instead of None
+        "skills": profile.skills_list,
+        "certifications": profile.certifications_list,
+        "cover_letter": cover_letter or "",
+    }
+
+
 @application_bp.route("/apply/<int:job_id>", methods=["GET", "POST"])
 @login_required
 def apply(job_id: int):
@@ -146,25 +112,14 @@ def apply(job_id: int):
             skills=profile.skills_list,
             certifications=profile.certifications_list,
         )
+        application_payload = _application_payload(job, profile, resume_link, form.cover_letter.data)
+        # Delivered to the Employer API by the outbox dispatcher
         db.session.add(application)
+        enqueue_application(application, application_payload)
         db.session.commit()
+        wake_outbox_dispatcher()
 
-        application_payload = {
-            "job_id": int(job.external_id),  # Convert to int for API
-            "user_id": current_user.id,
-            "resume_link": resume_link or "",  # API might need empty string instead of None
-            "skills": profile.skills_list,
-            "certifications": profile.certifications_list,
-            "cover_letter": form.cover_letter.data or "",
-        }
-        result = post_application(application_payload)
-
-        # Check if application was successfully submitted to API
-        if not result.get("success", False):
-            error_msg = result.get("error", "Failed to submit application")
-            flash(f"Application saved locally but API error: {error_msg}", "warning")
-        else:
-            flash("Application submitted successfully.", "success")
+        flash("Application submitted successfully.", "success")
         return redirect(url_for("applications.list_applications"))
 
     if request.method == "GET":
@@ -173,6 +128,141 @@ def apply(job_id: int):
     return render_template("apply.html", form=form, job=job, profile=profile)
 
 
+@application_bp.route("/apply/bulk", methods=["POST"])
+@login_required
+def bulk_apply():
+    """
+    Apply to several jobs at once. Takes JSON ``{"job_ids": [...],
+    "resume_link": ..., "cover_letter": ...}`` (at most BULK_APPLY_MAX_JOBS
+    ids) and answers with one result per job id: ``applied`` (with the
+    ``application_id``), ``duplicate``, ``not_found`` or ``unavailable``.
+    All applications are inserted in one transaction and sent to the
+    Employer API together.
+    """
+    profile = current_user.profile
+    if profile is None or not profile.is_complete:
+        return jsonify({"error": "Please complete your profile before applying to jobs."}), 400
+
+    data = request.get_json(silent=True) or {}
+    job_ids = data.get("job_ids")
+    max_jobs = current_app.config.get("BULK_APPLY_MAX_JOBS", 50)
+    if (
+        not isinstance(job_ids, list)
+        or not job_ids
+        or not all(isinstance(job_id, int) and not isinstance(job_id, bool) for job_id in job_ids)
+    ):
+        return jsonify({"error": "job_ids must be a non-empty list of job ids."}), 400
+    job_ids = list(dict.fromkeys(job_ids))
+    if len(job_ids) > max_jobs:
+        return jsonify({"error": f"At most {max_jobs} jobs can be applied to at once."}), 400
+
+    resume_link = str(data.get("resume_link") or profile.resume_link or "").strip()[:255]
+    cover_letter = str(data.get("cover_letter") or "")[:5000]
+
+    jobs = {
+        job.id: job
+        for job in Job.query.options(load_only(Job.id, Job.external_id)).filter(Job.id.in_(job_ids))
+    }
+    # One query for every duplicate
+    applied_job_ids = {
+        job_id
+        for (job_id,) in db.session.query(Application.job_id).filter(
+            Application.user_id == current_user.id,
+            Application.job_id.in_(list(jobs)),
+        )
+    }
+
+    results: dict[int, dict] = {}
+    created: list[tuple[int, Application]] = []
+    entries = []
+    for job_id in job_ids:
+        job = jobs.get(job_id)
+        if job is None:
+            results[job_id] = {"job_id": job_id, "status": "not_found"}
+        elif job_id in applied_job_ids:
+            results[job_id] = {"job_id": job_id, "status": "duplicate"}
+        elif not job.external_id.isdigit():
+            # Placeholder jobs have no posting to apply to upstream
+            results[job_id] = {"job_id": job_id, "status": "unavailable"}
+        else:
+            application = Application(
+                user=current_user,
+                job=job,
+                resume_link=resume_link,
+                skills=profile.skills_list,
+                certifications=profile.certifications_list,
+            )
+            db.session.add(application)
+            entries.append(enqueue_application(application, _application_payload(job, profile, resume_link, cover_letter)))
+            created.append((job_id, application))
+
+    claim_token = claim_for_delivery(entries) if entries else None
+    try:
+        db.session.flush()
+        for job_id, application in created:
+            results[job_id] = {"job_id": job_id, "status": "applied", "application_id": application.id}
+        db.session.commit()
+    except IntegrityError:
+        # Another request applied to one of the jobs in the meantime
+        db.session.rollback()
+        return jsonify({"error": "Some of these applications were just submitted; please try again."}), 409
+
+    if claim_token is not None:
+        submit_claimed(claim_token)
+
+    return jsonify({"applied": len(created), "results": [results[job_id] for job_id in job_ids]})
+
+
+@application_bp.route("/webhooks/status", methods=["POST"])
+@csrf.exempt
+def status_webhook():
+    """
+    Status changes from the Employer API: ``{"updates": [{"application_id":
+    <external id>, "status": ...}, ...]}``, signed as checked by
+    ``verify_signature``. Later entries for the same application win.
+    """
+    if not current_app.config.get("EMPLOYER_WEBHOOK_SECRET"):
+        return jsonify({"error": "Webhook not configured."}), 404
+    body = request.get_data()
+    if not verify_signature(body, request.headers.get("X-Webhook-Timestamp"), request.headers.get("X-Webhook-Signature")):
+        return jsonify({"error": "Invalid signature."}), 401
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Body must be a JSON object."}), 400
+    entries = data.get("updates")
+    max_updates = current_app.config.get("EMPLOYER_WEBHOOK_MAX_UPDATES", 1000)
+    if not isinstance(entries, list):
+        return jsonify({"error": "updates must be a list."}), 400
+    if len(entries) > max_updates:
+        return jsonify({"error": f"At most {max_updates} updates per call."}), 413
+
+    updates: dict[str, str] = {}
+    invalid = 0
+    for entry in entries:
+        external_id = entry.get("application_id") if isinstance(entry, dict) else None
+        status = normalize_status(entry.get("status")) if isinstance(entry, dict) else None
+        # External ids are strings or integers; anything else cannot match one
+        if not isinstance(external_id, (str, int)) or isinstance(external_id, bool) or status is None:
+            invalid += 1
+            continue
+        updates[str(external_id)] = status
+
+    report = apply_status_updates(updates)
+    return jsonify(
+        {"updated": report.updated, "unchanged": report.unchanged, "unknown": report.unknown, "invalid": invalid},
+    )
+
+
+@socketio.on("connect", namespace=NOTIFICATIONS_NAMESPACE)
+def handle_notifications_connect(auth=None):  # pragma: no cover  # noqa: ANN001
+    # Each signed-in user listens in their own room for status changes
+    if not current_user.is_authenticated:
+        return False
+    join_room(user_room(current_user.id))
+    return None
+
+
 @application_bp.route("/generate-cover-letter/<int:job_id>", methods=["POST"])
 @login_required
 @csrf.exempt
@@ -248,13 +338,152 @@ def withdraw_application(application_id: int):
     return redirect(url_for("applications.list_applications"))
 
 
+def _admin_filter_form() -> ApplicationFilterForm:
+    form = ApplicationFilterForm(request.args, prefix="filter")
+    statuses = db.session.query(Application.status).distinct().order_by(Application.status)
+    form.status.choices = [("", "Any status")] + [(status, status.title()) for (status,) in statuses]
+    return form
+
+
+def _admin_filters(form: ApplicationFilterForm) -> list:
+    """WHERE clauses for the dashboard filters (queries join Job and User)."""
+    filters = []
+    if form.status.data:
+        filters.append(Application.status == form.status.data)
+    if form.job.data:
+        term = form.job.data.strip()
+        filters.append(Application.job_id == int(term) if term.isdigit() else Job.title.contains(term, autoescape=True))
+    if form.company.data:
+        filters.append(Job.company.contains(form.company.data.strip(), autoescape=True))
+    if form.submitted_from.data:
+        filters.append(Application.submitted_at >= datetime.combine(form.submitted_from.data, time.min))
+    if form.submitted_to.data:
+        # The end date is inclusive
+        filters.append(Application.submitted_at < datetime.combine(form.submitted_to.data + timedelta(days=1), time.min))
+    return filters
+
+
+def _admin_summary(filters: list) -> dict:
+    """Counts for the filtered applications, as two aggregate queries."""
+    base = (
+        db.session.query(Application)
+        .outerjoin(Job, Application.job_id == Job.id)
+        .join(User, Application.user_id == User.id)
+        .filter(*filters)
+    )
+    status_counts = dict(
+        base.with_entities(Application.status, func.count(Application.id)).group_by(Application.status).all()
+    )
+    applicants, jobs = base.with_entities(
+        func.count(distinct(Application.user_id)),
+        func.count(distinct(Application.job_id)),
+    ).one()
+    return {
+        "total": sum(status_counts.values()),
+        "applicants": applicants,
+        "jobs": jobs,
+        "statuses": sorted(status_counts.items()),
+    }
+
+
+ADMIN_ORDER = KeysetOrder(
+    columns=lambda: (Application.submitted_at, Application.id),
+    row_values=lambda application: (application.submitted_at, application.id),
+)
+
+EXPORT_COLUMNS = (
+    ("application_id", Application.id),
+    ("submitted_at", Application.submitted_at),
+    ("status", Application.status),
+    ("external_id", Application.external_id),
+    ("user_id", User.id),
+    ("username", User.username),
+    ("email", User.email),
+    ("job_id", Application.job_id),
+    ("job_title", Job.title),
+    ("company", Job.company),
+    ("resume_link", Application.resume_link),
+)
+
+
 @application_bp.route("/admin")
-@login_required
+@admin_required
 def admin_dashboard():
-    applications = (
-        Application.query.options(joinedload(Application.job), joinedload(Application.user))
-        .order_by(Application.submitted_at.desc())
-        .all()
+    form = _admin_filter_form()
+    filters = _admin_filters(form)
+    # Only the columns the table shows, with the job and user from the filter joins
+    query = (
+        Application.query.outerjoin(Job, Application.job_id == Job.id)
+        .join(User, Application.user_id == User.id)
+        .options(
+            load_only(Application.id, Application.job_id, Application.status, Application.submitted_at, Application.resume_link),
+            contains_eager(Application.job).load_only(Job.id, Job.title, Job.company),
+            contains_eager(Application.user).load_only(User.id, User.username, User.email),
+        )
+        .filter(*filters)
     )
-    return render_template("admin_dashboard.html", applications=applications)
+    page_size = current_app.config.get("ADMIN_PAGE_SIZE", 50)
+    cursor = request.args.get("cursor")
+    try:
+        applications, next_cursor = keyset_page(query, "admin_submitted_at", ADMIN_ORDER, cursor, page_size)
+    except InvalidCursor:
+        flash("That page link has expired; showing the first page.", "info")
+        cursor = None
+        applications, next_cursor = keyset_page(query, "admin_submitted_at", ADMIN_ORDER, None, page_size)
 
+    page_args = request.args.to_dict()
+    page_args.pop("cursor", None)
+    return render_template(
+        "admin_dashboard.html",
+        applications=applications,
+        form=form,
+        summary=_admin_summary(filters),
+        export_args=page_args,
+        next_page_url=url_for("applications.admin_dashboard", **page_args, cursor=next_cursor) if next_cursor else None,
+        first_page_url=url_for("applications.admin_dashboard", **page_args) if cursor else None,
+    )
+
+
+def _export_lines(filters: list, export_format: str) -> Iterator[str]:
+    names = [name for name, _ in EXPORT_COLUMNS]
+    statement = (
+        select(*(column for _, column in EXPORT_COLUMNS))
+        .select_from(Application)
+        .outerjoin(Job, Application.job_id == Job.id)
+        .join(User, Application.user_id == User.id)
+        .where(*filters)
+        .order_by(Application.submitted_at.desc(), Application.id.desc())
+        # Rows are fetched (and streamed) in chunks; memory does not grow with the export
+        .execution_options(yield_per=1000)
+    )
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == "csv":
+        # Sent even when no rows match
+        writer.writerow(names)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    for row in db.session.execute(statement):
+        values = [value.isoformat() if isinstance(value, datetime) else value for value in row]
+        if export_format == "csv":
+            writer.writerow(values)
+        else:
+            buffer.write(json.dumps(dict(zip(names, values))) + "\n")
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+@application_bp.route("/admin/export.<any(csv, jsonl):export_format>")
+@admin_required
+def export_applications(export_format: str):
+    """Stream the filtered applications as CSV or JSON Lines."""
+    form = _admin_filter_form()
+    filters = _admin_filters(form)
+    mimetype = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return Response(
+        stream_with_context(_export_lines(filters, export_format)),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename=applications.{export_format}"},
+    )
@@ -1,147 +1,180 @@
-from datetime import datetime, timedelta
-import re
-
-from flask import Blueprint, current_app, flash, redirect, render_template, request, url_for
+from flask import Blueprint, current_app, flash, jsonify, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
-from sqlalchemy import func
+from markupsafe import Markup
+from sqlalchemy import and_, func
 
 from employee_portal import db
 from employee_portal.forms import JobFilterForm
-from employee_portal.models.job import Job
-from employee_portal.services.employer_api_service import fetch_jobs
+from employee_portal.models.job import Job, archive_threshold, job_card_options, listed_jobs_filter
+from employee_portal.models.job_match_score import JobMatchScore
 from employee_portal.services.company_rating_service import update_job_ratings
-from employee_portal.utils.match_scoring import update_job_match_score
+from employee_portal.services.job_sync_scheduler import request_job_sync
+from employee_portal.services.job_sync_service import catalog_version, jobs_synced
+from employee_portal.utils.fragment_cache import DASHBOARD, get_fragment, invalidate_fragments, set_fragment
+from employee_portal.utils.helpers import role_slug
+from employee_portal.utils.job_categories import role_categories
+from employee_portal.utils.job_index import recommend_jobs
+from employee_portal.utils.job_requirements import requires_skill_filter
+from employee_portal.utils.job_search import apply_search
+from employee_portal.utils.match_scoring import refresh_listed_match_scores, refresh_match_scores
+from employee_portal.utils.pagination import InvalidCursor, KeysetOrder, decode_cursor, encode_cursor, keyset_page
 
 job_bp = Blueprint("jobs", __name__)
 
-_LAST_SYNC_AT: datetime | None = None
-
-
-def _slugify_role(role: str) -> str:
-    normalized = re.sub(r"[^a-z0-9]+", "-", role.strip().lower())
-    return normalized.strip("-") or "other"
-
-
-def _sync_jobs_if_needed(force: bool = False) -> None:
-    global _LAST_SYNC_AT  # noqa: PLW0603
-
-    timeout = current_app.config.get("JOB_CACHE_TIMEOUT", 900)
-    should_refresh = force
-    if _LAST_SYNC_AT is None:
-        should_refresh = True
-    elif datetime.utcnow() - _LAST_SYNC_AT > timedelta(seconds=timeout):
-        should_refresh = True
-
-    if not should_refresh:
-        return
-
-    job_payloads = fetch_jobs()
-    seen_external_ids: set[str] = set()
-
-    for payload in job_payloads:
-        external_id = str(payload["id"])
-        seen_external_ids.add(external_id)
-        job = Job.query.filter_by(external_id=external_id).first()
-        if job is None:
-            job = Job(external_id=external_id)
-            db.session.add(job)
-
-        job.title = payload["title"]
-        job.role = payload["role"]
-        job.company = payload.get("company", "Acme Corp")
-        job.location = payload["location"]
-        job.description = payload.get("description", "")
-        job.required_skills = payload.get("required_skills", [])
-        job.required_certifications = payload.get("required_certifications", [])
-        posted_at_value = payload.get("posted_at")
-        if posted_at_value:
-            if isinstance(posted_at_value, str):
-                job.posted_at = datetime.fromisoformat(posted_at_value)
-            else:
-                job.posted_at = posted_at_value
-
-    if seen_external_ids:
-        # Don't delete jobs that have applications - preserve application history
-        from employee_portal.models.application import Application
-        jobs_with_applications = {
-            app.job_id for app in Application.query.with_entities(Application.job_id).distinct().all()
-        }
-        # Only delete jobs that are not in the API response AND don't have applications
-        jobs_to_delete = Job.query.filter(
-            ~Job.external_id.in_(seen_external_ids)
-        ).all()
-        for job in jobs_to_delete:
-            if job.id not in jobs_with_applications:
-                db.session.delete(job)
-    db.session.commit()
-    _LAST_SYNC_AT = datetime.utcnow()
-
-
-def _apply_filters(query, form: JobFilterForm):  # noqa: ANN001
-    if form.role.data:
-        query = query.filter(Job.role.ilike(f"%{form.role.data.strip()}%"))
-    if form.location.data:
-        query = query.filter(Job.location.ilike(f"%{form.location.data.strip()}%"))
-    if form.skill.data:
-        query = query.filter(
-            Job.required_skills.cast(db.String).ilike(f"%{form.skill.data.strip()}%"),
+
+def _match_score_expression():
+    return func.coalesce(JobMatchScore.score, 0.0)
+
+
+def _rating_expression():
+    return func.coalesce(Job.rating, 0.0)
+
+
+def _filter_form() -> JobFilterForm:
+    # Prefixed so the filter's role field does not clash with the ?role= category
+    return JobFilterForm(request.args, prefix="filter")
+
+
+def _scored_job_query(user_id: int):
+    """Jobs joined with the given user's stored match scores (0.0 when missing)."""
+    return (
+        db.session.query(Job, _match_score_expression().label("match_score"))
+        .options(*job_card_options())
+        .outerjoin(
+            JobMatchScore,
+            and_(JobMatchScore.job_id == Job.id, JobMatchScore.user_id == user_id),
         )
+    )
+
+
+# Keyset orders for the job list; each ends in Job.id so positions are unique.
+# rating, posted_at and title have matching composite indexes (models/job.py).
+# match_score sorts on coalesced values across the outer join to the user's
+# scores, which no index can serve, so each of its pages sorts every filtered
+# job; only the indexed orders cost the same on every page.
+JOB_LIST_ORDERS = {
+    "match_score": KeysetOrder(
+        columns=lambda: (_match_score_expression(), _rating_expression(), Job.posted_at, Job.id),
+        row_values=lambda row: (row.match_score, row.Job.rating or 0.0, row.Job.posted_at, row.Job.id),
+    ),
+    "rating": KeysetOrder(
+        columns=lambda: (_rating_expression(), Job.posted_at, Job.id),
+        row_values=lambda row: (row.Job.rating or 0.0, row.Job.posted_at, row.Job.id),
+    ),
+    "posted_at": KeysetOrder(
+        columns=lambda: (Job.posted_at, Job.id),
+        row_values=lambda row: (row.Job.posted_at, row.Job.id),
+    ),
+    "title": KeysetOrder(
+        columns=lambda: (Job.title, Job.id),
+        row_values=lambda row: (row.Job.title, row.Job.id),
+        descending=False,
+    ),
+}
+
+
+def _job_list_query(form: JobFilterForm, requested_role: str | None, show_archived: bool):
+    """The job list's rows (Job, match_score) after all filters; returns (query, search rank)."""
+    query = _scored_job_query(current_user.id).filter(listed_jobs_filter())
+    if requested_role:
+        # Categories link by role label; slugging it matches every spelling counted
+        query = query.filter(Job.role_slug == role_slug(requested_role))
 
-    sort_field = form.sort_by.data or "match_score"
-    if sort_field == "posted_at":
-        query = query.order_by(Job.posted_at.desc())
-    elif sort_field == "title":
-        query = query.order_by(Job.title.asc())
+    # Active jobs were posted within the last 30 days; older ones are archived
+    threshold = archive_threshold()
+    if show_archived:
+        query = query.filter(Job.posted_at < threshold)
     else:
-        query = query.order_by(Job.match_score.desc(), Job.rating.desc(), Job.posted_at.desc())
+        query = query.filter(Job.posted_at >= threshold)
+
+    search_rank = None
+    if form.validate():
+        query, search_rank = apply_search(
+            query,
+            keywords=form.keywords.data,
+            role=form.role.data,
+            location=form.location.data,
+        )
+        if form.skill.data and form.skill.data.strip():
+            query = query.filter(requires_skill_filter(form.skill.data))
+    return query, search_rank
+
+
+def _sorts_by_match(sort_field: str | None, search_rank) -> bool:  # noqa: ANN001
+    """Whether ``_job_list_page`` orders by match score (the default)."""
+    if sort_field == "relevance" and search_rank is not None:
+        return False
+    return sort_field not in JOB_LIST_ORDERS or sort_field == "match_score"
+
+
+def _refresh_list_scores(profile, search_rank, sort_field: str | None, show_archived: bool) -> None:  # noqa: ANN001
+    """
+    Sorting by match needs every listed job's score up to date, which is
+    only rechecked when the catalog or the profile changed; other orders
+    only rescore the rows of the page they show (``_page_match_scores``).
+    """
+    if _sorts_by_match(sort_field, search_rank):
+        refresh_listed_match_scores(profile, catalog_version(), archived=show_archived)
+
+
+def _page_match_scores(profile, rows) -> dict[int, float]:  # noqa: ANN001
+    """Match scores of one page's rows, rescoring the stale ones first."""
+    scores = {row.Job.id: row.match_score for row in rows}
+    if refresh_match_scores(profile, job_ids=scores):
+        scores.update(
+            db.session.query(JobMatchScore.job_id, JobMatchScore.score).filter(
+                JobMatchScore.user_id == current_user.id,
+                JobMatchScore.job_id.in_(list(scores)),
+            )
+        )
+    return scores
+
+
+def _job_list_page(query, search_rank, sort_field: str | None, cursor: str | None, limit: int):  # noqa: ANN001
+    """One page of the job list as ``(rows, next_cursor)``."""
+    if sort_field == "relevance" and search_rank is not None:
+        # Search ranks are computed per query, so relevance pages by offset;
+        # the result set is already narrowed to the search matches
+        offset = decode_cursor("relevance", cursor)[0] if cursor else 0
+        rows = query.order_by(search_rank, Job.id).offset(offset).limit(limit + 1).all()
+        if len(rows) <= limit:
+            return rows, None
+        return rows[:limit], encode_cursor("relevance", [offset + limit])
 
-    return query
+    sort_field = sort_field if sort_field in JOB_LIST_ORDERS else "match_score"
+    return keyset_page(query, sort_field, JOB_LIST_ORDERS[sort_field], cursor, limit)
 
 
 @job_bp.route("/")
 @login_required
 def dashboard():
-    _sync_jobs_if_needed()
     profile = current_user.profile
+    # The feed only changes with the job catalog or the profile, so it is
+    # cached per user under those versions (and dropped when either changes)
+    versions = (catalog_version(), profile.updated_at if profile else None)
+    feed_html = get_fragment(DASHBOARD, current_user.id, versions)
+    if feed_html is None:
+        feed_html = _render_dashboard_feed(profile)
+        set_fragment(DASHBOARD, current_user.id, versions, feed_html)
+
+    return render_template("dashboard.html", profile=profile, feed_html=Markup(feed_html))
+
+
+def _render_dashboard_feed(profile) -> str:  # noqa: ANN001
     # Update company ratings if needed (can be done periodically)
     # update_job_ratings()  # Uncomment to refresh ratings
-    
-    # Calculate match scores for all jobs
-    all_jobs = Job.query.all()
-    for job in all_jobs:
-        update_job_match_score(job, profile)
-    db.session.commit()
-
-    placeholder_filter = Job.external_id.notlike("restored_%")
-    jobs = (
-        Job.query.filter(placeholder_filter)
-        .order_by(Job.posted_at.desc())
-        .all()
-    )
 
-    top_jobs = jobs[:6]
-
-    # Build job categories with normalized role labels
-    categories_map: dict[str, dict] = {}
-    for job in jobs:
-        role_label = (job.role or "Other").strip() or "Other"
-        role_key = _slugify_role(role_label)
-        category = categories_map.setdefault(
-            role_key,
-            {
-                "role": role_label,
-                "count": 0,
-                "sample_job_id": job.id,
-                "company": job.company,
-            },
-        )
-        category["count"] += 1
-        category["slug"] = role_key
-    job_categories = sorted(
-        categories_map.values(),
-        key=lambda item: item["count"],
-        reverse=True,
-    )
+    # Best matches come from the inverted index; only jobs sharing a skill,
+    # certification or keyword with the profile are normally scored
+    recommendations = recommend_jobs(profile, limit=6)
+    top_jobs = [job for job, _ in recommendations]
+    match_scores = {job.id: score for job, score in recommendations}
+
+    # Per-role counts come from the rollup the sync maintains
+    job_categories = [
+        {"role": category.role, "slug": category.slug, "count": category.job_count}
+        for category in role_categories()
+    ]
 
     faqs = [
         {
@@ -159,96 +192,132 @@ def dashboard():
     ]
 
     return render_template(
-        "dashboard.html",
+        "dashboard_feed.html",
         jobs=top_jobs,
-        profile=profile,
-job_categories=job_categories,
+        match_scores=match_scores,
+        job_categories=job_categories,
         faqs=faqs,
     )
 
 
-@job_bp.route("/jobs", methods=["GET", "POST"])
+@jobs_synced.connect
+def _invalidate_dashboards(sender, report, **extra) -> None:  # noqa: ANN001
+    invalidate_fragments(DASHBOARD)
+
+
+@job_bp.route("/jobs")
 @login_required
 def job_list():
-    _sync_jobs_if_needed()
     profile = current_user.profile
     requested_role = request.args.get("role")
     show_archived = request.args.get("archived") == "true"
 
     # Update company ratings if needed (can be done periodically)
     # update_job_ratings()  # Uncomment to refresh ratings
-    
-    # Calculate match scores for all jobs
-    all_jobs = Job.query.all()
-    for job in all_jobs:
-        update_job_match_score(job, profile)
-    db.session.commit()
-
-    form = JobFilterForm()
-    if requested_role and not form.is_submitted():
-        form.role.data = requested_role
-
-    placeholder_filter = Job.external_id.notlike("restored_%")
-    query = Job.query.filter(placeholder_filter)
-    if requested_role:
-        query = query.filter(func.lower(Job.role) == requested_role.lower())
 
-    # Filter archived jobs (older than 30 days)
+    form = _filter_form()
     if show_archived:
-        archive_threshold = datetime.utcnow() - timedelta(days=30)
-        query = query.filter(Job.posted_at < archive_threshold)
         flash("Showing archived jobs (older than 30 days)", "info")
-    else:
-        # Show active jobs (posted within last 30 days)
-        archive_threshold = datetime.utcnow() - timedelta(days=30)
-        query = query.filter(Job.posted_at >= archive_threshold)
 
-    if form.validate_on_submit():
-        query = _apply_filters(query, form)
-    else:
-        query = query.order_by(Job.match_score.desc(), Job.rating.desc(), Job.posted_at.desc())
+    query, search_rank = _job_list_query(form, requested_role, show_archived)
+    _refresh_list_scores(profile, search_rank, form.sort_by.data, show_archived)
+    page_size = current_app.config.get("JOB_LIST_PAGE_SIZE", 24)
+    cursor = request.args.get("cursor")
+    try:
+        rows, next_cursor = _job_list_page(query, search_rank, form.sort_by.data, cursor, page_size)
+    except InvalidCursor:
+        flash("That page link has expired; showing the first page.", "info")
+        cursor = None
+        rows, next_cursor = _job_list_page(query, search_rank, form.sort_by.data, None, page_size)
 
-    jobs = query.all()
+    jobs = [row.Job for row in rows]
+    match_scores = _page_match_scores(profile, rows)
+    page_args = request.args.to_dict()
+    page_args.pop("cursor", None)
 
     return render_template(
         "jobs.html",
         jobs=jobs,
+        match_scores=match_scores,
         form=form,
         profile=profile,
         active_role=requested_role,
         show_archived=show_archived,
+        next_page_url=url_for("jobs.job_list", **page_args, cursor=next_cursor) if next_cursor else None,
+        first_page_url=url_for("jobs.job_list", **page_args) if cursor else None,
+    )
+
+
+@job_bp.route("/api/jobs")
+@login_required
+def job_list_api():
+    """
+    JSON job list with the same filters as ``job_list`` (``filter-keywords``,
+    ``filter-role``, ``filter-location``, ``filter-skill``, ``filter-sort_by``,
+    ``role``, ``archived``). Pass ``next_cursor`` back as ``cursor`` for the
+    next page; ``limit`` is capped at 100.
+    """
+    form = _filter_form()
+    show_archived = request.args.get("archived") == "true"
+    query, search_rank = _job_list_query(form, request.args.get("role"), show_archived)
+    _refresh_list_scores(current_user.profile, search_rank, form.sort_by.data, show_archived)
+    limit = min(max(request.args.get("limit", 24, type=int), 1), 100)
+    try:
+        rows, next_cursor = _job_list_page(query, search_rank, form.sort_by.data, request.args.get("cursor"), limit)
+    except InvalidCursor as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    match_scores = _page_match_scores(current_user.profile, rows)
+    return jsonify(
+        {
+            "jobs": [
+                {
+                    "id": row.Job.id,
+                    "title": row.Job.title,
+                    "role": row.Job.role,
+                    "company": row.Job.company,
+                    "location": row.Job.location,
+                    "rating": row.Job.rating,
+                    "posted_at": row.Job.posted_at.isoformat(),
+                    "match_score": match_scores[row.Job.id],
+                    "url": url_for("jobs.job_detail", job_id=row.Job.id),
+                }
+                for row in rows
+            ],
+            "next_cursor": next_cursor,
+        },
     )
 
 
 @job_bp.route("/jobs/<int:job_id>")
 @login_required
 def job_detail(job_id: int):
-    _sync_jobs_if_needed()
     job = Job.query.get_or_404(job_id)
-    # Update match score for this job
-    update_job_match_score(job, current_user.profile)
-    db.session.commit()
-    db.session.commit()
-    return render_template("job_detail.html", job=job)
+    refresh_match_scores(current_user.profile, job_ids=[job.id])
+    stored = JobMatchScore.query.filter_by(user_id=current_user.id, job_id=job.id).first()
+    match_score = stored.score if stored else 0.0
+    return render_template("job_detail.html", job=job, match_score=match_score)
 
 
 @job_bp.route("/jobs/refresh", methods=["POST"])
 @login_required
 def refresh_jobs():
-    _sync_jobs_if_needed(force=True)
-    flash("Job listings refreshed from mock employer API.", "success")
+    request_job_sync()
+    flash("Job listings refresh started; new postings appear once it completes.", "success")
     return redirect(url_for("jobs.job_list"))
 
 
 @job_bp.route("/jobs/update-ratings", methods=["POST"])
 @login_required
 def update_ratings():
-    """Update company ratings for all jobs."""
+    """Refresh expired company ratings and update the jobs' ratings."""
     try:
-        from employee_portal.services.company_rating_service import update_job_ratings
-        
-        update_job_ratings()
-        flash("Company ratings updated successfully.", "success")
+        report = update_job_ratings()
+        invalidate_fragments(DASHBOARD)
+        flash(
+            f"Company ratings updated: {report.refreshed} refreshed, {report.fresh} still current.",
+            "success",
+        )
     except Exception as e:
         current_app.logger.exception("Error updating ratings")
         flash(f"Error updating ratings: {str(e)}", "error")
@@ -11,6 +11,7 @@ from employee_portal.models.profile import Profile
 from employee_portal.services.transcription_service import (
     transcribe_and_extract_profile_safe,
 )
+from employee_portal.utils.fragment_cache import DASHBOARD, invalidate_fragments
 from employee_portal.utils.helpers import ensure_profile_lists, parse_comma_separated
 
 profile_bp = Blueprint("profile", __name__, url_prefix="/profile")
@@ -102,6 +103,7 @@ def manage_profile():
             profile.experience = form.experience.data
 
         db.session.commit()
+        invalidate_fragments(DASHBOARD, current_user.id)
         flash("Profile saved successfully.", "success")
         return redirect(url_for("profile.manage_profile"))
 
@@ -123,6 +125,7 @@ def delete_profile():
     if profile:
         db.session.delete(profile)
         db.session.commit()
+        invalidate_fragments(DASHBOARD, current_user.id)
         flash("Profile deleted.", "info")
     else:
         flash("No profile to delete.", "warning")
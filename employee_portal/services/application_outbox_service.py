@@ -0,0 +1,287 @@
+"""
+Application outbox.
+Applying only inserts the Application and its outbox row in one transaction;
+a background dispatcher in every web worker delivers pending rows to the Employer
+API. Rows are claimed with a conditional UPDATE so two dispatchers never send
+the same row at once, deliveries run on at most APPLICATION_OUTBOX_CONCURRENCY
+threads, and failures are retried with exponential backoff until
+APPLICATION_OUTBOX_MAX_ATTEMPTS is reached. Bulk applications claim their
+rows up front and deliver them together, in one batch call when the API
+supports it.
+"""
+from __future__ import annotations
+
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import NamedTuple
+from uuid import uuid4
+
+from flask import Flask, current_app
+from sqlalchemy import or_, update
+
+from employee_portal import db, socketio
+from employee_portal.models.application import Application
+from employee_portal.models.application_outbox import ApplicationOutbox
+from employee_portal.services.employer_api_service import post_application, post_applications_batch
+
+_wake_event = threading.Event()
+_dispatcher_started = False
+_dispatcher_lock = threading.Lock()
+
+
+class DispatchReport(NamedTuple):
+    sent: int
+    retrying: int
+    failed: int
+
+    @property
+    def claimed(self) -> int:
+        return self.sent + self.retrying + self.failed
+
+
+def enqueue_application(application: Application, payload: dict) -> ApplicationOutbox:
+    """Add the outbox row for ``application``; the caller commits both together."""
+    entry = ApplicationOutbox(application=application, payload=payload)
+    db.session.add(entry)
+    return entry
+
+
+def _delivers_here() -> bool:
+    """Whether this process delivers outbox rows itself (its dispatcher, or inline in tests)."""
+    return _dispatcher_started or current_app.testing
+
+
+def claim_for_delivery(entries: list[ApplicationOutbox]) -> str | None:
+    """
+    Claim new rows for the caller to deliver itself (see ``deliver_claimed``);
+    set before the commit, so the dispatcher never picks them up separately.
+    The claim expires like any other if the delivery never happens. Returns
+    None, claiming nothing, when this process has no dispatcher to deliver
+    them: they are left to the dispatchers of other workers or the CLI.
+    """
+    if not _delivers_here():
+        return None
+    claim_token = uuid4().hex
+    lock_seconds = current_app.config.get("APPLICATION_OUTBOX_CLAIM_SECONDS", 120)
+    claimed_until = datetime.utcnow() + timedelta(seconds=lock_seconds)
+    for entry in entries:
+        entry.claimed_by = claim_token
+        entry.claimed_until = claimed_until
+    return claim_token
+
+
+def deliver_claimed(claim_token: str) -> DispatchReport:
+    """Deliver the rows claimed with ``claim_token`` together, in one batch call when possible."""
+    entries = ApplicationOutbox.query.filter_by(claimed_by=claim_token, status="pending").all()
+    if not entries:
+        return DispatchReport(0, 0, 0)
+    return _deliver_entries(entries, batch_size=len(entries))
+
+
+def _deliver_claimed_task(app: Flask, claim_token: str) -> None:
+    with app.app_context():
+        try:
+            deliver_claimed(claim_token)
+        except Exception:  # noqa: BLE001 - the claim expires and the dispatcher retries
+            app.logger.exception("Delivering claimed applications failed")
+            db.session.rollback()
+        finally:
+            db.session.remove()
+
+
+def submit_claimed(claim_token: str) -> None:
+    """Hand claimed rows to a background task (delivered inline in tests)."""
+    if _dispatcher_started:
+        socketio.start_background_task(_deliver_claimed_task, current_app._get_current_object(), claim_token)
+    elif current_app.testing:
+        deliver_claimed(claim_token)
+
+
+def _claim_due_entries(limit: int) -> list[ApplicationOutbox]:
+    now = datetime.utcnow()
+    claim_token = uuid4().hex
+    lock_seconds = current_app.config.get("APPLICATION_OUTBOX_CLAIM_SECONDS", 120)
+    unclaimed = or_(ApplicationOutbox.claimed_until.is_(None), ApplicationOutbox.claimed_until < now)
+    due_ids = [
+        entry_id
+        for (entry_id,) in db.session.query(ApplicationOutbox.id)
+        .filter(
+            ApplicationOutbox.status == "pending",
+            ApplicationOutbox.next_attempt_at <= now,
+            unclaimed,
+        )
+        .order_by(ApplicationOutbox.next_attempt_at)
+        .limit(limit)
+    ]
+    if not due_ids:
+        return []
+
+    # Only rows still unclaimed are taken; another dispatcher may have won some
+    db.session.execute(
+        update(ApplicationOutbox)
+        .where(ApplicationOutbox.id.in_(due_ids), unclaimed)
+        .values(claimed_by=claim_token, claimed_until=now + timedelta(seconds=lock_seconds))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return ApplicationOutbox.query.filter_by(claimed_by=claim_token).all()
+
+
+def _deliver(app: Flask, batch: list[tuple[str, dict]]) -> list[dict] | None:
+    """
+    Results for one batch; None when the API has no batch endpoint. An
+    unexpected error fails the whole batch as retryable, so the rows still
+    count an attempt and cannot be retried forever.
+    """
+    with app.app_context():
+        try:
+            if len(batch) > 1:
+                return post_applications_batch(batch)
+            return [post_application(payload, idempotency_key=key) for key, payload in batch]
+        except Exception as e:  # noqa: BLE001
+            app.logger.exception("Unexpected error delivering applications")
+            return [{"success": False, "error": f"Unexpected error: {e}", "retryable": True} for _ in batch]
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    base = current_app.config.get("APPLICATION_OUTBOX_BACKOFF_SECONDS", 30)
+    cap = current_app.config.get("APPLICATION_OUTBOX_BACKOFF_MAX", 3600)
+    ceiling = min(cap, base * 2 ** (attempts - 1))
+    # Jitter keeps a burst of failures from retrying in lockstep
+    return timedelta(seconds=random.uniform(ceiling / 2, ceiling))
+
+
+def _record_result(entry: ApplicationOutbox, result: dict, now: datetime) -> str:
+    entry.attempts += 1
+    entry.claimed_by = None
+    entry.claimed_until = None
+    if result.get("success", False):
+        entry.status = "sent"
+        entry.sent_at = now
+        entry.last_error = None
+        if result.get("application_id") is not None:
+            entry.application.external_id = str(result["application_id"])
+        return "sent"
+
+    entry.last_error = str(result.get("error", "Unknown error"))[:1000]
+    max_attempts = current_app.config.get("APPLICATION_OUTBOX_MAX_ATTEMPTS", 8)
+    if not result.get("retryable", False) or entry.attempts >= max_attempts:
+        entry.status = "failed"
+        current_app.logger.error(
+            f"Giving up on application {entry.application_id} after {entry.attempts} attempt(s): {entry.last_error}"
+        )
+        return "failed"
+    entry.next_attempt_at = now + _retry_delay(entry.attempts)
+    return "retrying"
+
+
+def _deliver_entries(entries: list[ApplicationOutbox], batch_size: int) -> DispatchReport:
+    """
+    Deliver claimed rows in batches of ``batch_size`` on at most
+    APPLICATION_OUTBOX_CONCURRENCY threads and record the outcomes. Rows of
+    batches the API cannot take in one call are sent one by one instead.
+    """
+    concurrency = max(1, current_app.config.get("APPLICATION_OUTBOX_CONCURRENCY", 4))
+    batches = [entries[start:start + batch_size] for start in range(0, len(entries), batch_size)]
+    app = current_app._get_current_object()
+    results: dict[int, dict] = {}
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(entries))) as executor:
+        batch_results = executor.map(
+            lambda batch: _deliver(app, [(entry.idempotency_key, entry.payload) for entry in batch]),
+            batches,
+        )
+        unbatched = []
+        for batch, batch_result in zip(batches, batch_results):
+            if batch_result is None:
+                unbatched.extend(batch)
+            else:
+                results.update((entry.id, result) for entry, result in zip(batch, batch_result))
+        single_results = executor.map(
+            lambda entry: _deliver(app, [(entry.idempotency_key, entry.payload)])[0],
+            unbatched,
+        )
+        results.update((entry.id, result) for entry, result in zip(unbatched, single_results))
+
+    outcomes = {"sent": 0, "retrying": 0, "failed": 0}
+    now = datetime.utcnow()
+    missing = {"success": False, "error": "No result from the API", "retryable": True}
+    for entry in entries:
+        outcomes[_record_result(entry, results.get(entry.id, missing), now)] += 1
+    db.session.commit()
+
+    report = DispatchReport(**outcomes)
+    current_app.logger.info(
+        f"Application outbox: {report.sent} sent, {report.retrying} retrying, {report.failed} failed"
+    )
+    return report
+
+
+def dispatch_outbox() -> DispatchReport:
+    """Deliver one round of due outbox rows and record the outcomes."""
+    limit = max(1, current_app.config.get("APPLICATION_OUTBOX_CLAIM_LIMIT", 100))
+    entries = _claim_due_entries(limit)
+    if not entries:
+        return DispatchReport(0, 0, 0)
+    batch_size = max(1, current_app.config.get("APPLICATION_OUTBOX_BATCH_SIZE", 1))
+    return _deliver_entries(entries, batch_size)
+
+
+def drain_outbox() -> DispatchReport:
+    """Dispatch rounds until the due rows are exhausted."""
+    limit = max(1, current_app.config.get("APPLICATION_OUTBOX_CLAIM_LIMIT", 100))
+    sent = retrying = failed = 0
+    while True:
+        report = dispatch_outbox()
+        sent, retrying, failed = sent + report.sent, retrying + report.retrying, failed + report.failed
+        if report.claimed < limit:
+            return DispatchReport(sent, retrying, failed)
+
+
+def wake_outbox_dispatcher() -> None:
+    """
+    Deliver new outbox rows now instead of at the next poll. Without a
+    dispatcher in this process the rows wait for another worker's or
+    ``flask dispatch-applications``; only tests deliver them inline.
+    """
+    if _dispatcher_started:
+        _wake_event.set()
+    elif current_app.testing:
+        drain_outbox()
+
+
+def _dispatcher_loop(app: Flask) -> None:
+    poll_seconds = app.config.get("APPLICATION_OUTBOX_POLL_SECONDS", 10)
+    while True:
+        _wake_event.clear()
+        with app.app_context():
+            try:
+                drain_outbox()
+            except Exception:  # noqa: BLE001 - keep the dispatcher alive
+                app.logger.exception("Application outbox dispatch failed")
+                db.session.rollback()
+            finally:
+                db.session.remove()
+        _wake_event.wait(poll_seconds)
+
+
+def start_outbox_dispatcher(app: Flask) -> None:
+    """Start the dispatcher task for this process (once)."""
+    global _dispatcher_started  # noqa: PLW0603
+
+    with _dispatcher_lock:
+        if _dispatcher_started:
+            return
+        _dispatcher_started = True
+    socketio.start_background_task(_dispatcher_loop, app)
+
+
+def init_application_outbox(app: Flask) -> None:
+    """Register ``flask dispatch-applications`` (the dispatcher is started by ``start_background_tasks``)."""
+
+    @app.cli.command("dispatch-applications")
+    def dispatch_applications_command() -> None:
+        """Deliver all due outbox rows now."""
+        report = drain_outbox()
+        print(f"Applications: {report.sent} sent, {report.retrying} retrying, {report.failed} failed.")
@@ -0,0 +1,212 @@
+"""
+Orphaned application reconciler.
+Applications whose job row is gone are reattached by a background task in
+every web worker (under a database lease), never while a page is rendered.
+Jobs are matched on the indexed ``jobs.requirements_hash``, the hash of the
+application's sorted skills and certifications: first among the synced jobs,
+then among the Employer API's current postings, which are synced in. An
+application nothing matches gets a placeholder job so it stays listed.
+"""
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+from typing import NamedTuple
+
+from flask import Flask, current_app
+from sqlalchemy.orm import load_only
+
+from employee_portal import db, socketio
+from employee_portal.models.application import Application
+from employee_portal.models.job import Job
+from employee_portal.services.employer_api_service import fetch_jobs
+from employee_portal.services.job_sync_service import apply_job_payloads
+from employee_portal.services.lease_service import acquire_lease, release_lease
+from employee_portal.utils.helpers import role_slug
+from employee_portal.utils.job_requirements import link_job_requirements, requirements_hash
+
+# Name of the sync_state row holding the reconciler lease
+RECONCILE_STATE = "application_reconcile"
+RECONCILE_LEASE_SECONDS = 300
+
+_reconciler_started = False
+_reconciler_lock = threading.Lock()
+
+
+class ReconcileReport(NamedTuple):
+    matched: int  # Reattached to a job already in the catalog
+    restored: int  # Reattached to a posting synced in from the Employer API
+    placeholders: int
+
+    @property
+    def reconciled(self) -> int:
+        return self.matched + self.restored + self.placeholders
+
+
+def _orphaned_applications(limit: int) -> list[Application]:
+    return (
+        Application.query.options(
+            load_only(Application.id, Application.job_id, Application.skills, Application.certifications, Application.submitted_at),
+        )
+        .outerjoin(Job, Application.job_id == Job.id)
+        .filter(Job.id.is_(None))
+        .order_by(Application.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def _newest_jobs_by_hash(hashes: set[str]) -> dict[str, int]:
+    """Id of the most recently posted job for each requirements hash that has one."""
+    if not hashes:
+        return {}
+    rows = (
+        db.session.query(Job.requirements_hash, Job.id)
+        .filter(Job.requirements_hash.in_(list(hashes)))
+        .order_by(Job.posted_at.desc(), Job.id.desc())
+    )
+    job_ids: dict[str, int] = {}
+    for hashed, job_id in rows:
+        job_ids.setdefault(hashed, job_id)
+    return job_ids
+
+
+def _sync_api_jobs(hashes: set[str]) -> bool:
+    """Sync in the Employer API's postings with one of the hashes; False if there are none."""
+    api_jobs_by_hash: dict[str, list[dict]] = defaultdict(list)
+    for api_job in fetch_jobs():
+        hashed = requirements_hash(api_job.get("required_skills"), api_job.get("required_certifications"))
+        if hashed is not None:
+            api_jobs_by_hash[hashed].append(api_job)
+    payloads = [api_job for hashed in hashes for api_job in api_jobs_by_hash.get(hashed, ())]
+    if not payloads:
+        return False
+    apply_job_payloads(payloads, delete_missing=False)
+    return True
+
+
+def _placeholder_job(application: Application) -> Job:
+    return Job(
+        external_id=f"restored_{application.id}",
+        title="Job (Details Unavailable)",
+        role="Unknown",
+        role_slug=role_slug("Unknown"),
+        company="Unknown Company",
+        location="Unknown",
+        description="This job listing is no longer available. The application was preserved for your records.",
+        required_skills=application.skills if isinstance(application.skills, list) else [],
+        required_certifications=application.certifications if isinstance(application.certifications, list) else [],
+        posted_at=application.submitted_at,  # Use application date as fallback
+    )
+
+
+def _reconcile_batch(limit: int) -> tuple[ReconcileReport, int]:
+    """Reattach up to ``limit`` orphans; also returns how many were found."""
+    orphans = _orphaned_applications(limit)
+    if not orphans:
+        return ReconcileReport(0, 0, 0), 0
+
+    hashes = {application.id: requirements_hash(application.skills, application.certifications) for application in orphans}
+    wanted = {hashed for hashed in hashes.values() if hashed is not None}
+    job_ids = _newest_jobs_by_hash(wanted)
+    missing = wanted - job_ids.keys()
+    restored_job_ids: dict[str, int] = {}
+    if missing and _sync_api_jobs(missing):
+        restored_job_ids = _newest_jobs_by_hash(missing)
+
+    matched = restored = 0
+    placeholders: list[Job] = []
+    for application in orphans:
+        hashed = hashes[application.id]
+        if hashed in job_ids:
+            application.job_id = job_ids[hashed]
+            matched += 1
+        elif hashed in restored_job_ids:
+            application.job_id = restored_job_ids[hashed]
+            restored += 1
+        else:
+            placeholder = _placeholder_job(application)
+            db.session.add(placeholder)
+            db.session.flush()
+            application.job_id = placeholder.id
+            placeholders.append(placeholder)
+
+    link_job_requirements((job.id, job.required_skills, job.required_certifications) for job in placeholders)
+    db.session.commit()
+    return ReconcileReport(matched, restored, len(placeholders)), len(orphans)
+
+
+def reconcile_orphaned_applications() -> ReconcileReport:
+    """Reattach every application whose job is missing, a batch at a time."""
+    limit = max(1, current_app.config.get("APPLICATION_RECONCILE_BATCH_SIZE", 500))
+    matched = restored = placeholders = 0
+    while True:
+        report, found = _reconcile_batch(limit)
+        matched, restored, placeholders = (
+            matched + report.matched,
+            restored + report.restored,
+            placeholders + report.placeholders,
+        )
+        if found < limit:
+            break
+
+    report = ReconcileReport(matched, restored, placeholders)
+    if report.reconciled:
+        current_app.logger.info(
+            f"Reconciled orphaned applications: {report.matched} matched, {report.restored} restored "
+            f"from the Employer API, {report.placeholders} placeholders"
+        )
+    return report
+
+
+def reconcile_if_free() -> ReconcileReport | None:
+    """Run the reconciler unless another process holds its lease (then None)."""
+    lease = acquire_lease(RECONCILE_STATE, RECONCILE_LEASE_SECONDS)
+    if lease is None:
+        return None
+    try:
+        return reconcile_orphaned_applications()
+    finally:
+        db.session.rollback()
+        release_lease(RECONCILE_STATE, lease)
+
+
+def _reconciler_loop(app: Flask) -> None:
+    poll_seconds = app.config.get("APPLICATION_RECONCILE_POLL_SECONDS", 300)
+    while True:
+        with app.app_context():
+            try:
+                reconcile_if_free()
+            except Exception:  # noqa: BLE001 - keep the reconciler alive
+                app.logger.exception("Application reconciliation failed")
+                db.session.rollback()
+            finally:
+                db.session.remove()
+        socketio.sleep(poll_seconds)
+
+
+def start_reconciler(app: Flask) -> None:
+    """Start the reconciler task for this process (once)."""
+    global _reconciler_started  # noqa: PLW0603
+
+    with _reconciler_lock:
+        if _reconciler_started:
+            return
+        _reconciler_started = True
+    socketio.start_background_task(_reconciler_loop, app)
+
+
+def init_application_reconciler(app: Flask) -> None:
+    """Register ``flask reconcile-applications`` (the reconciler is started by ``start_background_tasks``)."""
+
+    @app.cli.command("reconcile-applications")
+    def reconcile_applications_command() -> None:
+        """Reattach orphaned applications now."""
+        report = reconcile_if_free()
+        if report is None:
+            print("Another process holds the reconciler lease; nothing was run.")
+        else:
+            print(
+                f"Applications: {report.matched} matched, {report.restored} restored, "
+                f"{report.placeholders} placeholders.",
+            )
@@ -0,0 +1,129 @@
+"""
+Application status updates pushed by the Employer API.
+The webhook delivers batches of ``(external application id, status)`` pairs
+signed with EMPLOYER_WEBHOOK_SECRET. They are applied with one UPDATE per
+distinct status, keyed by the indexed ``applications.external_id``, and
+every change is pushed to the applicant's Socket.IO room.
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from flask import current_app
+from sqlalchemy import update
+
+from employee_portal import db, socketio
+from employee_portal.models.application import Application
+
+NOTIFICATIONS_NAMESPACE = "/notifications"
+# Withdrawn locally is final; the employer cannot reopen it
+FINAL_STATUSES = ("withdrawn",)
+_STATUS_LENGTH = 50
+_IN_CHUNK = 500
+
+
+class StatusUpdateReport(NamedTuple):
+    updated: int
+    unchanged: int
+    unknown: list[str]  # External ids no application has
+
+
+def user_room(user_id: int) -> str:
+    return f"user_{user_id}"
+
+
+def verify_signature(body: bytes, timestamp: str | None, signature: str | None) -> bool:
+    """
+    Check ``X-Webhook-Signature: sha256=<hex HMAC of "<timestamp>.<body>">``
+    and that the timestamp is within EMPLOYER_WEBHOOK_TOLERANCE_SECONDS, so
+    a captured request cannot be replayed later.
+    """
+    secret = current_app.config.get("EMPLOYER_WEBHOOK_SECRET", "")
+    if not secret or not timestamp or not signature:
+        return False
+    try:
+        sent_at = int(timestamp)
+    except ValueError:
+        return False
+    tolerance = current_app.config.get("EMPLOYER_WEBHOOK_TOLERANCE_SECONDS", 300)
+    if abs(time.time() - sent_at) > tolerance:
+        return False
+    expected = hmac.new(secret.encode("utf-8"), f"{timestamp}.".encode("utf-8") + body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(f"sha256={expected}", signature)
+
+
+def normalize_status(status: object) -> str | None:
+    if not isinstance(status, str) or not status.strip():
+        return None
+    return status.strip().lower()[:_STATUS_LENGTH]
+
+
+def _chunks(items: list, size: int) -> Iterable[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def apply_status_updates(updates: dict[str, str]) -> StatusUpdateReport:
+    """
+    Apply ``{external id: status}`` and notify the applicants whose
+    applications changed. Commits.
+    """
+    external_ids = list(updates)
+    current = {}
+    for chunk in _chunks(external_ids, _IN_CHUNK):
+        current.update(
+            (row.external_id, row)
+            for row in db.session.query(
+                Application.id,
+                Application.user_id,
+                Application.job_id,
+                Application.external_id,
+                Application.status,
+            ).filter(Application.external_id.in_(chunk))
+        )
+
+    by_status: dict[str, list[str]] = defaultdict(list)
+    changed = []
+    for external_id, status in updates.items():
+        row = current.get(external_id)
+        if row is None or row.status == status or row.status in FINAL_STATUSES:
+            continue
+        by_status[status].append(external_id)
+        changed.append((row, status))
+
+    for status, status_external_ids in by_status.items():
+        for chunk in _chunks(status_external_ids, _IN_CHUNK):
+            db.session.execute(
+                update(Application)
+                .where(
+                    Application.external_id.in_(chunk),
+                    Application.status.notin_(FINAL_STATUSES),
+                )
+                .values(status=status)
+                .execution_options(synchronize_session=False)
+            )
+    db.session.commit()
+
+    for row, status in changed:
+        socketio.emit(
+            "application_status",
+            {"application_id": row.id, "job_id": row.job_id, "status": status},
+            to=user_room(row.user_id),
+            namespace=NOTIFICATIONS_NAMESPACE,
+        )
+
+    report = StatusUpdateReport(
+        updated=len(changed),
+        unchanged=len(current) - len(changed),
+        unknown=[external_id for external_id in external_ids if external_id not in current],
+    )
+    current_app.logger.info(
+        f"Application status webhook: {report.updated} updated, {report.unchanged} unchanged, "
+        f"{len(report.unknown)} unknown"
+    )
+    return report
@@ -1,18 +1,28 @@
 """
 Company Rating Service
 Fetches company ratings from Yelp API and web scraping.
+Ratings are stored per company in ``company_ratings`` and only fetched again
+once they expire.
 """
 import logging
 import re
-from typing import Any
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from typing import Any, NamedTuple
 
 import nltk
 import requests
 from bs4 import BeautifulSoup
 from flask import current_app
 from googlesearch import search
+from sqlalchemy import exists, select, update
 from textblob import TextBlob
 
+from employee_portal import db
+from employee_portal.models.company_rating import CompanyRating
+from employee_portal.models.job import Job
+from employee_portal.services.job_sync_service import bump_catalog_version
+
 # Download NLTK data if needed
 try:
     nltk.data.find("tokenizers/punkt")
@@ -239,39 +249,101 @@ def get_company_rating(company: str) -> dict[str, Any]:
     }
 
 
-def update_job_ratings() -> None:
-    """Update ratings for all unique companies in the database."""
-    from employee_portal import db
-    from employee_portal.models.job import Job
+class RatingRefreshReport(NamedTuple):
+    refreshed: int  # Companies fetched again
+    fresh: int  # Companies whose stored rating had not expired
+    jobs_updated: int
+
 
-    if not current_app:
-        return
+# Sources backed by actual reviews; the rest are guesses worth retrying sooner
+REVIEWED_SOURCES = ("yelp", "web_scrape", "yelp + web_scrape")
 
-    # Get all unique companies
-    companies = db.session.query(Job.company).distinct().all()
-    company_names = [c[0] for c in companies]
 
-    logger.info(f"Updating ratings for {len(company_names)} companies")
+def _expires_at(source: str, now: datetime) -> datetime:
+    if source in REVIEWED_SOURCES:
+        ttl = current_app.config.get("COMPANY_RATING_TTL", 7 * 24 * 3600)
+    else:
+        ttl = current_app.config.get("COMPANY_RATING_FALLBACK_TTL", 24 * 3600)
+    return now + timedelta(seconds=ttl)
 
-    # Cache ratings by company name
-    ratings_cache: dict[str, float] = {}
 
-    for company in company_names:
-        if company in ratings_cache:
-            rating = ratings_cache[company]
-        else:
-            try:
-                result = get_company_rating(company)
-                rating = result["rating"]
-                ratings_cache[company] = rating
-                logger.info(f"Company {company}: {rating} stars ({result['source']})")
-            except Exception as e:
-                logger.exception(f"Error getting rating for {company}: {e}")
-                rating = 3.0  # Default neutral rating
+def _stale_companies(now: datetime) -> tuple[list[str], int]:
+    """Companies with jobs and no unexpired rating, and how many are fresh."""
+    rows = (
+        db.session.query(Job.company, CompanyRating.expires_at)
+        .outerjoin(CompanyRating, CompanyRating.company == Job.company)
+        .distinct()
+        .all()
+    )
+    stale = [company for company, expires_at in rows if expires_at is None or expires_at <= now]
+    return stale, len(rows) - len(stale)
 
-        # Update all jobs for this company
-        Job.query.filter_by(company=company).update({"rating": rating})
 
+def apply_company_ratings(job_ids: Iterable[int] | None = None) -> int:
+    """
+    Copy the stored ratings onto every job (or only ``job_ids``) whose rating
+    differs, in one UPDATE joined on the company, and bump the catalog
+    version when any changed so every worker's cached fragments are
+    replaced. Runs in the current transaction.
+    """
+    stored = (
+        select(CompanyRating.rating)
+        .where(CompanyRating.company == Job.company)
+        .scalar_subquery()
+    )
+    criteria = [
+        exists().where(CompanyRating.company == Job.company),
+        Job.rating.is_distinct_from(stored),
+    ]
+    if job_ids is not None:
+        criteria.append(Job.id.in_(list(job_ids)))
+    result = db.session.execute(
+        update(Job)
+        .where(*criteria)
+        .values(rating=stored)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        bump_catalog_version()
+    return result.rowcount
+
+
+def update_job_ratings() -> RatingRefreshReport:
+    """
+    Fetch ratings for the companies whose stored rating expired (or that
+    have none), then derive every job's rating from the stored ones.
+    """
+    now = datetime.utcnow()
+    stale, fresh = _stale_companies(now)
+    logger.info(f"Refreshing ratings for {len(stale)} companies ({fresh} still fresh)")
+
+    stored = {
+        rating.company: rating
+        for rating in CompanyRating.query.filter(CompanyRating.company.in_(stale))
+    } if stale else {}
+    for company in stale:
+        try:
+            result = get_company_rating(company)
+        except Exception as e:
+            logger.exception(f"Error getting rating for {company}: {e}")
+            if company in stored:
+                continue  # Keep the last known rating until the next refresh
+            result = {"source": "default", "rating": 3.0, "reviews": []}  # Default neutral rating
+        logger.info(f"Company {company}: {result['rating']} stars ({result['source']})")
+
+        rating = stored.get(company)
+        if rating is None:
+            rating = CompanyRating(company=company)
+            db.session.add(rating)
+        rating.rating = result["rating"]
+        rating.source = result["source"]
+        rating.reviews = result.get("reviews", [])
+        rating.fetched_at = now
+        rating.expires_at = _expires_at(result["source"], now)
+    db.session.flush()
+
+    jobs_updated = apply_company_ratings()
     db.session.commit()
-    logger.info("Job ratings updated successfully")
+    logger.info(f"Job ratings updated: {jobs_updated} jobs changed")
+    return RatingRefreshReport(refreshed=len(stale), fresh=fresh, jobs_updated=jobs_updated)
 
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import codecs
+import json
 import requests
-from datetime import datetime, timedelta
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from itertools import chain, islice
 from random import randint
+from typing import NamedTuple
+from urllib.parse import urljoin
 
 from flask import current_app
 
+from employee_portal.services import http_client
+
 MOCK_JOBS = [
     {
         "id": 1001,
@@ -82,6 +91,7 @@ def _get_api_config() -> dict:
         "base_url": current_app.config.get("EMPLOYER_API_BASE_URL", ""),
         "api_key": current_app.config.get("EMPLOYER_API_KEY", ""),
         "timeout": current_app.config.get("EMPLOYER_API_TIMEOUT", 10),
+        "page_size": current_app.config.get("EMPLOYER_API_PAGE_SIZE", 0),
         "enabled": current_app.config.get("EMPLOYER_API_ENABLED", False),
     }
 
@@ -97,52 +107,266 @@ def _fetch_mock_jobs() -> list[dict]:
     return jobs
 
 
-def fetch_jobs() -> list[dict]:
+# Keys of a paginated envelope response: {"jobs": [...], "next_cursor": "..."}
+_ENVELOPE_ITEM_KEYS = ("jobs", "data", "results", "items")
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class JobFeed(NamedTuple):
+    """Result of a GET /jobs call; ``batches`` streams the payloads lazily."""
+
+    batches: Iterator[list[dict]]
+    not_modified: bool = False  # 304: the copy we hold is current
+    is_delta: bool = False  # Only jobs updated since the requested cursor
+    etag: str | None = None
+    last_modified: str | None = None
+    server_time: datetime | None = None  # Cursor for the next delta fetch
+    unavailable: bool = False  # API failed; ``batches`` holds the mock fallback
+
+
+def _iter_json_array(chunks: Iterable[bytes], encoding: str | None) -> Iterator[dict]:
     """
-    Fetch jobs from the real Employer API.
-    Falls back to mock data if API is disabled or unavailable.
+    Yield the elements of a top-level JSON array as they arrive, holding at
+    most one chunk plus one partially received element in memory.
     """
-    config = _get_api_config()
+    text_decoder = codecs.getincrementaldecoder(encoding or "utf-8")()
+    json_decoder = json.JSONDecoder()
+    buffer = ""
+    expecting = "open"  # "open" -> "item" -> "separator" -> "item" ...
+    for chunk in chunks:
+        buffer += text_decoder.decode(chunk)
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position >= len(buffer):
+                break
+            char = buffer[position]
+            if expecting == "open":
+                if char != "[":
+                    raise ValueError("Expected a JSON array from the Employer API")
+                position += 1
+                expecting = "item"
+            elif char == "]" and expecting in ("item", "separator"):
+                return
+            elif expecting == "separator":
+                if char != ",":
+                    raise ValueError(f"Unexpected {char!r} in Employer API job list")
+                position += 1
+                expecting = "item"
+            else:
+                try:
+                    item, position = json_decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    break  # Element continues in the next chunk
+                yield item
+                expecting = "separator"
+        buffer = buffer[position:]
+    raise ValueError("Employer API job list ended before the closing bracket")
 
-    # Debug logging
-    current_app.logger.info(
-        f"API Config - enabled: {config['enabled']}, base_url: {config['base_url']}"
-    )
+
+def _iter_page(response: requests.Response):
+    """
+    Yield the jobs of one response page and return the request for the next
+    page as ``(url, params)``, or None on the last page. Pages are either a
+    plain JSON array (streamed, next page via a ``Link: rel="next"`` header)
+    or an envelope object with ``next``/``next_cursor``/``next_page`` keys.
+    """
+    next_link = response.links.get("next", {}).get("url")
+    chunks = response.iter_content(chunk_size=_STREAM_CHUNK_SIZE)
+    first_chunk = b""
+    for first_chunk in chunks:
+        if first_chunk.strip():
+            break
+
+    if first_chunk.lstrip().startswith(b"{"):
+        # Envelopes are bounded by the server's page size
+        envelope = json.loads(first_chunk + b"".join(chunks))
+        items = next(
+            (envelope[key] for key in _ENVELOPE_ITEM_KEYS if isinstance(envelope.get(key), list)),
+            [],
+        )
+        yield from items
+        if envelope.get("next"):
+            return urljoin(response.url, envelope["next"]), None
+        if envelope.get("next_cursor"):
+            return None, {"cursor": envelope["next_cursor"]}
+        if envelope.get("next_page"):
+            return None, {"page": envelope["next_page"]}
+        return None
+
+    yield from _iter_json_array(chain((first_chunk,), chunks), response.encoding)
+    if next_link:
+        return urljoin(response.url, next_link), None
+    return None
+
+
+def _iter_job_pages(
+    first_response: requests.Response,
+    api_url: str,
+    params: dict,
+    timeout: int,
+) -> Iterator[dict]:
+    """Yield every job across all pages, requesting each page when it is reached."""
+    response = first_response
+    while response is not None:
+        with response:
+            response.raise_for_status()
+            next_request = yield from _iter_page(response)
+        if next_request is None:
+            return
+        next_url, next_params = next_request
+        response = http_client.request(
+            "GET",
+            next_url or api_url,
+            endpoint="GET /jobs",
+            params=None if next_url else {**params, **next_params},
+            timeout=timeout,
+            stream=True,
+        )
+
+
+def _in_batches(items: Iterator[dict], size: int) -> Iterator[list[dict]]:
+    while batch := list(islice(items, size)):
+        yield batch
+
+
+def _server_time(response: requests.Response) -> datetime | None:
+    date_header = response.headers.get("Date")
+    if not date_header:
+        return None
+    try:
+        server_time = parsedate_to_datetime(date_header)
+    except (TypeError, ValueError):
+        return None
+    if server_time.tzinfo is not None:
+        server_time = server_time.astimezone(timezone.utc).replace(tzinfo=None)
+    return server_time
+
+
+def fetch_job_feed(
+    etag: str | None = None,
+    last_modified: str | None = None,
+    updated_since: datetime | None = None,
+    batch_size: int = 500,
+) -> JobFeed:
+    """
+    Fetch jobs from the Employer API with conditional request headers.
+
+    ``etag``/``last_modified`` come from the previous response and let the API
+    answer 304 when nothing changed. With ``updated_since`` only jobs changed
+    after that (server) time are requested; deletions are not reported in that
+    mode, so callers must still run full fetches now and then.
+
+    Only the first page is requested here. The returned ``batches`` stream the
+    remaining jobs in lists of at most ``batch_size``, following pagination
+    as they are consumed, so memory does not grow with the size of the feed.
+    Falls back to the mock feed if the API is disabled or unavailable.
+    """
+    config = _get_api_config()
 
     # Use mock if API is not enabled
     if not config["enabled"] or not config["base_url"]:
         current_app.logger.warning(
             f"API not enabled or base_url missing. enabled={config['enabled']}, base_url={config['base_url']}"
         )
-        return _fetch_mock_jobs()
+        return JobFeed(batches=_in_batches(iter(_fetch_mock_jobs()), batch_size))
 
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    params = {}
+    if updated_since is not None:
+        params["updated_since"] = updated_since.isoformat()
+    if config["page_size"]:
+        params["page_size"] = config["page_size"]
+
+    requested_at = datetime.utcnow()
+    api_url = f"{config['base_url']}/jobs"
     try:
-        api_url = f"{config['base_url']}/jobs"
-        current_app.logger.info(f"Fetching jobs from: {api_url}")
+        current_app.logger.info(f"Fetching jobs from: {api_url} params={params}")
 
         # GET /jobs doesn't require authentication
-        response = requests.get(
+        response = http_client.request(
+            "GET",
             api_url,
+            endpoint="GET /jobs",
+            params=params,
+            headers=headers,
             timeout=config["timeout"],
+            stream=True,
         )
+        if response.status_code == 304:
+            response.close()
+            current_app.logger.info("Employer API jobs not modified since last fetch")
+            return JobFeed(
+                batches=iter(()),
+                not_modified=True,
+                is_delta=updated_since is not None,
+                etag=etag,
+                last_modified=last_modified,
+            )
+        if not response.ok:
+            response.close()
         response.raise_for_status()
 
-        jobs = response.json()
-        current_app.logger.info(f"Fetched {len(jobs)} jobs from Employer API")
-        
-        # Return jobs even if empty - don't fallback to mock when API is enabled
-        return jobs
-
     except requests.exceptions.RequestException as e:
         current_app.logger.error(f"Failed to fetch jobs from Employer API: {e}")
-        current_app.logger.warning("Falling back to mock job data")
-        return _fetch_mock_jobs()
+        return JobFeed(batches=_in_batches(iter(_fetch_mock_jobs()), batch_size), unavailable=True)
+
+    # Return jobs even if empty - don't fallback to mock when API is enabled
+    jobs = _iter_job_pages(response, api_url, params, config["timeout"])
+    return JobFeed(
+        batches=_in_batches(jobs, batch_size),
+        is_delta=updated_since is not None,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        server_time=_server_time(response) or requested_at,
+    )
+
+
+# Last complete job list fetched from the API, served while it is unavailable
+_last_good_jobs: list[dict] | None = None
 
 
-def post_application(application_data: dict) -> dict:
+def fetch_jobs() -> list[dict]:
+    """
+    Fetch the full job list from the real Employer API.
+    If the API fails, returns the last list fetched successfully, or mock
+    data if there is none (or the API is disabled).
+    """
+    global _last_good_jobs  # noqa: PLW0603
+    feed = fetch_job_feed()
+    if not feed.unavailable:
+        try:
+            jobs = [job for batch in feed.batches for job in batch]
+        except (requests.exceptions.RequestException, ValueError) as e:
+            current_app.logger.error(f"Failed to read jobs from Employer API: {e}")
+        else:
+            if _get_api_config()["enabled"]:
+                _last_good_jobs = jobs
+            return jobs
+
+    if _last_good_jobs is not None:
+        current_app.logger.warning("Serving the last job list fetched from the Employer API")
+        return list(_last_good_jobs)
+    current_app.logger.warning("Falling back to mock job data")
+    return _fetch_mock_jobs()
+
+
+def _is_retryable_status(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+
+def post_application(application_data: dict, idempotency_key: str | None = None) -> dict:
     """
     Submit application to the real Employer API.
     Falls back to mock response if API is disabled or unavailable.
+
+    Failed results carry ``retryable``: True when the API was unreachable or
+    answered 429/5xx, so the outbox knows whether to try again.
     """
     config = _get_api_config()
 
@@ -153,13 +377,19 @@ def post_application(application_data: dict) -> dict:
     try:
         # POST /applications doesn't require authentication
         headers = {"Content-Type": "application/json"}
+        if idempotency_key:
+            headers["Idempotency-Key"] = idempotency_key
 
         current_app.logger.info(
             f"Submitting application to {config['base_url']}/applications: {application_data}"
         )
 
-        response = requests.post(
+        # Only retried by the client when an idempotency key is sent: a POST
+        # that reached the API may already have been stored
+        response = http_client.request(
+            "POST",
             f"{config['base_url']}/applications",
+            endpoint="POST /applications",
             json=application_data,
             headers=headers,
             timeout=config["timeout"],
@@ -172,12 +402,16 @@ def post_application(application_data: dict) -> dict:
 
         # Parse JSON response
         result = response.json()
+        retryable = _is_retryable_status(response.status_code)
+        if not isinstance(result, dict):
+            current_app.logger.error(f"Unexpected application response: {response.text[:200]}")
+            return {"success": False, "error": "Unexpected response from the API", "retryable": True}
 
         # Check if API returned success: false (even with 200 status)
         if not result.get("success", False):
             error_msg = result.get("error", "Unknown error")
             current_app.logger.error(f"API returned error: {error_msg}")
-            return {"success": False, "error": error_msg}
+            return {"success": False, "error": error_msg, "retryable": retryable}
 
         # Check HTTP status code
         try:
@@ -186,7 +420,7 @@ def post_application(application_data: dict) -> dict:
             # If HTTP error, we already have the JSON response above
             error_msg = result.get("error", f"HTTP {response.status_code}")
             current_app.logger.error(f"HTTP error: {error_msg}")
-            return {"success": False, "error": error_msg}
+            return {"success": False, "error": error_msg, "retryable": retryable}
 
         # Success!
         current_app.logger.info(
@@ -206,11 +440,66 @@ def post_application(application_data: dict) -> dict:
             current_app.logger.error(
                 f"HTTP error submitting application: {e.response.status_code}, body: {e.response.text[:200]}"
             )
-        return {"success": False, "error": error_msg}
+        return {
+            "success": False,
+            "error": error_msg,
+            "retryable": _is_retryable_status(e.response.status_code),
+        }
 
     except requests.exceptions.RequestException as e:
         current_app.logger.error(f"Network error submitting application: {e}")
-        return {"success": False, "error": "Network error. Please try again later."}
+        return {"success": False, "error": "Network error. Please try again later.", "retryable": True}
+
+
+def post_applications_batch(applications: list[tuple[str, dict]]) -> list[dict] | None:
+    """
+    Submit several applications in one POST /applications/batch call.
+
+    ``applications`` holds (idempotency key, payload) pairs. The API answers
+    ``{"results": [{"idempotency_key": ..., "success": ..., ...}]}``; the
+    results are returned in input order, shaped like post_application()'s.
+    Returns None when the API has no batch endpoint (404/405), so callers can
+    fall back to single posts.
+    """
+    config = _get_api_config()
+    if not config["enabled"] or not config["base_url"]:
+        return [_post_mock_application(payload) for _, payload in applications]
+
+    body = {"applications": [{**payload, "idempotency_key": key} for key, payload in applications]}
+    try:
+        response = http_client.request(
+            "POST",
+            f"{config['base_url']}/applications/batch",
+            endpoint="POST /applications/batch",
+            json=body,
+            headers={"Content-Type": "application/json"},
+            timeout=config["timeout"],
+        )
+        if response.status_code in (404, 405):
+            return None
+        if not response.ok:
+            error_msg = f"API returned error: {response.status_code}"
+            current_app.logger.error(f"Batch application submit failed: {error_msg}")
+            retryable = _is_retryable_status(response.status_code)
+            return [{"success": False, "error": error_msg, "retryable": retryable} for _ in applications]
+        body = response.json()
+        results = body.get("results") if isinstance(body, dict) else None
+        if not isinstance(results, list):
+            current_app.logger.error(f"Unexpected batch application response: {response.text[:200]}")
+            return [
+                {"success": False, "error": "Unexpected response from the API", "retryable": True}
+                for _ in applications
+            ]
+    except requests.exceptions.RequestException as e:
+        current_app.logger.error(f"Network error submitting applications: {e}")
+        return [
+            {"success": False, "error": "Network error. Please try again later.", "retryable": True}
+            for _ in applications
+        ]
+
+    by_key = {result.get("idempotency_key"): result for result in results if isinstance(result, dict)}
+    missing = {"success": False, "error": "Missing from batch response", "retryable": True}
+    return [by_key.get(key, missing) for key, _ in applications]
 
 
 def _post_mock_application(application_data: dict) -> dict:
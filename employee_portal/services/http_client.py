@@ -0,0 +1,288 @@
+"""
+Shared HTTP client for the Employer API.
+One requests.Session per process keeps connections alive between calls. The
+pool holds at most EMPLOYER_API_POOL_SIZE connections and callers wait for a
+free one instead of opening more. Idempotent requests are retried with
+exponential backoff and full jitter; latency, error and retry counts are
+recorded per endpoint and logged after every job sync.
+
+A circuit breaker per upstream host fails calls immediately after repeated
+failures, and inside a Flask request all calls share one deadline
+(EMPLOYER_API_REQUEST_BUDGET), so a degraded upstream cannot hold a worker
+for longer than that.
+"""
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from flask import current_app, g, has_request_context
+from requests.adapters import HTTPAdapter
+
+# Only these are safe to send twice
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Responses worth retrying: rate limited or the upstream is briefly unavailable
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+_stats: dict[str, dict] = {}
+_stats_lock = threading.Lock()
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """The upstream failed repeatedly; calls are rejected until it recovers."""
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """The current request has used up its budget for outbound calls."""
+
+
+class CircuitBreaker:
+    """
+    Opens after ``threshold`` consecutive failures. After ``reset_seconds``
+    one probe call is let through: success closes the breaker, failure keeps
+    it open for another period.
+    """
+
+    def __init__(self, threshold: int, reset_seconds: float):
+        self.threshold = max(1, threshold)
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._probing or time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self.opened_at < self.reset_seconds:
+                return False
+            self._probing = True
+            return True
+
+    def release(self) -> None:
+        """Give up a probe slot without recording an outcome."""
+        with self._lock:
+            self._probing = False
+
+    def record(self, ok: bool) -> None:
+        with self._lock:
+            self._probing = False
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+def _breaker_for(url: str) -> CircuitBreaker:
+    host = urlparse(url).netloc
+    breaker = _breakers.get(host)
+    if breaker is None:
+        with _stats_lock:
+            breaker = _breakers.setdefault(
+                host,
+                CircuitBreaker(
+                    current_app.config.get("EMPLOYER_API_BREAKER_THRESHOLD", 5),
+                    current_app.config.get("EMPLOYER_API_BREAKER_RESET_SECONDS", 30),
+                ),
+            )
+    return breaker
+
+
+def circuit_states() -> dict[str, str]:
+    """Breaker state ("closed", "open" or "half-open") per upstream host."""
+    return {host: breaker.state for host, breaker in list(_breakers.items())}
+
+
+def _remaining_budget() -> float | None:
+    """Seconds left for outbound calls in this request; None outside requests."""
+    budget = current_app.config.get("EMPLOYER_API_REQUEST_BUDGET", 0)
+    if budget <= 0 or not has_request_context():
+        return None
+    if "employer_api_deadline" not in g:
+        g.employer_api_deadline = time.monotonic() + budget
+    return g.employer_api_deadline - time.monotonic()
+
+
+def _cap_timeout(timeout, remaining: float):  # noqa: ANN001, ANN202
+    if timeout is None:
+        return remaining
+    if isinstance(timeout, tuple):
+        return tuple(remaining if part is None else min(part, remaining) for part in timeout)
+    return min(timeout, remaining)
+
+
+def _build_session() -> requests.Session:
+    pool_size = max(1, current_app.config.get("EMPLOYER_API_POOL_SIZE", 10))
+    # Retries happen in request() so they can be counted and limited to
+    # idempotent methods; the adapter itself never retries.
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=pool_size,
+        pool_block=True,
+        max_retries=0,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return this process's shared session, creating it on first use."""
+    global _session  # noqa: PLW0603
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def _reset_after_fork() -> None:
+    # Pooled sockets must not be shared with a forked worker
+    global _session, _session_lock, _stats_lock  # noqa: PLW0603
+    _session = None
+    _session_lock = threading.Lock()
+    _stats_lock = threading.Lock()
+    _stats.clear()
+    _breakers.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _record(endpoint: str, elapsed: float, error: bool, retries: int) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(
+            endpoint,
+            {"calls": 0, "errors": 0, "retries": 0, "total_seconds": 0.0, "max_seconds": 0.0},
+        )
+        stats["calls"] += 1
+        stats["errors"] += int(error)
+        stats["retries"] += retries
+        stats["total_seconds"] += elapsed
+        stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+
+
+def endpoint_stats() -> dict[str, dict]:
+    """Snapshot of the per-endpoint counters, with the mean latency added."""
+    with _stats_lock:
+        snapshot = {endpoint: dict(stats) for endpoint, stats in _stats.items()}
+    for stats in snapshot.values():
+        stats["mean_seconds"] = stats["total_seconds"] / stats["calls"] if stats["calls"] else 0.0
+    return snapshot
+
+
+def _backoff_delay(attempt: int, response: requests.Response | None) -> float:
+    base = current_app.config.get("EMPLOYER_API_BACKOFF_SECONDS", 0.5)
+    cap = current_app.config.get("EMPLOYER_API_BACKOFF_MAX", 8.0)
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), cap)
+    # Full jitter: anywhere between zero and the exponential ceiling
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+def request(method: str, url: str, endpoint: str | None = None, **kwargs) -> requests.Response:
+    """
+    Send a request through the shared session.
+
+    ``endpoint`` labels the call in the stats (defaults to method and path).
+    Idempotent methods (and requests with an Idempotency-Key header) are
+    retried up to EMPLOYER_API_MAX_RETRIES times on connection errors,
+    timeouts and 429/502/503/504 answers; anything else is sent once.
+    Latency is measured up to the response headers, so streamed bodies are
+    not included.
+
+    Raises CircuitOpenError while the host's breaker is open and
+    DeadlineExceeded once the request budget is spent; both are
+    RequestExceptions, so callers' existing fallbacks apply.
+    """
+    method = method.upper()
+    endpoint = endpoint or f"{method} {urlparse(url).path or '/'}"
+    max_retries = current_app.config.get("EMPLOYER_API_MAX_RETRIES", 3)
+    # A request carrying an idempotency key is safe to repeat as well
+    headers = kwargs.get("headers") or {}
+    repeatable = method in IDEMPOTENT_METHODS or "Idempotency-Key" in headers
+    retries = max_retries if repeatable else 0
+    breaker = _breaker_for(url)
+    if not breaker.allow():
+        _record(endpoint, 0.0, True, 0)
+        raise CircuitOpenError(f"Circuit open for {endpoint}; not calling the Employer API")
+    session = get_session()
+
+    timeout_setting = kwargs.get("timeout")
+    started = time.perf_counter()
+    attempt = 0
+    while True:
+        remaining = _remaining_budget()
+        if remaining is not None and remaining <= 0:
+            # Spending the budget says nothing about upstream health
+            breaker.release()
+            _record(endpoint, time.perf_counter() - started, True, attempt)
+            raise DeadlineExceeded(f"Request budget exhausted before {endpoint}")
+        budget_capped = False
+        if remaining is not None:
+            timeout = _cap_timeout(timeout_setting, remaining)
+            budget_capped = timeout != timeout_setting
+            kwargs["timeout"] = timeout
+
+        try:
+            response = session.request(method, url, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as exc:
+            delay = _backoff_delay(attempt, None)
+            if attempt >= retries or not _fits_budget(delay):
+                if budget_capped and isinstance(exc, requests.exceptions.Timeout):
+                    breaker.release()  # Cut short by our budget, not the upstream
+                else:
+                    breaker.record(ok=False)
+                _record(endpoint, time.perf_counter() - started, True, attempt)
+                raise
+            current_app.logger.warning(f"{endpoint} failed ({exc}); retry {attempt + 1}/{retries}")
+            time.sleep(delay)
+            attempt += 1
+            continue
+        except requests.exceptions.RequestException:
+            breaker.record(ok=False)
+            _record(endpoint, time.perf_counter() - started, True, attempt)
+            raise
+
+        if response.status_code in RETRY_STATUSES and attempt < retries:
+            delay = _backoff_delay(attempt, response)
+            if _fits_budget(delay):
+                current_app.logger.warning(
+                    f"{endpoint} returned {response.status_code}; retry {attempt + 1}/{retries}"
+                )
+                response.close()
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+        upstream_failed = response.status_code in RETRY_STATUSES or response.status_code >= 500
+        breaker.record(ok=not upstream_failed)
+        _record(endpoint, time.perf_counter() - started, response.status_code >= 400, attempt)
+        return response
+
+
+def _fits_budget(delay: float) -> bool:
+    remaining = _remaining_budget()
+    return remaining is None or delay < remaining
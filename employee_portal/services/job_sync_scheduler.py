@@ -0,0 +1,126 @@
+"""
+Background job sync.
+Every web worker runs a scheduler task that checks every JOB_SYNC_POLL_SECONDS
+whether the catalog is older than JOB_CACHE_TIMEOUT. The sync itself runs
+under a database lease, so only one process talks to the employer API per
+refresh and request handlers only ever read committed job rows.
+"""
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta
+
+from flask import Flask, current_app
+
+from employee_portal import db, socketio
+from employee_portal.services.http_client import circuit_states, endpoint_stats
+from employee_portal.services.job_sync_service import JOB_SYNC_STATE, SyncReport, run_job_sync
+from employee_portal.services.lease_service import acquire_lease, get_sync_state, release_lease
+
+_wake_event = threading.Event()
+_force_requested = threading.Event()
+_scheduler_started = False
+_scheduler_lock = threading.Lock()
+
+
+def _log_api_stats() -> None:
+    """
+    Log this process's Employer API counters (cumulative since it started)
+    and any circuit breaker that is not closed.
+    """
+    for endpoint, stats in sorted(endpoint_stats().items()):
+        current_app.logger.info(
+            f"Employer API {endpoint}: {stats['calls']} calls, {stats['errors']} errors, "
+            f"{stats['retries']} retries, mean {stats['mean_seconds']:.3f}s, max {stats['max_seconds']:.3f}s"
+        )
+    for host, state in sorted(circuit_states().items()):
+        if state != "closed":
+            current_app.logger.warning(f"Employer API circuit for {host} is {state}")
+
+
+def sync_jobs_if_due(force: bool = False) -> SyncReport | None:
+    """
+    Run the job sync when the last successful one is older than
+    JOB_CACHE_TIMEOUT (or ``force`` is set, which also makes it a full
+    sync) and no other process holds the sync lease. Returns None when
+    nothing ran.
+    """
+    timeout = current_app.config.get("JOB_CACHE_TIMEOUT", 900)
+    state = get_sync_state(JOB_SYNC_STATE)
+    if (
+        not force
+        and state.last_success_at is not None
+        and datetime.utcnow() - state.last_success_at < timedelta(seconds=timeout)
+    ):
+        return None
+
+    lease_seconds = current_app.config.get("JOB_SYNC_LEASE_SECONDS", 300)
+    lease = acquire_lease(JOB_SYNC_STATE, lease_seconds)
+    if lease is None:
+        return None
+    try:
+        report = run_job_sync(full=force)
+        state = get_sync_state(JOB_SYNC_STATE)
+        state.last_success_at = datetime.utcnow()
+        db.session.commit()
+        return report
+    finally:
+        db.session.rollback()
+        release_lease(JOB_SYNC_STATE, lease)
+        _log_api_stats()
+
+
+def request_job_sync() -> None:
+    """Ask for a forced sync without waiting for it (used by "Refresh Jobs")."""
+    if _scheduler_started:
+        _force_requested.set()
+        _wake_event.set()
+    else:
+        # No scheduler in this process (tests, scripts): run it inline
+        sync_jobs_if_due(force=True)
+
+
+def _scheduler_loop(app: Flask) -> None:
+    poll_seconds = app.config.get("JOB_SYNC_POLL_SECONDS", 30)
+    while True:
+        force = _force_requested.is_set()
+        _force_requested.clear()
+        with app.app_context():
+            try:
+                sync_jobs_if_due(force=force)
+            except Exception:  # noqa: BLE001 - keep the scheduler alive
+                app.logger.exception("Background job sync failed")
+                db.session.rollback()
+            finally:
+                db.session.remove()
+        _wake_event.wait(poll_seconds)
+        _wake_event.clear()
+
+
+def start_job_sync_scheduler(app: Flask) -> None:
+    """Start the scheduler task for this process (once)."""
+    global _scheduler_started  # noqa: PLW0603
+
+    with _scheduler_lock:
+        if _scheduler_started:
+            return
+        _scheduler_started = True
+    socketio.start_background_task(_scheduler_loop, app)
+
+
+def init_job_sync(app: Flask) -> None:
+    """Register the ``flask sync-jobs`` command (the scheduler is started by ``start_background_tasks``)."""
+
+    @app.cli.command("sync-jobs")
+    def sync_jobs_command() -> None:
+        """Run the job sync now, regardless of the cache window."""
+        report = sync_jobs_if_due(force=True)
+        if report is None:
+            print("Another process holds the job sync lease; nothing was run.")
+        elif report.not_modified:
+            print("Employer feed not modified; nothing to sync.")
+        else:
+            print(
+                f"Synced jobs: {report.inserted} inserted, {report.updated} updated, "
+                f"{report.deleted} deleted, {report.unchanged} unchanged.",
+            )
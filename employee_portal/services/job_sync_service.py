@@ -0,0 +1,385 @@
+"""
+Job catalog sync.
+Applies the employer job feed to the jobs table batch by batch: for each
+batch of JOB_SYNC_BATCH_SIZE payloads the matching rows are loaded in one
+query, diffed by content hash, and inserts and updates are sent as batched
+statements; postings missing from a full feed are deleted in batches.
+Unchanged jobs are never written. Requirement links and the search index
+are updated in the same transaction. Listeners of ``jobs_synced`` receive
+the ids of the jobs that changed.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import NamedTuple
+
+from blinker import Namespace
+from flask import current_app
+from sqlalchemy import delete, exists, insert, update
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+from employee_portal import db
+from employee_portal.models.application import Application
+from employee_portal.models.job import Job
+from employee_portal.models.job_match_score import JobMatchScore
+from employee_portal.models.sync_state import SyncState
+from employee_portal.services.employer_api_service import fetch_job_feed
+from employee_portal.services.lease_service import get_sync_state
+from employee_portal.utils.helpers import role_slug
+from employee_portal.utils.job_requirements import link_job_requirements, requirements_hash, unlink_jobs
+from employee_portal.utils.job_search import index_jobs, remove_jobs
+from employee_portal.utils.match_scoring import dump_job_features
+
+_signals = Namespace()
+# Name of the sync_state row holding the job sync lease and feed cursors
+JOB_SYNC_STATE = "job_sync"
+# Delta fetches re-request a short overlap to cover clock and commit skew
+DELTA_OVERLAP = timedelta(minutes=1)
+
+# Sent after a sync that changed anything, with the SyncReport as ``report``
+jobs_synced = _signals.signal("jobs-synced")
+
+# Columns that come from the employer feed; a change to any of them is a
+# content change for the job.
+CONTENT_COLUMNS = (
+    "title",
+    "role",
+    "company",
+    "location",
+    "description",
+    "required_skills",
+    "required_certifications",
+    "posted_at",
+)
+
+
+class SyncReport(NamedTuple):
+    inserted: int
+    updated: int
+    deleted: int
+    unchanged: int
+    duration_seconds: float
+    peak_memory_bytes: int | None  # Traced allocations; only with JOB_SYNC_TRACK_MEMORY
+    changed_job_ids: frozenset[int] = frozenset()  # Inserted or updated
+    deleted_job_ids: frozenset[int] = frozenset()
+    not_modified: bool = False  # Feed answered 304; nothing was applied
+    # Peak RSS of the whole process lifetime, not of this run (free to read)
+    process_peak_rss_bytes: int | None = None
+    # How far this run raised that peak; 0 when it stayed under an earlier one
+    peak_rss_growth_bytes: int | None = None
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.changed_job_ids or self.deleted_job_ids)
+
+
+def catalog_version() -> int:
+    """Version of the job catalog; changes whenever a sync or rating update changes any job."""
+    version = db.session.query(SyncState.catalog_version).filter(SyncState.name == JOB_SYNC_STATE).scalar()
+    return version or 0
+
+
+def bump_catalog_version() -> None:
+    """Mark the job catalog as changed, in the current transaction."""
+    db.session.execute(
+        update(SyncState)
+        .where(SyncState.name == JOB_SYNC_STATE)
+        .values(catalog_version=SyncState.catalog_version + 1)
+    )
+
+
+def _process_peak_rss_bytes() -> int | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KiB elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _parse_posted_at(value) -> datetime | None:  # noqa: ANN001
+    if not value:
+        return None
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def job_values_from_payload(payload: dict) -> dict:
+    """Map one employer API job payload onto Job column values."""
+    return {
+        "title": payload["title"],
+        "role": payload["role"],
+        "company": payload.get("company", "Acme Corp"),
+        "location": payload["location"],
+        "description": payload.get("description", ""),
+        "required_skills": payload.get("required_skills", []),
+        "required_certifications": payload.get("required_certifications", []),
+        "posted_at": _parse_posted_at(payload.get("posted_at")),
+    }
+
+
+def content_hash(values: dict) -> str:
+    """Stable hash of normalized job values; equal content gives equal hashes."""
+    encoded = json.dumps(values, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _batched(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _insert_statement():
+    """INSERT for new jobs; an upsert on dialects that support ON CONFLICT."""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert  # noqa: WPS433
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert  # noqa: WPS433
+    else:
+        return insert(Job.__table__)
+
+    # Another worker may have inserted the same posting since we read the table
+    table = Job.__table__
+    statement = dialect_insert(table)
+    updates = {column: statement.excluded[column] for column in CONTENT_COLUMNS}
+    updates["match_features"] = statement.excluded.match_features
+    updates["role_slug"] = statement.excluded.role_slug
+    updates["requirements_hash"] = statement.excluded.requirements_hash
+    updates["content_hash"] = statement.excluded.content_hash
+    updates["last_synced_at"] = statement.excluded.last_synced_at
+    updates["content_version"] = table.c.content_version + 1
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.external_id],
+        set_=updates,
+    )
+
+
+def _existing_job_rows(external_ids: list[str]) -> dict:
+    return {
+        row.external_id: row
+        for row in db.session.query(
+            Job.id,
+            Job.external_id,
+            Job.content_hash,
+            Job.content_version,
+            Job.posted_at,
+        ).filter(Job.external_id.in_(external_ids))
+    }
+
+
+def _stale_job_ids(seen_external_ids: set[str]) -> list[int]:
+    """Jobs missing from a full feed, except those with applications."""
+    # Don't delete jobs that have applications - preserve application history
+    has_applications = exists().where(Application.job_id == Job.id)
+    rows = (
+        db.session.query(Job.id, Job.external_id)
+        .filter(~has_applications)
+        .execution_options(yield_per=1000)
+    )
+    return [job_id for job_id, external_id in rows if external_id not in seen_external_ids]
+
+
+def apply_job_batches(job_batches: Iterable[list[dict]], delete_missing: bool = True) -> SyncReport:
+    """
+    Insert and update jobs from batches of payloads, one batch at a time, so
+    memory is bounded by the batch size (plus the external ids seen so far,
+    which full syncs need to find deleted postings). With ``delete_missing``
+    the batches are the whole catalog and jobs absent from them are deleted.
+    Everything is committed at once, so readers never see a partial sync.
+    """
+    started = time.perf_counter()
+    rss_before = _process_peak_rss_bytes()
+    # tracemalloc slows the whole process down while it runs, so it is opt-in
+    track_memory = current_app.config.get("JOB_SYNC_TRACK_MEMORY", False)
+    started_tracing = track_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+
+    get_sync_state(JOB_SYNC_STATE)  # Holds the catalog version bumped below
+    now = datetime.utcnow()
+    insert_statement = _insert_statement()
+    seen_external_ids: set[str] = set()
+    changed_job_ids: set[int] = set()
+    inserted = updated = unchanged = 0
+
+    try:
+        for batch in job_batches:
+            payloads = {}
+            for payload in batch:
+                external_id = str(payload["id"])
+                if external_id not in seen_external_ids:
+                    seen_external_ids.add(external_id)
+                    payloads[external_id] = payload
+            if not payloads:
+                continue
+
+            existing = _existing_job_rows(list(payloads))
+            inserts: list[dict] = []
+            updates: list[dict] = []
+            for external_id, payload in payloads.items():
+                values = job_values_from_payload(payload)
+                values_hash = content_hash(values)
+                current = existing.get(external_id)
+
+                if current is not None and current.content_hash == values_hash:
+                    unchanged += 1
+                    continue
+
+                if values["posted_at"] is None:
+                    values["posted_at"] = current.posted_at if current is not None else now
+                values["match_features"] = dump_job_features(Job(**values))
+                values["role_slug"] = role_slug(values["role"])
+                values["requirements_hash"] = requirements_hash(
+                    values["required_skills"],
+                    values["required_certifications"],
+                )
+                values["content_hash"] = values_hash
+                values["last_synced_at"] = now
+
+                if current is None:
+                    inserts.append({**values, "external_id": external_id, "content_version": 1})
+                else:
+                    updates.append(
+                        {**values, "id": current.id, "content_version": current.content_version + 1},
+                    )
+
+            if inserts:
+                db.session.execute(insert_statement, inserts)
+                inserted_ids = dict(
+                    db.session.query(Job.external_id, Job.id).filter(
+                        Job.external_id.in_([values["external_id"] for values in inserts]),
+                    )
+                )
+                for values in inserts:
+                    values["id"] = inserted_ids[values["external_id"]]
+            if updates:
+                db.session.execute(update(Job), updates)
+            written = inserts + updates
+            link_job_requirements(
+                (values["id"], values["required_skills"], values["required_certifications"])
+                for values in written
+            )
+            index_jobs(values["id"] for values in written)
+            changed_job_ids.update(values["id"] for values in written)
+            inserted += len(inserts)
+            updated += len(updates)
+
+        stale_job_ids: list[int] = []
+        if delete_missing and seen_external_ids:
+            stale_job_ids = _stale_job_ids(seen_external_ids)
+            batch_size = max(1, current_app.config.get("JOB_SYNC_BATCH_SIZE", 500))
+            for batch in _batched(stale_job_ids, batch_size):
+                db.session.execute(delete(JobMatchScore).where(JobMatchScore.job_id.in_(batch)))
+                unlink_jobs(batch)
+                db.session.execute(delete(Job).where(Job.id.in_(batch)))
+                remove_jobs(batch)
+        if changed_job_ids or stale_job_ids:
+            bump_catalog_version()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        peak_memory = None
+        if started_tracing:
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    rss_after = _process_peak_rss_bytes()
+    report = SyncReport(
+        inserted=inserted,
+        updated=updated,
+        deleted=len(stale_job_ids),
+        unchanged=unchanged,
+        duration_seconds=time.perf_counter() - started,
+        peak_memory_bytes=peak_memory,
+        changed_job_ids=frozenset(changed_job_ids),
+        deleted_job_ids=frozenset(stale_job_ids),
+        process_peak_rss_bytes=rss_after,
+        peak_rss_growth_bytes=rss_after - rss_before if rss_after is not None else None,
+    )
+    if report.has_changes:
+        jobs_synced.send(current_app._get_current_object(), report=report)
+    current_app.logger.info(
+        "Job sync: %d inserted, %d updated, %d deleted, %d unchanged in %.3fs (peak memory: %s, process peak RSS: %s, raised by %s)",
+        report.inserted,
+        report.updated,
+        report.deleted,
+        report.unchanged,
+        report.duration_seconds,
+        f"{report.peak_memory_bytes / 1024:.0f} KiB" if report.peak_memory_bytes is not None else "n/a",
+        f"{report.process_peak_rss_bytes / 1024:.0f} KiB" if report.process_peak_rss_bytes is not None else "n/a",
+        f"{report.peak_rss_growth_bytes / 1024:.0f} KiB" if report.peak_rss_growth_bytes is not None else "n/a",
+    )
+    return report
+
+
+def apply_job_payloads(job_payloads: Iterable[dict], delete_missing: bool = True) -> SyncReport:
+    """Apply an iterable of payloads in batches of JOB_SYNC_BATCH_SIZE."""
+    batch_size = max(1, current_app.config.get("JOB_SYNC_BATCH_SIZE", 500))
+    return apply_job_batches(_batched(job_payloads, batch_size), delete_missing=delete_missing)
+
+
+def run_job_sync(full: bool = False) -> SyncReport:
+    """
+    Fetch the employer feed and apply it. Between full syncs (every
+    JOB_SYNC_FULL_INTERVAL seconds, or when ``full`` is set) only jobs updated
+    since the last fetch are requested. A 304 answer skips the sync entirely,
+    and so does an unavailable API once a catalog has been synced; the mock
+    jobs are only used to seed an empty one.
+    """
+    state = get_sync_state(JOB_SYNC_STATE)
+    now = datetime.utcnow()
+    full_interval = timedelta(seconds=current_app.config.get("JOB_SYNC_FULL_INTERVAL", 3600))
+    delta_enabled = current_app.config.get("JOB_SYNC_DELTA_ENABLED", True)
+    full = (
+        full
+        or not delta_enabled
+        or state.delta_cursor is None
+        or state.last_full_sync_at is None
+        or now - state.last_full_sync_at > full_interval
+    )
+
+    # Validators are only kept for full responses: a delta response never
+    # reports deletions, so its ETag must not short-circuit a full fetch.
+    feed = fetch_job_feed(
+        etag=state.feed_etag if full else None,
+        last_modified=state.feed_last_modified if full else None,
+        updated_since=None if full else state.delta_cursor - DELTA_OVERLAP,
+        batch_size=max(1, current_app.config.get("JOB_SYNC_BATCH_SIZE", 500)),
+    )
+    if feed.not_modified:
+        current_app.logger.info("Job sync skipped: employer feed not modified")
+        if full:
+            state.last_full_sync_at = now
+            db.session.commit()
+        return SyncReport(0, 0, 0, 0, 0.0, None, not_modified=True)
+
+    if feed.unavailable and state.last_full_sync_at is not None:
+        # Keep the last good catalog rather than replacing it with mock jobs
+        current_app.logger.warning("Job sync skipped: Employer API unavailable")
+        return SyncReport(0, 0, 0, 0, 0.0, None, not_modified=True)
+
+    report = apply_job_batches(feed.batches, delete_missing=not feed.is_delta)
+
+    state = get_sync_state(JOB_SYNC_STATE)
+    state.delta_cursor = feed.server_time
+    if not feed.is_delta and not feed.unavailable:
+        state.feed_etag = feed.etag
+        state.feed_last_modified = feed.last_modified
+        state.last_full_sync_at = now
+    db.session.commit()
+    return report
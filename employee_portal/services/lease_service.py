@@ -0,0 +1,63 @@
+"""
+Database-row leases for work that must run in one process at a time.
+Every gunicorn worker may try to take a lease; the conditional UPDATE only
+succeeds for one of them until the lease is released or expires.
+"""
+from __future__ import annotations
+
+import os
+import socket
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+
+from employee_portal import db
+from employee_portal.models.sync_state import SyncState
+
+# Prefix of this process's lease tokens, for telling owners apart in the table
+PROCESS_OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+def get_sync_state(name: str) -> SyncState:
+    """Return the state row for ``name``, creating it on first use."""
+    state = db.session.get(SyncState, name)
+    if state is not None:
+        return state
+    db.session.add(SyncState(name=name))
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Created concurrently by another worker
+        db.session.rollback()
+    return db.session.get(SyncState, name)
+
+
+def acquire_lease(name: str, ttl_seconds: int) -> str | None:
+    """
+    Take the lease on ``name`` and return its token for ``release_lease``;
+    None while anyone holds it, including another task of this process.
+    """
+    get_sync_state(name)
+    token = f"{PROCESS_OWNER}:{uuid4().hex}"
+    now = datetime.utcnow()
+    result = db.session.execute(
+        update(SyncState)
+        .where(
+            SyncState.name == name,
+            or_(SyncState.lease_owner.is_(None), SyncState.lease_expires_at < now),
+        )
+        .values(lease_owner=token, lease_expires_at=now + timedelta(seconds=ttl_seconds)),
+    )
+    db.session.commit()
+    return token if result.rowcount == 1 else None
+
+
+def release_lease(name: str, token: str) -> None:
+    """Release the lease taken with ``token``; a no-op once it expired and was taken over."""
+    db.session.execute(
+        update(SyncState)
+        .where(SyncState.name == name, SyncState.lease_owner == token)
+        .values(lease_owner=None, lease_expires_at=None),
+    )
+    db.session.commit()
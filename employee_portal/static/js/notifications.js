@@ -0,0 +1,34 @@
+document.addEventListener("DOMContentLoaded", () => {
+  if (!window.io || !document.body.dataset.notifications) {
+    return;
+  }
+
+  const socket = io("/notifications", { transports: ["websocket", "polling"] });
+  const titleCase = (text) => text.replace(/\b\w/g, (letter) => letter.toUpperCase());
+
+  socket.on("application_status", (payload) => {
+    const badges = document.querySelectorAll(`[data-application-status="${payload.application_id}"]`);
+    badges.forEach((badge) => {
+      badge.textContent = titleCase(payload.status);
+    });
+    if (badges.length) {
+      return;
+    }
+
+    // Not on the applications page: show a dismissible notice instead
+    const container = document.querySelector("main .container-fluid");
+    if (!container) {
+      return;
+    }
+    const notice = document.createElement("div");
+    notice.className = "alert alert-info alert-dismissible fade show";
+    notice.setAttribute("role", "alert");
+    notice.textContent = `One of your applications is now ${titleCase(payload.status)}.`;
+    const close = document.createElement("button");
+    close.type = "button";
+    close.className = "btn-close";
+    close.dataset.bsDismiss = "alert";
+    notice.appendChild(close);
+    container.prepend(notice);
+  });
+});
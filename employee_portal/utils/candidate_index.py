@@ -0,0 +1,237 @@
+"""
+Inverted index over profile skills, certifications and summary keywords.
+The reverse of ``utils.job_index``: picks the best-matching candidates for a
+job, with the same scoring rules, without scoring every profile.
+
+Skills are indexed whole; the skills related to a job skill (exact or fuzzy)
+are found in the skill vocabulary, which is far smaller than the profiles.
+Ranking is offline-only until there is an employer role: ``flask
+rank-candidates`` builds the index once per run and ranks the given jobs
+against it. Web workers neither hold nor maintain one.
+"""
+from __future__ import annotations
+
+import heapq
+import threading
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import NamedTuple
+
+import click
+from flask import Flask
+from sqlalchemy import select
+from sqlalchemy.orm import load_only
+
+from employee_portal import db
+from employee_portal.models.job import Job
+from employee_portal.models.profile import Profile
+from employee_portal.models.user import User
+from employee_portal.utils.match_scoring import (
+    JobFeatures,
+    ProfileFeatures,
+    ScanSkillMatcher,
+    ScoreBreakdown,
+    SkillMatcher,
+    build_job_features,
+    build_profile_features,
+    score_breakdown,
+)
+
+
+class CandidateMatch(NamedTuple):
+    user_id: int
+    breakdown: ScoreBreakdown
+
+    @property
+    def score(self) -> float:
+        return self.breakdown.score
+
+
+def _profile_terms(features: ProfileFeatures) -> set[str]:
+    terms = {f"skill:{skill}" for skill in features.skills}
+    terms.update(f"cert:{cert}" for cert in features.certifications)
+    if features.has_text:
+        terms.update(f"kw:{keyword}" for keyword in features.keywords)
+    return terms
+
+
+def _score_bound_without_shared_terms(job: JobFeatures) -> float:
+    """
+    Highest score against ``job`` of a profile sharing no certification or
+    keyword with it and holding no skill related to one of its skills: only
+    the flat credits and the role credit (headlines are matched by substring).
+    """
+    skill_points = 0.0 if job.skills else 0.5
+    keyword_points = 0.2 if job.has_description and not job.keywords else 0.0
+    cert_points = 0.0 if job.certifications else 0.1
+    role_points = 0.2 if job.role is not None else 0.0
+    return round(skill_points + keyword_points + cert_points + role_points, 1)
+
+
+def _rank(scored: tuple[float, int, ScoreBreakdown]) -> tuple[float, int]:
+    return scored[0], scored[1]
+
+
+class ProfileTermIndex:
+    """Immutable snapshot of the postings for one version of the profiles."""
+
+    def __init__(self, entries: Iterable[tuple[int, ProfileFeatures]]):
+        self._features: dict[int, ProfileFeatures] = {}
+        self._postings: dict[str, set[int]] = defaultdict(set)
+        self._skill_vocabulary: SkillMatcher | None = None  # Built on first use
+        self._vocabulary_lock = threading.Lock()
+        for user_id, features in entries:
+            self._features[user_id] = features
+            for term in _profile_terms(features):
+                self._postings[term].add(user_id)
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def _vocabulary(self) -> SkillMatcher:
+        with self._vocabulary_lock:
+            if self._skill_vocabulary is None:
+                self._skill_vocabulary = SkillMatcher(
+                    term[len("skill:"):] for term in self._postings if term.startswith("skill:")
+                )
+            return self._skill_vocabulary
+
+    def _candidate_bounds(self, job: JobFeatures) -> dict[int, float]:
+        """
+        Upper bound on the score of every profile sharing a term with the job.
+        Skill, keyword and certification points are exact (each job skill
+        counts its best match among the profile's skills); the role is
+        assumed to match.
+        """
+        vocabulary = self._vocabulary()
+        skill_credit: dict[int, float] = defaultdict(float)
+        for job_skill in job.skills:
+            best: dict[int, float] = {}
+            for skill, match in vocabulary.matches(job_skill).items():
+                credit = 1.0 if skill == job_skill else match * 0.7
+                for user_id in self._postings.get(f"skill:{skill}", ()):
+                    if credit > best.get(user_id, 0.0):
+                        best[user_id] = credit
+            for user_id, credit in best.items():
+                skill_credit[user_id] += credit
+        cert_hits: dict[int, int] = defaultdict(int)
+        for cert in job.certifications:
+            for user_id in self._postings.get(f"cert:{cert}", ()):
+                cert_hits[user_id] += 1
+        keyword_hits: dict[int, int] = defaultdict(int)
+        for keyword in job.keywords:
+            for user_id in self._postings.get(f"kw:{keyword}", ()):
+                keyword_hits[user_id] += 1
+
+        role_points = 0.2 if job.role is not None else 0.0
+        bounds = {}
+        for user_id in skill_credit.keys() | cert_hits.keys() | keyword_hits.keys():
+            if job.skills:
+                skill_points = skill_credit.get(user_id, 0.0) / len(job.skills) * 3.0
+            else:
+                skill_points = 0.5
+            if not job.has_description:
+                keyword_points = 0.0
+            elif job.keywords:
+                keyword_points = keyword_hits.get(user_id, 0) / len(job.keywords) * 1.5
+            else:
+                keyword_points = 0.2
+            if job.certifications:
+                cert_points = cert_hits.get(user_id, 0) / len(job.certifications) * 0.3
+            else:
+                cert_points = 0.1
+            # Scores are rounded the same way, so the rounded bound still holds
+            bounds[user_id] = round(skill_points + keyword_points + cert_points + role_points + 1e-9, 1)
+        return bounds
+
+    def _score(self, job: JobFeatures, user_id: int) -> tuple[float, int, ScoreBreakdown]:
+        breakdown = score_breakdown(self._features[user_id], job)
+        # Ties go to the lower user id
+        return breakdown.score, -user_id, breakdown
+
+    def top_k(self, job: JobFeatures, limit: int) -> list[CandidateMatch]:
+        """
+        The ``limit`` best candidates, by score then oldest account.
+        Candidates are scored in order of their upper bound until no bound
+        can beat the weakest selected one; the remaining profiles are only
+        scored when they could still beat it too.
+        """
+        bounds = self._candidate_bounds(job)
+        best: list[tuple[float, int, ScoreBreakdown]] = []  # Min-heap of the selected
+        for user_id in sorted(bounds, key=bounds.__getitem__, reverse=True):
+            if len(best) == limit and bounds[user_id] < best[0][0]:
+                break
+            scored = self._score(job, user_id)
+            if len(best) < limit:
+                heapq.heappush(best, scored)
+            elif _rank(scored) > _rank(best[0]):
+                heapq.heapreplace(best, scored)
+
+        bound = _score_bound_without_shared_terms(job)
+        if len(bounds) < len(self._features) and (len(best) < limit or best[0][0] <= bound):
+            rest = (self._score(job, user_id) for user_id in self._features if user_id not in bounds)
+            best = heapq.nlargest(limit, best + heapq.nlargest(limit, rest, key=_rank), key=_rank)
+        else:
+            best = sorted(best, key=_rank, reverse=True)
+
+        return [CandidateMatch(-negated_id, breakdown) for _, negated_id, breakdown in best]
+
+
+# Everything build_profile_features reads
+_FEATURE_COLUMNS = load_only(
+    Profile.user_id,
+    Profile.headline,
+    Profile.summary,
+    Profile.transcript_summary,
+    Profile.experience,
+    Profile.skills,
+    Profile.certifications,
+)
+
+
+def _indexed_features(profile: Profile) -> ProfileFeatures:
+    # Held for every profile, so without the per-profile skill indexes
+    return build_profile_features(profile, matcher_class=ScanSkillMatcher)
+
+
+def build_candidate_index() -> ProfileTermIndex:
+    """Index every profile, reading them in batches."""
+    profiles = db.session.scalars(
+        select(Profile).options(_FEATURE_COLUMNS).execution_options(yield_per=1000),
+    )
+    return ProfileTermIndex((profile.user_id, _indexed_features(profile)) for profile in profiles)
+
+
+def rank_candidates(job: Job, limit: int = 10, index: ProfileTermIndex | None = None) -> list[CandidateMatch]:
+    """Best-matching profiles for ``job``, with each one's score breakdown."""
+    if index is None:
+        index = build_candidate_index()
+    return index.top_k(build_job_features(job), limit)
+
+
+def init_candidate_index(app: Flask) -> None:
+    """Register ``flask rank-candidates``."""
+
+    @app.cli.command("rank-candidates")
+    @click.argument("job_ids", type=int, nargs=-1, required=True)
+    @click.option("--limit", default=10, show_default=True, help="Number of candidates to list per job.")
+    def rank_candidates_command(job_ids: tuple[int, ...], limit: int) -> None:
+        """List the best-matching profiles for each job with their score breakdowns."""
+        index = build_candidate_index()
+        for job_id in job_ids:
+            job = db.session.get(Job, job_id)
+            if job is None:
+                print(f"No job with id {job_id}.")
+                continue
+            matches = rank_candidates(job, limit=max(1, limit), index=index)
+            usernames = dict(
+                db.session.query(User.id, User.username).filter(User.id.in_([match.user_id for match in matches]))
+            )
+            print(f"Top candidates for {job.title} at {job.company}:")
+            for match in matches:
+                breakdown = match.breakdown
+                print(
+                    f"  {usernames.get(match.user_id, match.user_id)}: {match.score:.1f}/5.0 "
+                    f"(skills {breakdown.skills:.2f}, keywords {breakdown.keywords:.2f}, "
+                    f"certifications {breakdown.certifications:.2f}, role {breakdown.role:.2f})"
+                )
@@ -0,0 +1,148 @@
+"""
+Rendered-fragment cache.
+Pages cache expensive fragments per user under one key, stored together
+with the versions of the data they were built from (e.g. the job catalog
+version and ``Profile.updated_at``); a lookup whose versions differ is a
+miss. Writers also invalidate explicitly, so stale entries are dropped as
+soon as their data changes.
+
+The backend is an in-process LRU with a TTL and size bound, or Redis when
+FRAGMENT_CACHE_URL is set (shared by every worker).
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from flask import Flask, current_app
+
+try:  # pragma: no cover - optional dependency at runtime
+    import redis
+except Exception:  # pragma: no cover
+    redis = None  # type: ignore[assignment]
+
+# Namespace of the dashboard's per-user feed (categories, top matches, FAQs)
+DASHBOARD = "dashboard"
+
+
+class MemoryBackend:
+    """Least-recently-used entries are evicted beyond ``max_entries``."""
+
+    def __init__(self, max_entries: int = 1000) -> None:
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+
+class RedisBackend:
+    """Entries expire through Redis TTLs; eviction is left to Redis' maxmemory policy."""
+
+    def __init__(self, url: str) -> None:
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> str | None:
+        value = self._client.get(key)
+        return value.decode("utf-8") if value is not None else None
+
+    def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        self._client.set(key, value, ex=ttl_seconds)
+
+    def delete(self, key: str) -> None:
+        self._client.delete(key)
+
+    def clear(self, prefix: str) -> None:
+        keys = list(self._client.scan_iter(match=f"{prefix}*", count=500))
+        if keys:
+            self._client.delete(*keys)
+
+
+def _backend():  # noqa: ANN202
+    return current_app.extensions["fragment_cache"]
+
+
+def _key(namespace: str, user_id: int) -> str:
+    return f"fragment:{namespace}:{user_id}"
+
+
+def _dump_versions(versions: Sequence) -> list:
+    return [str(version) if version is not None else None for version in versions]
+
+
+def get_fragment(namespace: str, user_id: int, versions: Sequence) -> str | None:
+    """The cached fragment, or None when missing, expired or built from other versions."""
+    try:
+        cached = _backend().get(_key(namespace, user_id))
+    except Exception:  # noqa: BLE001 - a cache outage must not break the page
+        current_app.logger.exception("Fragment cache lookup failed")
+        return None
+    if cached is None:
+        return None
+    entry = json.loads(cached)
+    if entry["versions"] != _dump_versions(versions):
+        return None
+    return entry["html"]
+
+
+def set_fragment(namespace: str, user_id: int, versions: Sequence, html: str) -> None:
+    ttl_seconds = current_app.config.get("FRAGMENT_CACHE_TTL", 300)
+    entry = json.dumps({"versions": _dump_versions(versions), "html": html})
+    try:
+        _backend().set(_key(namespace, user_id), entry, ttl_seconds)
+    except Exception:  # noqa: BLE001
+        current_app.logger.exception("Fragment cache write failed")
+
+
+def invalidate_fragments(namespace: str, user_id: int | None = None) -> None:
+    """Drop one user's fragment in ``namespace``, or everyone's when ``user_id`` is None."""
+    try:
+        if user_id is None:
+            _backend().clear(f"fragment:{namespace}:")
+        else:
+            _backend().delete(_key(namespace, user_id))
+    except Exception:  # noqa: BLE001
+        current_app.logger.exception("Fragment cache invalidation failed")
+
+
+def init_fragment_cache(app: Flask) -> None:
+    url = app.config.get("FRAGMENT_CACHE_URL")
+    if url:
+        # Fail at startup rather than on the first dashboard request
+        if redis is None:
+            raise RuntimeError(
+                "FRAGMENT_CACHE_URL is set but the redis package is not installed; "
+                "install it (pip install -r employee_portal/requirements.txt) or unset FRAGMENT_CACHE_URL"
+            )
+        app.extensions["fragment_cache"] = RedisBackend(url)
+    else:
+        app.extensions["fragment_cache"] = MemoryBackend(app.config.get("FRAGMENT_CACHE_MAX_ENTRIES", 1000))
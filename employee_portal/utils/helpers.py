@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+import re
+from collections.abc import Callable, Iterable
+from functools import wraps
 
-from flask import current_app
+from flask import abort, current_app
+from flask_login import current_user, login_required
 
 
 
@@ -13,6 +16,10 @@ def parse_comma_separated(raw: str | None) -> list[str]:
     return [segment.strip() for segment in raw.split(",") if segment.strip()]
 
 
+def role_slug(role: str | None) -> str:
+    """Normalized role used to group job categories ("Line Cook " -> "line-cook")."""
+    normalized = re.sub(r"[^a-z0-9]+", "-", (role or "").strip().lower())
+    return normalized.strip("-")[:120] or "other"
 
 
 def ensure_profile_lists(profile: Profile) -> None:
@@ -30,3 +37,14 @@ def profile_snapshot(profile: Profile) -> dict[str, list[str]]:
 def log_info(message: str) -> None:
     current_app.logger.info(message)
 
+
+def admin_required(view: Callable) -> Callable:
+    """Like ``login_required``, but also answers 403 to accounts that are not admins."""
+
+    @wraps(view)
+    def wrapped(*args, **kwargs):  # noqa: ANN002, ANN003, ANN202
+        if not current_user.is_admin:
+            abort(403)
+        return view(*args, **kwargs)
+
+    return login_required(wrapped)
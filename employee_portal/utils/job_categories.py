@@ -0,0 +1,68 @@
+"""
+Job categories.
+Jobs are grouped by ``Job.role_slug``, a normalized role the sync writes with
+every job. Per-category counts live in the ``job_role_categories`` rollup,
+rebuilt with one GROUP BY when a sync changes the catalog, so the dashboard
+reads a handful of rows instead of every job.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import delete, func, insert, update
+
+from employee_portal import db
+from employee_portal.models.job import Job, listed_jobs_filter
+from employee_portal.models.job_role_category import JobRoleCategory
+from employee_portal.services.job_sync_service import SyncReport, jobs_synced
+from employee_portal.utils.helpers import role_slug
+
+
+def refresh_role_categories() -> int:
+    """Rebuild the category rollup from the jobs table; returns the number of categories."""
+    rows = (
+        db.session.query(Job.role_slug, func.min(Job.role), func.count(Job.id))
+        .filter(listed_jobs_filter())
+        .group_by(Job.role_slug)
+        .all()
+    )
+    now = datetime.utcnow()
+    db.session.execute(delete(JobRoleCategory))
+    if rows:
+        db.session.execute(
+            insert(JobRoleCategory),
+            [
+                {"slug": slug, "role": (role or "").strip() or "Other", "job_count": count, "refreshed_at": now}
+                for slug, role, count in rows
+            ],
+        )
+    db.session.commit()
+    return len(rows)
+
+
+def ensure_role_categories() -> None:
+    """Backfill missing role slugs (existing catalogs) and build the rollup if it is empty."""
+    missing = db.session.query(Job.id, Job.role).filter(Job.role_slug.is_(None)).all()
+    if missing:
+        db.session.execute(
+            update(Job),
+            [{"id": job_id, "role_slug": role_slug(role)} for job_id, role in missing],
+        )
+        db.session.commit()
+        current_app.logger.info(f"Set role slugs for {len(missing)} jobs")
+    if missing or db.session.query(JobRoleCategory.slug).first() is None:
+        refresh_role_categories()
+
+
+def role_categories(limit: int | None = None) -> list[JobRoleCategory]:
+    """Categories with the most jobs first."""
+    query = JobRoleCategory.query.order_by(JobRoleCategory.job_count.desc(), JobRoleCategory.role)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+@jobs_synced.connect
+def _refresh_after_sync(sender, report: SyncReport, **extra) -> None:  # noqa: ANN001
+    refresh_role_categories()
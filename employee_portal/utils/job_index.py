@@ -0,0 +1,259 @@
+"""
+Inverted index over job skill words, certifications and description keywords.
+Used to pick a profile's best-matching jobs without scoring every posting.
+"""
+from __future__ import annotations
+
+import heapq
+import threading
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlalchemy.orm import load_only
+
+from employee_portal import db
+from employee_portal.models.job import Job, archive_threshold, job_card_options, listed_jobs_filter
+from employee_portal.models.profile import Profile
+from employee_portal.services.company_rating_service import apply_company_ratings
+from employee_portal.services.job_sync_service import SyncReport, jobs_synced
+from employee_portal.utils.match_scoring import (
+    JobFeatures,
+    ProfileFeatures,
+    build_job_features,
+    build_profile_features,
+    score_bound_without_shared_terms,
+    score_features,
+)
+
+# The index only needs the sync's stored features; jobs synced before those
+# existed lazy-load their content once for extraction
+_FEATURE_COLUMNS = load_only(Job.id, Job.posted_at, Job.match_features)
+
+
+def _skill_terms(skills: Iterable[str]) -> set[str]:
+    return {f"skill:{word}" for skill in skills for word in skill.split()}
+
+
+def _job_terms(features: JobFeatures) -> set[str]:
+    terms = _skill_terms(features.skills)
+    terms.update(f"cert:{cert}" for cert in features.certifications)
+    terms.update(f"kw:{keyword}" for keyword in features.keywords)
+    return terms
+
+
+def _profile_terms(features: ProfileFeatures) -> set[str]:
+    terms = _skill_terms(features.skills)
+    terms.update(f"cert:{cert}" for cert in features.certifications)
+    if features.has_text:
+        terms.update(f"kw:{keyword}" for keyword in features.keywords)
+    return terms
+
+
+class JobTermIndex:
+    """Immutable snapshot of the postings for one version of the job catalog."""
+
+    def __init__(self, entries: Iterable[tuple[int, datetime, JobFeatures]]):
+        self._features: dict[int, JobFeatures] = {}
+        self._posted_at: dict[int, datetime] = {}
+        self._postings: dict[str, set[int]] = defaultdict(set)
+        for job_id, posted_at, features in entries:
+            self._features[job_id] = features
+            self._posted_at[job_id] = posted_at
+            for term in _job_terms(features):
+                self._postings[term].add(job_id)
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def with_changes(
+        self,
+        entries: Iterable[tuple[int, datetime, JobFeatures]],
+        removed_job_ids: Iterable[int],
+    ) -> JobTermIndex:
+        """
+        Copy of the index with ``entries`` added or replaced and
+        ``removed_job_ids`` dropped. Only the touched posting sets are copied,
+        so readers of this index are never affected.
+        """
+        entries = list(entries)
+        updated = JobTermIndex(())
+        updated._features = dict(self._features)
+        updated._posted_at = dict(self._posted_at)
+        updated._postings = defaultdict(set, self._postings)
+        copied: set[str] = set()
+
+        def _own_postings(term: str) -> set[int]:
+            if term not in copied:
+                updated._postings[term] = set(updated._postings.get(term, ()))
+                copied.add(term)
+            return updated._postings[term]
+
+        for job_id in [*removed_job_ids, *(job_id for job_id, _, _ in entries)]:
+            old_features = updated._features.pop(job_id, None)
+            updated._posted_at.pop(job_id, None)
+            if old_features is None:
+                continue
+            for term in _job_terms(old_features):
+                _own_postings(term).discard(job_id)
+
+        for job_id, posted_at, features in entries:
+            updated._features[job_id] = features
+            updated._posted_at[job_id] = posted_at
+            for term in _job_terms(features):
+                _own_postings(term).add(job_id)
+
+        for term in copied:
+            if not updated._postings[term]:
+                del updated._postings[term]
+        return updated
+
+    def candidates(self, profile: ProfileFeatures) -> set[int]:
+        """Jobs sharing at least one indexed term with the profile."""
+        found: set[int] = set()
+        for term in _profile_terms(profile):
+            found.update(self._postings.get(term, ()))
+        return found
+
+    def _best(
+        self,
+        profile: ProfileFeatures,
+        job_ids: Iterable[int],
+        limit: int,
+    ) -> list[tuple[float, datetime, int]]:
+        return heapq.nlargest(
+            limit,
+            (
+                (score_features(profile, self._features[job_id]), self._posted_at[job_id], job_id)
+                for job_id in job_ids
+            ),
+        )
+
+    def top_k(
+        self,
+        profile: ProfileFeatures,
+        limit: int,
+        posted_since: datetime | None = None,
+    ) -> list[tuple[int, float]]:
+        """
+        Return ``(job_id, score)`` for the ``limit`` best jobs (posted at or
+        after ``posted_since`` when given), ordered by score then most recent
+        posting. Only candidates are scored unless the remaining jobs could
+        still beat the weakest selected candidate.
+        """
+        candidates = self.candidates(profile)
+        if posted_since is not None:
+            candidates = {job_id for job_id in candidates if self._posted_at[job_id] >= posted_since}
+        best = self._best(profile, candidates, limit)
+
+        bound = score_bound_without_shared_terms(profile)
+        if len(candidates) < len(self._features) and (
+            len(best) < limit or best[-1][0] <= bound
+        ):
+            rest = (
+                job_id
+                for job_id in self._features
+                if job_id not in candidates and (posted_since is None or self._posted_at[job_id] >= posted_since)
+            )
+            best = heapq.nlargest(limit, best + self._best(profile, rest, limit))
+
+        return [(job_id, score) for score, _, job_id in best]
+
+
+_index_lock = threading.Lock()
+_index: JobTermIndex | None = None
+_index_fingerprint: tuple | None = None
+
+
+def _catalog_fingerprint() -> tuple:
+    return tuple(
+        db.session.query(
+            func.count(Job.id),
+            func.max(Job.id),
+            func.sum(Job.content_version),
+        )
+        .filter(listed_jobs_filter())
+        .one()
+    )
+
+
+def get_job_index() -> JobTermIndex:
+    """
+    Return the index for the current catalog. Syncs in this process patch it
+    through ``jobs_synced``; changes made by other processes are picked up by
+    a full rebuild when the catalog fingerprint no longer matches.
+    """
+    global _index, _index_fingerprint  # noqa: PLW0603
+
+    fingerprint = _catalog_fingerprint()
+    with _index_lock:
+        if _index is None or fingerprint != _index_fingerprint:
+            jobs = Job.query.options(_FEATURE_COLUMNS).filter(listed_jobs_filter()).all()
+            _index = JobTermIndex(
+                (job.id, job.posted_at, build_job_features(job)) for job in jobs
+            )
+            _index_fingerprint = fingerprint
+        return _index
+
+
+@jobs_synced.connect
+def _apply_synced_jobs(sender, report: SyncReport, **extra) -> None:  # noqa: ANN001
+    global _index, _index_fingerprint  # noqa: PLW0603
+
+    with _index_lock:
+        if _index is None:
+            return
+        changed_ids = list(report.changed_job_ids)
+        jobs: list[Job] = []
+        for start in range(0, len(changed_ids), 500):
+            jobs.extend(
+                Job.query.options(_FEATURE_COLUMNS).filter(
+                    Job.id.in_(changed_ids[start:start + 500]),
+                    listed_jobs_filter(),
+                ),
+            )
+        _index = _index.with_changes(
+            ((job.id, job.posted_at, build_job_features(job)) for job in jobs),
+            report.deleted_job_ids,
+        )
+        _index_fingerprint = _catalog_fingerprint()
+
+
+@jobs_synced.connect
+def _rate_synced_jobs(sender, report: SyncReport, **extra) -> None:  # noqa: ANN001
+    # New and edited postings of known companies get the stored rating
+    # without a fetch; a changed rating bumps the catalog version, which
+    # already keys the cached dashboards
+    changed_ids = list(report.changed_job_ids)
+    rated = sum(
+        apply_company_ratings(changed_ids[start:start + 500])
+        for start in range(0, len(changed_ids), 500)
+    )
+    if rated:
+        db.session.commit()
+
+
+def recommend_jobs(profile: Profile | None, limit: int = 6) -> list[tuple[Job, float]]:
+    """Best-matching active (not archived) jobs for the profile as ``(job, score)`` pairs."""
+    threshold = archive_threshold()
+    if profile is None:
+        jobs = (
+            Job.query.options(*job_card_options())
+            .filter(listed_jobs_filter(), Job.posted_at >= threshold)
+            .order_by(Job.posted_at.desc())
+            .limit(limit)
+            .all()
+        )
+        return [(job, 0.0) for job in jobs]
+
+    ranked = get_job_index().top_k(build_profile_features(profile), limit, posted_since=threshold)
+    jobs_by_id = {
+        job.id: job
+        for job in Job.query.options(*job_card_options()).filter(Job.id.in_([job_id for job_id, _ in ranked]))
+    }
+    return [
+        (jobs_by_id[job_id], score)
+        for job_id, score in ranked
+        if job_id in jobs_by_id
+    ]
@@ -0,0 +1,169 @@
+"""
+Normalized job requirements.
+Skill and certification names are interned in the ``skills`` and
+``certifications`` tables and linked to jobs through ``job_skills`` and
+``job_certifications``, so the job list's "requires skill X" filter is an
+indexed join instead of a loop over the JSON columns. Exact requirement
+matches (the application reconciler) go through ``jobs.requirements_hash``,
+and match scoring reads each job's stored ``match_features``; neither uses
+the links. The job sync relinks and rehashes every job it writes.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Iterable
+
+from flask import current_app
+from sqlalchemy import delete, exists, insert, select, update
+
+from employee_portal import db
+from employee_portal.models.job import Job
+from employee_portal.models.requirement import Certification, Skill, job_certifications, job_skills
+
+_NAME_LENGTH = 120
+
+
+def _normalized_names(names: Iterable[str] | None) -> dict[str, str]:
+    """Normalized name -> display name, in the scorer's normalization."""
+    if not names:
+        return {}
+    normalized = {}
+    for name in names:
+        if isinstance(name, str) and name.strip():
+            normalized.setdefault(name.lower().strip()[:_NAME_LENGTH], name.strip()[:_NAME_LENGTH])
+    return normalized
+
+
+def _insert_ignore_statement(model):  # noqa: ANN001, ANN202
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert  # noqa: WPS433
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert  # noqa: WPS433
+    else:
+        return insert(model)
+    # Another worker may intern the same name concurrently
+    return dialect_insert(model).on_conflict_do_nothing(index_elements=["normalized_name"])
+
+
+def _intern(model, names: dict[str, str]) -> dict[str, int]:  # noqa: ANN001
+    """Ids for the given normalized names, creating rows for new ones."""
+    if not names:
+        return {}
+    ids = dict(
+        db.session.query(model.normalized_name, model.id).filter(model.normalized_name.in_(list(names)))
+    )
+    missing = [{"normalized_name": key, "name": names[key]} for key in names if key not in ids]
+    if missing:
+        db.session.execute(_insert_ignore_statement(model), missing)
+        ids.update(
+            db.session.query(model.normalized_name, model.id).filter(
+                model.normalized_name.in_([row["normalized_name"] for row in missing]),
+            )
+        )
+    return ids
+
+
+def unlink_jobs(job_ids: Iterable[int]) -> None:
+    """Remove the requirement links of the given jobs (current transaction)."""
+    job_ids = list(job_ids)
+    if not job_ids:
+        return
+    db.session.execute(delete(job_skills).where(job_skills.c.job_id.in_(job_ids)))
+    db.session.execute(delete(job_certifications).where(job_certifications.c.job_id.in_(job_ids)))
+
+
+def link_job_requirements(requirements: Iterable[tuple[int, list, list]]) -> None:
+    """
+    Replace the links of each ``(job_id, skills, certifications)`` with the
+    given names, interning new ones. Runs in the current transaction.
+    """
+    jobs = [
+        (job_id, _normalized_names(skills), _normalized_names(certifications))
+        for job_id, skills, certifications in requirements
+    ]
+    if not jobs:
+        return
+    skill_ids = _intern(Skill, {key: name for _, skills, _ in jobs for key, name in skills.items()})
+    certification_ids = _intern(
+        Certification,
+        {key: name for _, _, certifications in jobs for key, name in certifications.items()},
+    )
+
+    unlink_jobs(job_id for job_id, _, _ in jobs)
+    skill_links = [
+        {"job_id": job_id, "skill_id": skill_ids[key]}
+        for job_id, skills, _ in jobs
+        for key in skills
+    ]
+    certification_links = [
+        {"job_id": job_id, "certification_id": certification_ids[key]}
+        for job_id, _, certifications in jobs
+        for key in certifications
+    ]
+    if skill_links:
+        db.session.execute(insert(job_skills), skill_links)
+    if certification_links:
+        db.session.execute(insert(job_certifications), certification_links)
+
+
+def ensure_requirement_links() -> None:
+    """Link jobs that have no requirement rows yet (existing catalogs, placeholder jobs)."""
+    has_skills = exists().where(job_skills.c.job_id == Job.id)
+    has_certifications = exists().where(job_certifications.c.job_id == Job.id)
+    unlinked = db.session.query(Job.id, Job.required_skills, Job.required_certifications).filter(
+        ~has_skills,
+        ~has_certifications,
+    )
+    rows = [(job_id, skills, certifications) for job_id, skills, certifications in unlinked if skills or certifications]
+    batch_size = max(1, current_app.config.get("JOB_SYNC_BATCH_SIZE", 500))
+    for start in range(0, len(rows), batch_size):
+        link_job_requirements(rows[start:start + batch_size])
+    db.session.commit()
+    if rows:
+        current_app.logger.info(f"Linked requirements for {len(rows)} jobs")
+
+
+def requires_skill_filter(term: str):  # noqa: ANN201
+    """
+    Filter for jobs requiring a skill whose name contains ``term``. Only the
+    (small) skill vocabulary is scanned; jobs are found through the index.
+    """
+    matching_skills = select(Skill.id).where(Skill.normalized_name.contains(term.lower().strip(), autoescape=True))
+    return Job.id.in_(select(job_skills.c.job_id).where(job_skills.c.skill_id.in_(matching_skills)))
+
+
+def requirements_hash(skills: Iterable[str] | None, certifications: Iterable[str] | None) -> str | None:
+    """
+    Hash of the sorted normalized skill and certification names; equal
+    requirement sets (in any order or case) give equal hashes. None when both
+    are empty, as that would match every job without requirements.
+    """
+    skill_names = sorted(_normalized_names(skills))
+    certification_names = sorted(_normalized_names(certifications))
+    if not skill_names and not certification_names:
+        return None
+    encoded = json.dumps([skill_names, certification_names], separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def ensure_requirement_hashes() -> None:
+    """Hash the requirements of synced jobs that have no hash yet (existing catalogs)."""
+    unhashed = (
+        db.session.query(Job.id, Job.required_skills, Job.required_certifications)
+        .filter(Job.requirements_hash.is_(None), Job.external_id.notlike("restored_%"))
+        .execution_options(yield_per=1000)
+    )
+    rows = [
+        {"id": job_id, "requirements_hash": hashed}
+        for job_id, skills, certifications in unhashed
+        if (hashed := requirements_hash(skills, certifications)) is not None
+    ]
+    batch_size = max(1, current_app.config.get("JOB_SYNC_BATCH_SIZE", 500))
+    for start in range(0, len(rows), batch_size):
+        db.session.execute(update(Job), rows[start:start + batch_size])
+    db.session.commit()
+    if rows:
+        current_app.logger.info(f"Hashed requirements for {len(rows)} jobs")
+
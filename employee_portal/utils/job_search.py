@@ -0,0 +1,275 @@
+"""
+Full-text job search.
+Jobs are indexed in a ``job_search`` side table: an FTS5 virtual table on
+SQLite, a table of tsvectors with GIN indexes on Postgres. The job sync
+updates it in the same transaction as the jobs themselves. Other databases
+fall back to (unindexed) substring matching.
+
+Search text is split into words and "quoted phrases"; every part must match.
+Single words also match as prefixes ("cook" finds "cooking", "cookery").
+"""
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+
+from flask import current_app
+from sqlalchemy import String, bindparam, column, func, literal_column, or_, table, text
+
+from employee_portal import db
+from employee_portal.models.job import Job
+
+SEARCH_TABLE = "job_search"
+# Fields a search can be narrowed to, besides searching everything
+SEARCH_FIELDS = ("title", "role", "company", "location", "description", "skills")
+# bm25 weights per FTS5 column, in SEARCH_FIELDS order
+_FTS5_WEIGHTS = (10.0, 8.0, 3.0, 2.0, 1.0, 5.0)
+# Postgres keeps one weighted document for ranking plus per-field vectors
+# for the fields the job filter form can target
+_PG_FIELD_COLUMNS = {"role": "role_document", "location": "location_document", "skills": "skills_document"}
+_PG_CONFIG = "english"
+
+_TOKEN_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def _dialect() -> str:
+    return db.session.get_bind().dialect.name
+
+
+def parse_search_query(search_text: str) -> list[list[str]]:
+    """Split search text into phrases (lists of words); bare words are one-word phrases."""
+    phrases = []
+    for quoted, bare in _TOKEN_PATTERN.findall(search_text or ""):
+        words = [word.lower() for word in _WORD_PATTERN.findall(quoted or bare)]
+        if quoted:
+            if words:
+                phrases.append(words)
+        else:
+            phrases.extend([word] for word in words)
+    return phrases
+
+
+def _fts5_expression(phrases: list[list[str]], field: str | None = None) -> str:
+    parts = []
+    for words in phrases:
+        # Words are \w+ only, so wrapping them in quotes is always valid syntax
+        part = f'"{words[0]}"*' if len(words) == 1 else '"' + " ".join(words) + '"'
+        parts.append(f"{{{field}}} : {part}" if field else part)
+    return " AND ".join(parts)
+
+
+def _tsquery_expression(phrases: list[list[str]]) -> str:
+    parts = []
+    for words in phrases:
+        parts.append(f"{words[0]}:*" if len(words) == 1 else "(" + " <-> ".join(words) + ")")
+    return " & ".join(parts)
+
+
+def _create_sqlite_index() -> None:
+    columns = ", ".join(SEARCH_FIELDS)
+    db.session.execute(
+        text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+            f"USING fts5({columns}, tokenize='porter unicode61')",
+        ),
+    )
+
+
+def _create_postgres_index() -> None:
+    field_columns = "".join(f", {name} tsvector NOT NULL" for name in _PG_FIELD_COLUMNS.values())
+    db.session.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+            "job_id INTEGER PRIMARY KEY REFERENCES jobs(id) ON DELETE CASCADE, "
+            f"document tsvector NOT NULL{field_columns})",
+        ),
+    )
+    for name in ("document", *_PG_FIELD_COLUMNS.values()):
+        db.session.execute(
+            text(f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_{name} ON {SEARCH_TABLE} USING GIN ({name})"),
+        )
+
+
+def search_index_supported() -> bool:
+    return _dialect() in ("sqlite", "postgresql")
+
+
+def ensure_search_index() -> None:
+    """Create the search table if needed and index any jobs it is missing."""
+    dialect = _dialect()
+    if dialect == "sqlite":
+        _create_sqlite_index()
+    elif dialect == "postgresql":
+        _create_postgres_index()
+    else:
+        return
+    key = "rowid" if dialect == "sqlite" else "job_id"
+    missing_ids = [
+        job_id
+        for (job_id,) in db.session.execute(
+            text(f"SELECT id FROM jobs WHERE id NOT IN (SELECT {key} FROM {SEARCH_TABLE})"),
+        )
+    ]
+    orphaned_ids = [
+        job_id
+        for (job_id,) in db.session.execute(
+            text(f"SELECT {key} FROM {SEARCH_TABLE} WHERE {key} NOT IN (SELECT id FROM jobs)"),
+        )
+    ]
+    batch_size = max(1, current_app.config.get("JOB_SYNC_BATCH_SIZE", 500))
+    for start in range(0, len(missing_ids), batch_size):
+        index_jobs(missing_ids[start:start + batch_size])
+    remove_jobs(orphaned_ids)
+    db.session.commit()
+    if missing_ids or orphaned_ids:
+        current_app.logger.info(
+            f"Job search index: {len(missing_ids)} jobs indexed, {len(orphaned_ids)} stale entries removed"
+        )
+
+
+def _skills_text(skills) -> str:  # noqa: ANN001
+    return ", ".join(skills) if isinstance(skills, list) else str(skills or "")
+
+
+def index_jobs(job_ids: Iterable[int]) -> None:
+    """(Re)index the given jobs in the current transaction."""
+    job_ids = list(job_ids)
+    if not job_ids:
+        return
+    dialect = _dialect()
+    if dialect == "sqlite":
+        remove_jobs(job_ids)
+        rows = db.session.query(
+            Job.id,
+            Job.title,
+            Job.role,
+            Job.company,
+            Job.location,
+            Job.description,
+            Job.required_skills,
+        ).filter(Job.id.in_(job_ids))
+        db.session.execute(
+            text(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, {', '.join(SEARCH_FIELDS)}) "
+                "VALUES (:id, :title, :role, :company, :location, :description, :skills)",
+            ),
+            [
+                {
+                    "id": row.id,
+                    "title": row.title or "",
+                    "role": row.role or "",
+                    "company": row.company or "",
+                    "location": row.location or "",
+                    "description": row.description or "",
+                    "skills": _skills_text(row.required_skills),
+                }
+                for row in rows
+            ],
+        )
+    elif dialect == "postgresql":
+        def vector(expression: str, weight: str | None = None) -> str:
+            vector_sql = f"to_tsvector('{_PG_CONFIG}', coalesce({expression}, ''))"
+            return f"setweight({vector_sql}, '{weight}')" if weight else vector_sql
+
+        skills = "required_skills::text"
+        document = " || ".join(
+            (
+                vector("title", "A"),
+                vector("role", "A"),
+                vector(skills, "B"),
+                vector("company", "C"),
+                vector("location", "C"),
+                vector("description", "D"),
+            ),
+        )
+        field_columns = list(_PG_FIELD_COLUMNS.values())
+        updates = ", ".join(f"{name} = excluded.{name}" for name in ("document", *field_columns))
+        db.session.execute(
+            text(
+                f"INSERT INTO {SEARCH_TABLE} (job_id, document, {', '.join(field_columns)}) "
+                f"SELECT id, {document}, {vector('role')}, {vector('location')}, {vector(skills)} "
+                "FROM jobs WHERE id IN :job_ids "
+                f"ON CONFLICT (job_id) DO UPDATE SET {updates}",
+            ).bindparams(bindparam("job_ids", expanding=True)),
+            {"job_ids": job_ids},
+        )
+
+
+def remove_jobs(job_ids: Iterable[int]) -> None:
+    """Drop the given jobs from the index in the current transaction."""
+    job_ids = list(job_ids)
+    if not job_ids or not search_index_supported():
+        return
+    key = "rowid" if _dialect() == "sqlite" else "job_id"
+    db.session.execute(
+        text(f"DELETE FROM {SEARCH_TABLE} WHERE {key} IN :job_ids").bindparams(
+            bindparam("job_ids", expanding=True),
+        ),
+        {"job_ids": job_ids},
+    )
+
+
+def _substring_filters(query, keywords: str | None, fields: dict[str, str]):  # noqa: ANN001, ANN202
+    """Fallback for databases without a search index."""
+    columns = {
+        "title": Job.title,
+        "role": Job.role,
+        "company": Job.company,
+        "location": Job.location,
+        "description": Job.description,
+        "skills": Job.required_skills.cast(String),
+    }
+    for words in parse_search_query(keywords or ""):
+        pattern = f"%{' '.join(words)}%"
+        query = query.filter(or_(*(column.ilike(pattern) for column in columns.values())))
+    for field, value in fields.items():
+        query = query.filter(columns[field].ilike(f"%{value.strip()}%"))
+    return query, None
+
+
+def apply_search(query, keywords: str | None = None, **fields: str | None):  # noqa: ANN001, ANN201
+    """
+    Restrict a Job query to jobs matching ``keywords`` (all fields) and any
+    per-field searches (``role=``, ``location=``, ``skills=``, ...).
+
+    Returns ``(query, rank)``: ``rank`` is an ORDER BY expression putting
+    the best matches first, or None when nothing was searched for.
+    """
+    fields = {field: value for field, value in fields.items() if value and value.strip()}
+    unknown = set(fields) - set(SEARCH_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown search field(s): {', '.join(sorted(unknown))}")
+    keyword_phrases = parse_search_query(keywords or "")
+    field_phrases = {field: parse_search_query(value) for field, value in fields.items()}
+    field_phrases = {field: phrases for field, phrases in field_phrases.items() if phrases}
+    if not keyword_phrases and not field_phrases:
+        return query, None
+
+    dialect = _dialect()
+    if dialect == "sqlite":
+        index = table(SEARCH_TABLE, column("rowid"))
+        expressions = [_fts5_expression(keyword_phrases)] if keyword_phrases else []
+        expressions += [_fts5_expression(phrases, field) for field, phrases in field_phrases.items()]
+        query = query.join(index, index.c.rowid == Job.id).filter(
+            literal_column(SEARCH_TABLE).op("MATCH")(" AND ".join(expressions)),
+        )
+        # bm25 is lower for better matches
+        return query, func.bm25(literal_column(SEARCH_TABLE), *_FTS5_WEIGHTS).asc()
+
+    if dialect == "postgresql":
+        index = table(SEARCH_TABLE, column("job_id"), column("document"), *map(column, _PG_FIELD_COLUMNS.values()))
+        query = query.join(index, index.c.job_id == Job.id)
+        rank_query = None
+        if keyword_phrases:
+            rank_query = func.to_tsquery(_PG_CONFIG, _tsquery_expression(keyword_phrases))
+            query = query.filter(index.c.document.op("@@")(rank_query))
+        for field, phrases in field_phrases.items():
+            tsquery = func.to_tsquery(_PG_CONFIG, _tsquery_expression(phrases))
+            # Fields without their own vector are narrowed on the whole document
+            target = index.c[_PG_FIELD_COLUMNS[field]] if field in _PG_FIELD_COLUMNS else index.c.document
+            query = query.filter(target.op("@@")(tsquery))
+            rank_query = rank_query if rank_query is not None else tsquery
+        return query, func.ts_rank_cd(index.c.document, rank_query).desc()
+
+    return _substring_filters(query, keywords, fields)
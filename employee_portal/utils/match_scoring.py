@@ -3,9 +3,18 @@ Advanced match scoring algorithm (0-5 scale).
 Compares user profile with job requirements.
 """
 import re
+import threading
+from collections import defaultdict
 from collections.abc import Iterable
+from functools import lru_cache
+from typing import NamedTuple
 
-from employee_portal.models.job import Job
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+
+from employee_portal import db
+from employee_portal.models.job import Job, archive_threshold, listed_jobs_filter
+from employee_portal.models.job_match_score import JobMatchScore
 from employee_portal.models.profile import Profile
 
 
@@ -21,6 +30,7 @@ def _normalize_list(items: Iterable[str] | None) -> set[str]:
     return {_normalize_text(item) for item in items if isinstance(item, str) and item.strip()}
 
 
+@lru_cache(maxsize=65536)
 def _fuzzy_match(text1: str, text2: str) -> float:
     """
     Calculate fuzzy match score between two texts (0.0 to 1.0).
@@ -60,148 +70,454 @@ def _fuzzy_match(text1: str, text2: str) -> float:
     return 0.0
 
 
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SkillMatcher:
+    """
+    Finds the best ``_fuzzy_match`` score of a skill against a fixed set of
+    normalized profile skills without comparing it to every one of them.
+
+    Only skills that can score above zero are compared: those sharing a word
+    (word overlap tier) and those that may contain or be contained in the
+    skill, found through a trigram index (substring tier). Results are
+    memoized per skill for the lifetime of the matcher.
+    """
+
+    def __init__(self, skills: Iterable[str]):
+        self._skills = frozenset(skills)
+        self._by_word: dict[str, set[str]] = defaultdict(set)
+        self._by_trigram: dict[str, set[str]] = defaultdict(set)
+        self._trigram_counts: dict[str, int] = {}
+        self._short_skills: list[str] = []
+        self._best: dict[str, float] = {}
+        for skill in self._skills:
+            for word in skill.split():
+                self._by_word[word].add(skill)
+            trigrams = _trigrams(skill)
+            if not trigrams:
+                self._short_skills.append(skill)
+                continue
+            self._trigram_counts[skill] = len(trigrams)
+            for trigram in trigrams:
+                self._by_trigram[trigram].add(skill)
+
+    def _candidates(self, skill: str) -> set[str]:
+        candidates: set[str] = set()
+        for word in skill.split():
+            candidates.update(self._by_word.get(word, ()))
+
+        # Profile skills contained in ``skill``: all of their trigrams occur in it
+        trigrams = _trigrams(skill)
+        hits: dict[str, int] = defaultdict(int)
+        for trigram in trigrams:
+            for other in self._by_trigram.get(trigram, ()):
+                hits[other] += 1
+        candidates.update(
+            other for other, count in hits.items() if count == self._trigram_counts[other]
+        )
+        candidates.update(other for other in self._short_skills if other in skill)
+
+        # Profile skills containing ``skill``: they carry every trigram of it
+        if trigrams:
+            containing = None
+            for trigram in trigrams:
+                postings = self._by_trigram.get(trigram, set())
+                containing = postings if containing is None else containing & postings
+                if not containing:
+                    break
+            candidates.update(containing or ())
+        else:
+            candidates.update(other for other in self._skills if skill in other)
+        return candidates
+
+    def matches(self, skill: str) -> dict[str, float]:
+        """The skills scoring above zero against ``skill``, with their scores."""
+        scores = {other: _fuzzy_match(other, skill) for other in self._candidates(skill)}
+        return {other: score for other, score in scores.items() if score > 0}
+
+    def best_match(self, skill: str) -> float:
+        """Same as ``max(_fuzzy_match(profile_skill, skill) for profile_skill in skills)``."""
+        best = self._best.get(skill)
+        if best is None:
+            best = 0.0
+            for other in self._candidates(skill):
+                best = max(best, _fuzzy_match(other, skill))
+            self._best[skill] = best
+        return best
+
+
+class ScanSkillMatcher:
+    """
+    ``SkillMatcher`` without the indexes: compares against every profile skill.
+    Used for features held in memory for many profiles at once, where the
+    indexes would cost more memory than the few comparisons they save.
+    """
+
+    __slots__ = ("_skills",)
+
+    def __init__(self, skills: Iterable[str]):
+        self._skills = tuple(skills)
+
+    def best_match(self, skill: str) -> float:
+        return max((_fuzzy_match(other, skill) for other in self._skills), default=0.0)
+
+
+_STOP_WORDS = frozenset({
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
+    "of", "with", "by", "from", "as", "is", "was", "are", "were", "be",
+    "been", "being", "have", "has", "had", "do", "does", "did", "will",
+    "would", "should", "could", "may", "might", "must", "can", "this",
+    "that", "these", "those", "i", "you", "he", "she", "it", "we", "they",
+    "what", "which", "who", "when", "where", "why", "how", "all", "each",
+    "every", "both", "few", "more", "most", "other", "some", "such",
+    "only", "own", "same", "than", "too", "very", "just", "about", "into",
+    "through", "during", "including", "against", "among", "throughout",
+})
+_WORD_PATTERN = re.compile(r"\b[a-z]+\b")
+
+
 def _extract_keywords(text: str) -> set[str]:
     """Extract meaningful keywords from text."""
     if not text:
         return set()
-    
-    # Stop words to ignore
-    stop_words = {
-        "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
-        "of", "with", "by", "from", "as", "is", "was", "are", "were", "be",
-        "been", "being", "have", "has", "had", "do", "does", "did", "will",
-        "would", "should", "could", "may", "might", "must", "can", "this",
-        "that", "these", "those", "i", "you", "he", "she", "it", "we", "they",
-        "what", "which", "who", "when", "where", "why", "how", "all", "each",
-        "every", "both", "few", "more", "most", "other", "some", "such",
-        "only", "own", "same", "than", "too", "very", "just", "about", "into",
-        "through", "during", "including", "against", "among", "throughout",
-    }
-    
-    # Extract words
-    words = re.findall(r'\b[a-z]+\b', text.lower())
-    
+
     # Filter stop words and short words
-    keywords = {word for word in words if word not in stop_words and len(word) >= 3}
-    
-    return keywords
+    return {
+        word
+        for word in _WORD_PATTERN.findall(text.lower())
+        if word not in _STOP_WORDS and len(word) >= 3
+    }
 
 
-def calculate_match_score(profile: Profile | None, job: Job) -> float:
+class ProfileFeatures(NamedTuple):
+    """Profile side of the score, computed once per scoring pass."""
+
+    skills: frozenset[str]
+    certifications: frozenset[str]
+    keywords: frozenset[str]
+    has_text: bool
+    headline: str | None
+    headline_words: frozenset[str]
+    skill_matcher: SkillMatcher | ScanSkillMatcher
+
+
+class JobFeatures(NamedTuple):
+    """Job side of the score; depends only on the job's content."""
+
+    skills: frozenset[str]
+    certifications: frozenset[str]
+    keywords: frozenset[str]
+    has_description: bool
+    role: str | None
+    role_words: frozenset[str]
+
+
+def build_profile_features(profile: Profile, matcher_class: type = SkillMatcher) -> ProfileFeatures:
+    profile_text = ""
+    if profile.summary:
+        profile_text += profile.summary + " "
+    if profile.transcript_summary:
+        profile_text += profile.transcript_summary + " "
+    if profile.experience:
+        profile_text += profile.experience + " "
+
+    headline = _normalize_text(profile.headline) if profile.headline else None
+    skills = frozenset(_normalize_list(profile.skills_list))
+    return ProfileFeatures(
+        skills=skills,
+        certifications=frozenset(_normalize_list(profile.certifications_list)),
+        keywords=frozenset(_extract_keywords(profile_text)),
+        has_text=bool(profile_text),
+        headline=headline,
+        headline_words=frozenset(headline.split()) if headline else frozenset(),
+        skill_matcher=matcher_class(skills),
+    )
+
+
+# Bump when the extraction rules change so stored Job.match_features are rebuilt
+JOB_FEATURES_FORMAT = 1
+
+
+def _extract_job_features(job: Job) -> JobFeatures:
+    role = _normalize_text(job.role) if job.role else None
+    return JobFeatures(
+        skills=frozenset(_normalize_list(job.required_skills)),
+        certifications=frozenset(_normalize_list(job.required_certifications)),
+        keywords=frozenset(_extract_keywords(job.description)),
+        has_description=bool(job.description),
+        role=role,
+        role_words=frozenset(role.split()) if role else frozenset(),
+    )
+
+
+def dump_job_features(job: Job) -> dict:
+    """Serialize the job's scoring features for ``Job.match_features``."""
+    features = _extract_job_features(job)
+    return {
+        "format": JOB_FEATURES_FORMAT,
+        "skills": sorted(features.skills),
+        "certifications": sorted(features.certifications),
+        "keywords": sorted(features.keywords),
+        "has_description": features.has_description,
+        "role": features.role,
+    }
+
+
+def build_job_features(job: Job) -> JobFeatures:
     """
-    Calculate match score between profile and job (0-5 scale).
-    
-    Scoring breakdown:
-    - Skills matching: 3.0 points (60%) - Most important
-    - Description/experience keyword matching: 1.5 points (30%)
-    - Certifications matching: 0.3 points (6%)
-    - Role/title alignment: 0.2 points (4%)
-    
-    Returns a score from 0.0 to 5.0.
+    Load the job's features from ``Job.match_features`` when the sync has
+    stored them, otherwise extract them from the job's content.
     """
-    if profile is None:
-        return 0.0
-    
+    stored = job.match_features
+    if not stored or stored.get("format") != JOB_FEATURES_FORMAT:
+        return _extract_job_features(job)
+
+    role = stored["role"]
+    return JobFeatures(
+        skills=frozenset(stored["skills"]),
+        certifications=frozenset(stored["certifications"]),
+        keywords=frozenset(stored["keywords"]),
+        has_description=stored["has_description"],
+        role=role,
+        role_words=frozenset(role.split()) if role else frozenset(),
+    )
+
+
+class ScoreBreakdown(NamedTuple):
+    """Points earned per section (out of 3.0, 1.5, 0.3 and 0.2) and the 0-5 score."""
+
+    skills: float
+    keywords: float
+    certifications: float
+    role: float
+    score: float
+
+
+def score_breakdown(profile: ProfileFeatures, job: JobFeatures) -> ScoreBreakdown:
+    """Score precomputed profile and job features, keeping each section's points."""
     total_score = 0.0
     max_possible = 0.0
-    
+
     # 1. Skills Matching (up to 3.0 points) - Most important factor
-    profile_skills = _normalize_list(profile.skills_list)
-    job_skills = _normalize_list(job.required_skills)
-    
-    if job_skills:
-        max_possible += 3.0
-        exact_matches = len(job_skills & profile_skills)
+    max_possible += 3.0
+    if job.skills:
+        exact_matches = len(job.skills & profile.skills)
         fuzzy_score = 0.0
-        
-        # Check fuzzy matches for unmatched job skills
-        unmatched_job_skills = job_skills - profile_skills
-        for job_skill in unmatched_job_skills:
-            best_match = 0.0
-            for profile_skill in profile_skills:
-                match_score = _fuzzy_match(profile_skill, job_skill)
-                best_match = max(best_match, match_score)
+
+        # Check fuzzy matches for unmatched job skills; sorted so the float
+        # sum does not depend on set iteration order
+        for job_skill in sorted(job.skills - profile.skills):
+            best_match = profile.skill_matcher.best_match(job_skill)
             fuzzy_score += best_match * 0.7  # 70% credit for fuzzy matches
-        
+
         # Calculate: exact matches get full points, fuzzy matches get 70% credit
-        skill_score = (exact_matches + fuzzy_score) / len(job_skills)
-        total_score += skill_score * 3.0
+        skill_score = (exact_matches + fuzzy_score) / len(job.skills)
+        skill_points = skill_score * 3.0
     else:
         # No skills required = give partial credit (0.5 points) since it's easier
-        max_possible += 3.0
-        total_score += 0.5
-    
+        skill_points = 0.5
+    total_score += skill_points
+
     # 2. Description/Experience Keyword Matching (up to 1.5 points)
-    profile_text = ""
-    if profile.summary:
-        profile_text += profile.summary + " "
-    if profile.transcript_summary:
-        profile_text += profile.transcript_summary + " "
-    if profile.experience:
-        profile_text += profile.experience + " "
-    
-    if profile_text and job.description:
-        max_possible += 1.5
-        job_keywords = _extract_keywords(job.description)
-        profile_keywords = _extract_keywords(profile_text)
-        
-        if job_keywords:
-            matching_keywords = len(job_keywords & profile_keywords)
-            keyword_score = matching_keywords / len(job_keywords)
-            total_score += keyword_score * 1.5
+    max_possible += 1.5
+    keyword_points = 0.0
+    if profile.has_text and job.has_description:
+        if job.keywords:
+            keyword_score = len(job.keywords & profile.keywords) / len(job.keywords)
+            keyword_points = keyword_score * 1.5
         else:
             # No keywords extracted = small credit
-            total_score += 0.2
-    else:
-        # No profile text or job description = no credit
-        max_possible += 1.5
-    
+            keyword_points = 0.2
+    total_score += keyword_points
+
     # 3. Certifications Matching (up to 0.3 points) - Small weight
-    profile_certs = _normalize_list(profile.certifications_list)
-    job_certs = _normalize_list(job.required_certifications)
-    
-    if job_certs:
-        max_possible += 0.3
-        exact_cert_matches = len(job_certs & profile_certs)
+    max_possible += 0.3
+    cert_points = 0.0
+    if job.certifications:
+        exact_cert_matches = len(job.certifications & profile.certifications)
         if exact_cert_matches > 0:
-            cert_score = exact_cert_matches / len(job_certs)
-            total_score += cert_score * 0.3
+            cert_points = exact_cert_matches / len(job.certifications) * 0.3
     else:
         # No certs required = small credit
-        max_possible += 0.3
-        total_score += 0.1
-    
+        cert_points = 0.1
+    total_score += cert_points
+
     # 4. Role/Title Alignment (up to 0.2 points) - Small weight
     max_possible += 0.2
-    if job.role and profile.headline:
-        job_role = _normalize_text(job.role)
-        headline = _normalize_text(profile.headline)
-        
+    role_points = 0.0
+    if job.role is not None and profile.headline is not None:
         # Check if role appears in headline
-        if job_role in headline:
-            total_score += 0.2
-        else:
+        if job.role in profile.headline:
+            role_points = 0.2
+        elif job.role_words and profile.headline_words:
             # Check word overlap
-            job_words = set(job_role.split())
-            headline_words = set(headline.split())
-            if job_words and headline_words:
-                overlap = len(job_words & headline_words)
-                if overlap > 0:
-                    overlap_ratio = overlap / max(len(job_words), 1)
-                    total_score += overlap_ratio * 0.15
-    
+            overlap = len(job.role_words & profile.headline_words)
+            if overlap > 0:
+                overlap_ratio = overlap / max(len(job.role_words), 1)
+                role_points = overlap_ratio * 0.15
+    total_score += role_points
+
     # Normalize to 0-5 scale based on what's actually possible
-    # This ensures scores vary based on job requirements
-    if max_possible > 0:
-        normalized_score = (total_score / max_possible) * 5.0
-    else:
-        normalized_score = 0.0
-    
+    normalized_score = (total_score / max_possible) * 5.0
+
     # Round to 1 decimal place
-    return round(min(max(normalized_score, 0.0), 5.0), 1)
+    return ScoreBreakdown(
+        skills=skill_points,
+        keywords=keyword_points,
+        certifications=cert_points,
+        role=role_points,
+        score=round(min(max(normalized_score, 0.0), 5.0), 1),
+    )
+
+
+def score_features(profile: ProfileFeatures, job: JobFeatures) -> float:
+    """Score precomputed profile and job features (see calculate_match_score)."""
+    return score_breakdown(profile, job).score
+
+
+def score_bound_without_shared_terms(profile: ProfileFeatures) -> float:
+    """
+    Highest score a job can reach when it shares no skill word, certification
+    or description keyword with the profile. Such a job can only earn fuzzy
+    substring credit on skills (0.8 at 70%) plus the flat credits.
+    """
+    skill_points = 0.5  # Job without required skills
+    if profile.skills:
+        skill_points = max(skill_points, 0.8 * 0.7 * 3.0)
+    keyword_points = 0.2 if profile.has_text else 0.0
+    cert_points = 0.1
+    role_points = 0.2 if profile.headline is not None else 0.0
+    # Every section contributes to max_possible, so the 0-5 scale is 1:1
+    return round(skill_points + keyword_points + cert_points + role_points, 1)
+
+
+def calculate_match_score(profile: Profile | None, job: Job) -> float:
+    """
+    Calculate match score between profile and job (0-5 scale).
+
+    Scoring breakdown:
+    - Skills matching: 3.0 points (60%) - Most important
+    - Description/experience keyword matching: 1.5 points (30%)
+    - Certifications matching: 0.3 points (6%)
+    - Role/title alignment: 0.2 points (4%)
 
+    Returns a score from 0.0 to 5.0.
+    """
+    if profile is None:
+        return 0.0
+    return score_features(build_profile_features(profile), build_job_features(job))
 
-def update_job_match_score(job: Job, profile: Profile | None) -> None:
-    """Update the match score for a job based on the profile."""
-    job.match_score = calculate_match_score(profile, job)
 
+def score_profile_against_jobs(
+    profile: Profile | None,
+    jobs: Iterable[Job],
+) -> dict[int, float]:
+    """
+    Score one profile against many jobs, keyed by job id.
+
+    Profile features are built once for the whole batch instead of once per
+    job; each result equals ``calculate_match_score(profile, job)``.
+    """
+    if profile is None:
+        return {job.id: 0.0 for job in jobs}
+    profile_features = build_profile_features(profile)
+    return {
+        job.id: score_features(profile_features, build_job_features(job))
+        for job in jobs
+    }
+
+
+def refresh_match_scores(
+    profile: Profile | None,
+    job_ids: Iterable[int] | None = None,
+    archived: bool = False,
+) -> int:
+    """
+    Recompute the stored match scores for the profile's user that are missing
+    or out of date, i.e. the profile or the job changed since the score was
+    computed, among the given ``job_ids`` or else every active (with
+    ``archived``, every archived) listed job. Returns the number
+    of scores written; 0 means nothing was stale and no write transaction
+    was opened.
+    """
+    if profile is None or profile.user_id is None:
+        return 0
+
+    if job_ids is not None:
+        job_ids = list(job_ids)
+        if not job_ids:
+            return 0
+        criteria = [Job.id.in_(job_ids)]
+    elif archived:
+        criteria = [listed_jobs_filter(), Job.posted_at < archive_threshold()]
+    else:
+        criteria = [listed_jobs_filter(), Job.posted_at >= archive_threshold()]
+
+    stale_rows = (
+        db.session.query(Job, JobMatchScore)
+        .outerjoin(
+            JobMatchScore,
+            and_(
+                JobMatchScore.job_id == Job.id,
+                JobMatchScore.user_id == profile.user_id,
+            ),
+        )
+        .filter(
+            *criteria,
+            or_(
+                JobMatchScore.id.is_(None),
+                JobMatchScore.job_version != Job.content_version,
+                JobMatchScore.profile_updated_at != profile.updated_at,
+            ),
+        )
+        .all()
+    )
+    if not stale_rows:
+        return 0
+
+    scores = score_profile_against_jobs(profile, [job for job, _ in stale_rows])
+    for job, stored in stale_rows:
+        if stored is None:
+            stored = JobMatchScore(user_id=profile.user_id, job_id=job.id)
+            db.session.add(stored)
+        stored.score = scores[job.id]
+        stored.profile_updated_at = profile.updated_at
+        stored.job_version = job.content_version
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent request for the same user already stored these scores.
+        db.session.rollback()
+        return 0
+    return len(stale_rows)
+
+
+# (user id, archived) -> (catalog version, profile version) its listed jobs'
+# scores were last brought up to date at by this process
+_listed_refreshes: dict[tuple[int, bool], tuple] = {}
+_listed_refreshes_lock = threading.Lock()
+_LISTED_REFRESHES_MAX = 10000
+
+
+def refresh_listed_match_scores(profile: Profile | None, catalog_version: int, archived: bool = False) -> int:
+    """
+    ``refresh_match_scores`` for every active (or archived) listed job, which
+    sorting by match needs, unless this process already did it at the same
+    catalog and profile versions: new or changed jobs always bump the
+    catalog version. Another process's refresh only costs one stale-score
+    scan that finds nothing.
+    """
+    if profile is None or profile.user_id is None:
+        return 0
+    key = (profile.user_id, archived)
+    versions = (catalog_version, profile.updated_at)
+    if _listed_refreshes.get(key) == versions:
+        return 0
+    written = refresh_match_scores(profile, archived=archived)
+    with _listed_refreshes_lock:
+        if len(_listed_refreshes) >= _LISTED_REFRESHES_MAX:
+            _listed_refreshes.clear()
+        _listed_refreshes[key] = versions
+    return written
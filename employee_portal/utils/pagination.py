@@ -0,0 +1,86 @@
+"""
+Keyset (seek) pagination.
+A page is fetched with ``WHERE (sort columns) < (last row's values)`` instead
+of an OFFSET, so every page costs the same however deep it is. Sort orders
+must end in a unique column so the position of a row is unambiguous.
+Cursors are the last row's sort values, signed so they can be passed back
+in URLs as-is.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import tuple_
+
+
+class KeysetOrder(NamedTuple):
+    """
+    ``columns`` in significance order, all sorted in one direction (a
+    composite index on the same columns serves the seek). ``row_values``
+    extracts a row's values for those columns.
+    """
+
+    columns: Callable[[], Sequence]
+    row_values: Callable[[Any], Sequence]
+    descending: bool = True
+
+
+class InvalidCursor(ValueError):
+    """The cursor was tampered with or belongs to a different sort order."""
+
+
+def _serializer() -> URLSafeSerializer:
+    return URLSafeSerializer(current_app.secret_key, salt="keyset-cursor")
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(order_name: str, values: Sequence) -> str:
+    return _serializer().dumps([order_name, [_dump_value(value) for value in values]])
+
+
+def decode_cursor(order_name: str, cursor: str) -> list:
+    try:
+        name, values = _serializer().loads(cursor)
+    except (BadSignature, TypeError, ValueError) as exc:
+        raise InvalidCursor("Malformed page cursor") from exc
+    if name != order_name:
+        raise InvalidCursor("Page cursor belongs to a different sort order")
+    return [_load_value(value) for value in values]
+
+
+def keyset_page(query, order_name: str, order: KeysetOrder, cursor: str | None, limit: int):  # noqa: ANN001, ANN201
+    """
+    Return ``(rows, next_cursor)`` for the page after ``cursor`` (the first
+    page when None). ``next_cursor`` is None on the last page.
+    """
+    columns = list(order.columns())
+    if cursor:
+        values = decode_cursor(order_name, cursor)
+        if len(values) != len(columns):
+            raise InvalidCursor("Page cursor does not match the sort order")
+        position = tuple_(*columns)
+        seek = tuple_(*values)
+        query = query.filter(position < seek if order.descending else position > seek)
+
+    query = query.order_by(*(column.desc() if order.descending else column.asc() for column in columns))
+    # One extra row tells whether another page follows
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(order_name, order.row_values(rows[-1]))
@@ -0,0 +1,5 @@
+"""WSGI entry point for gunicorn: the app with its background loops running."""
+from employee_portal import create_app, start_background_tasks
+
+app = create_app()
+start_background_tasks(app)
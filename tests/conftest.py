@@ -0,0 +1,79 @@
+import pytest
+
+from employee_portal import create_app, db
+from employee_portal.config import TestingConfig
+from employee_portal.services.job_sync_service import apply_job_payloads
+
+PASSWORD = "Password123!"
+
+
+class Config(TestingConfig):
+    WTF_CSRF_ENABLED = False
+    EMPLOYER_API_ENABLED = False
+    EMPLOYER_WEBHOOK_SECRET = "test-secret"
+    ADMIN_EMAILS = frozenset({"admin@example.com"})
+
+
+@pytest.fixture()
+def app():
+    app = create_app(Config)
+    with app.app_context():
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture()
+def client(app):
+    return app.test_client()
+
+
+def register(client, username: str, email: str) -> None:
+    client.post(
+        "/auth/register",
+        data={"username": username, "email": email, "password": PASSWORD, "confirm_password": PASSWORD},
+    )
+    client.post("/auth/login", data={"email": email, "password": PASSWORD})
+
+
+def complete_profile(client) -> None:
+    client.post(
+        "/profile/",
+        data={
+            "headline": "Line Cook",
+            "summary": "Kitchen prep and grill work",
+            "skills": "Cooking, Food Safety",
+            "certifications": "ServSafe",
+            "experience": "Three years on the line",
+        },
+    )
+
+
+@pytest.fixture()
+def user_client(client):
+    register(client, "user0", "user0@example.com")
+    complete_profile(client)
+    return client
+
+
+@pytest.fixture()
+def jobs(app):
+    """Five synced jobs; returns their ids in feed order."""
+    from employee_portal.models.job import Job
+
+    payloads = [
+        {
+            "id": str(100 + number),
+            "title": f"Job {number}",
+            "role": "Line Cook" if number % 2 else "Server",
+            "company": "Acme Corp",
+            "location": "Denver",
+            "description": "Grill and prep work in a busy kitchen",
+            "required_skills": ["Cooking"],
+            "required_certifications": ["ServSafe"],
+        }
+        for number in range(5)
+    ]
+    apply_job_payloads(payloads)
+    return [
+        Job.query.filter_by(external_id=payload["id"]).one().id for payload in payloads
+    ]
@@ -0,0 +1,41 @@
+"""Random scoring features for comparing the indexes against brute force."""
+import random
+
+from employee_portal.utils.match_scoring import JobFeatures, ProfileFeatures, SkillMatcher
+
+SKILLS = ["cooking", "food safety", "grill", "prep", "cashier", "sql"]
+CERTS = ["servsafe", "cpr", "forklift"]
+KEYWORDS = ["kitchen", "busy", "guests", "warehouse", "shift", "team"]
+ROLES = ["line cook", "server", "warehouse associate", None]
+
+
+def _sample(rng: random.Random, population: list[str]) -> frozenset[str]:
+    return frozenset(rng.sample(population, rng.randint(0, 3)))
+
+
+def job_features(rng: random.Random) -> JobFeatures:
+    keywords = _sample(rng, KEYWORDS)
+    role = rng.choice(ROLES)
+    return JobFeatures(
+        skills=_sample(rng, SKILLS),
+        certifications=_sample(rng, CERTS),
+        keywords=keywords,
+        has_description=bool(keywords) or rng.random() < 0.2,
+        role=role,
+        role_words=frozenset(role.split()) if role else frozenset(),
+    )
+
+
+def profile_features(rng: random.Random, matcher_class: type = SkillMatcher) -> ProfileFeatures:
+    skills = _sample(rng, SKILLS)
+    keywords = _sample(rng, KEYWORDS)
+    headline = rng.choice(ROLES)
+    return ProfileFeatures(
+        skills=skills,
+        certifications=_sample(rng, CERTS),
+        keywords=keywords,
+        has_text=bool(keywords),
+        headline=headline,
+        headline_words=frozenset(headline.split()) if headline else frozenset(),
+        skill_matcher=matcher_class(skills),
+    )
@@ -0,0 +1,17 @@
+from tests.conftest import register
+
+
+def test_admin_pages_need_an_admin_account(client):
+    register(client, "user0", "user0@example.com")
+    assert client.get("/applications/admin").status_code == 403
+    assert client.get("/applications/admin/export.csv").status_code == 403
+
+
+def test_admin_can_export(client):
+    register(client, "admin", "admin@example.com")
+    assert client.get("/applications/admin").status_code == 200
+
+    response = client.get("/applications/admin/export.csv")
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    assert response.get_data(as_text=True).splitlines()[0].startswith("application_id,submitted_at,status,")
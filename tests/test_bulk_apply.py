@@ -0,0 +1,44 @@
+from employee_portal import db
+from employee_portal.models.application import Application
+from employee_portal.models.job import Job
+
+
+def test_requires_a_list_of_ids(user_client):
+    assert user_client.post("/applications/apply/bulk", json={"job_ids": "1"}).status_code == 400
+    assert user_client.post("/applications/apply/bulk", json={"job_ids": [True]}).status_code == 400
+    assert user_client.post("/applications/apply/bulk", json={"job_ids": list(range(51))}).status_code == 400
+
+
+def test_reports_a_result_per_job(user_client, jobs):
+    first, second, third = jobs[:3]
+    assert user_client.post(f"/applications/apply/{first}", data={"resume_link": "", "cover_letter": ""}).status_code == 302
+    placeholder = Job(
+        external_id="restored_1",
+        title="Restored",
+        role="Unknown",
+        role_slug="unknown",
+        company="Acme Corp",
+        location="Denver",
+        description="",
+        required_skills=[],
+        required_certifications=[],
+    )
+    db.session.add(placeholder)
+    db.session.commit()
+
+    response = user_client.post(
+        "/applications/apply/bulk",
+        json={"job_ids": [first, second, 9999, second, placeholder.id, third]},
+    )
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["applied"] == 2
+    results = {result["job_id"]: result for result in data["results"]}
+    assert [result["job_id"] for result in data["results"]] == [first, second, 9999, placeholder.id, third]
+    assert results[first]["status"] == "duplicate"
+    assert results[9999]["status"] == "not_found"
+    assert results[placeholder.id]["status"] == "unavailable"
+    for job_id in (second, third):
+        assert results[job_id]["status"] == "applied"
+        assert db.session.get(Application, results[job_id]["application_id"]).job_id == job_id
@@ -0,0 +1,25 @@
+import random
+
+from employee_portal.utils.candidate_index import ProfileTermIndex
+from employee_portal.utils.match_scoring import ScanSkillMatcher, score_breakdown
+
+from tests.factories import job_features, profile_features
+
+
+def test_top_k_agrees_with_brute_force():
+    rng = random.Random(99)
+    for _ in range(100):
+        profiles = {
+            user_id: profile_features(rng, matcher_class=ScanSkillMatcher)
+            for user_id in range(1, rng.randint(1, 30))
+        }
+        index = ProfileTermIndex(profiles.items())
+        job = job_features(rng)
+        limit = rng.randint(1, 8)
+
+        # Best score first, ties to the lower user id
+        expected = sorted(
+            ((score_breakdown(features, job).score, -user_id) for user_id, features in profiles.items()),
+            reverse=True,
+        )[:limit]
+        assert [(match.score, -match.user_id) for match in index.top_k(job, limit)] == expected
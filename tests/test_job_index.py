@@ -0,0 +1,67 @@
+import heapq
+import random
+from datetime import datetime, timedelta
+
+from employee_portal.utils.job_index import JobTermIndex
+from employee_portal.utils.match_scoring import score_features
+
+from tests.factories import job_features, profile_features
+
+NOW = datetime(2026, 1, 1)
+
+
+def _brute_force(entries, profile, limit, posted_since=None):  # noqa: ANN001
+    scored = (
+        (score_features(profile, features), posted_at, job_id)
+        for job_id, posted_at, features in entries
+        if posted_since is None or posted_at >= posted_since
+    )
+    return [(job_id, score) for score, _, job_id in heapq.nlargest(limit, scored)]
+
+
+def _entries(rng: random.Random, count: int, first_id: int = 1) -> list:
+    return [
+        (job_id, NOW - timedelta(days=rng.randint(0, 60)), job_features(rng))
+        for job_id in range(first_id, first_id + count)
+    ]
+
+
+def test_top_k_agrees_with_brute_force():
+    rng = random.Random(42)
+    for _ in range(100):
+        entries = _entries(rng, rng.randint(0, 30))
+        index = JobTermIndex(entries)
+        profile = profile_features(rng)
+        limit = rng.randint(1, 8)
+        posted_since = rng.choice([None, NOW - timedelta(days=30)])
+        assert index.top_k(profile, limit, posted_since) == _brute_force(entries, profile, limit, posted_since)
+
+
+def test_with_changes_matches_a_rebuilt_index():
+    rng = random.Random(7)
+    entries = _entries(rng, 20)
+    changed = _entries(rng, 5, first_id=15)  # 15-19 replaced, nothing new
+    added = _entries(rng, 3, first_id=21)
+    removed = {2, 3}
+
+    patched = JobTermIndex(entries).with_changes(changed + added, removed)
+    current = {job_id: (job_id, posted_at, features) for job_id, posted_at, features in entries + changed + added}
+    expected = [entry for job_id, entry in current.items() if job_id not in removed]
+
+    assert len(patched) == len(expected)
+    for _ in range(20):
+        profile = profile_features(rng)
+        assert patched.top_k(profile, 5) == _brute_force(expected, profile, 5)
+
+
+def test_with_changes_leaves_the_original_untouched():
+    rng = random.Random(3)
+    entries = _entries(rng, 10)
+    original = JobTermIndex(entries)
+    profile = profile_features(rng)
+    before = original.top_k(profile, 10)
+
+    original.with_changes(_entries(rng, 4, first_id=1), removed_job_ids=[5, 6])
+
+    assert len(original) == 10
+    assert original.top_k(profile, 10) == before
@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta
+
+from employee_portal import db
+from employee_portal.models.sync_state import SyncState
+from employee_portal.services.lease_service import acquire_lease, release_lease
+
+
+def test_lease_is_not_reentrant(app):
+    token = acquire_lease("test", ttl_seconds=60)
+    assert token is not None
+    assert acquire_lease("test", ttl_seconds=60) is None
+
+    release_lease("test", token)
+    assert acquire_lease("test", ttl_seconds=60) is not None
+
+
+def test_release_with_another_token_keeps_the_lease(app):
+    token = acquire_lease("test", ttl_seconds=60)
+    release_lease("test", "someone-else")
+    assert acquire_lease("test", ttl_seconds=60) is None
+    release_lease("test", token)
+
+
+def test_expired_lease_can_be_taken_over(app):
+    stale = acquire_lease("test", ttl_seconds=60)
+    db.session.get(SyncState, "test").lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+
+    fresh = acquire_lease("test", ttl_seconds=60)
+    assert fresh is not None and fresh != stale
+    # The late release of the old holder does not free the new lease
+    release_lease("test", stale)
+    assert acquire_lease("test", ttl_seconds=60) is None
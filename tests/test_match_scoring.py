@@ -0,0 +1,28 @@
+import random
+
+from employee_portal.utils.match_scoring import ScanSkillMatcher, SkillMatcher, _fuzzy_match
+
+WORDS = ["food", "safety", "cook", "cooking", "line", "grill", "prep", "sql", "excel", "c", "ai", "serv", "servsafe"]
+
+
+def _random_skill(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+
+
+def test_skill_matcher_agrees_with_scan():
+    rng = random.Random(1234)
+    for _ in range(200):
+        skills = {_random_skill(rng) for _ in range(rng.randint(0, 8))}
+        indexed = SkillMatcher(skills)
+        scanned = ScanSkillMatcher(skills)
+        for _ in range(10):
+            skill = _random_skill(rng)
+            assert indexed.best_match(skill) == scanned.best_match(skill), (skills, skill)
+
+
+def test_skill_matcher_matches_lists_every_positive_score():
+    skills = {"food safety", "cooking", "line cook", "c"}
+    matcher = SkillMatcher(skills)
+    for skill in ["cook", "food", "safety certified", "c", "welding"]:
+        expected = {other: _fuzzy_match(other, skill) for other in skills}
+        assert matcher.matches(skill) == {other: score for other, score in expected.items() if score > 0}
@@ -0,0 +1,44 @@
+from datetime import datetime
+
+import pytest
+
+from employee_portal.utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip(app):
+    values = [4.5, datetime(2026, 3, 1, 12, 30, 15, 250), "Line Cook", 17]
+    assert decode_cursor("rating", encode_cursor("rating", values)) == values
+
+
+def test_tampered_cursor_is_rejected(app):
+    cursor = encode_cursor("rating", [4.5, 17])
+    with pytest.raises(InvalidCursor):
+        decode_cursor("rating", cursor[:-2] + ("AA" if not cursor.endswith("AA") else "BB"))
+    with pytest.raises(InvalidCursor):
+        decode_cursor("rating", "not-a-cursor")
+
+
+def test_cursor_of_another_order_is_rejected(app):
+    with pytest.raises(InvalidCursor):
+        decode_cursor("title", encode_cursor("rating", [4.5, 17]))
+
+
+@pytest.mark.parametrize("sort_by", ["match_score", "rating", "posted_at", "title"])
+def test_api_pages_cover_every_job_once(user_client, jobs, sort_by):
+    seen = []
+    params = {"filter-sort_by": sort_by, "limit": 2}
+    while True:
+        response = user_client.get("/api/jobs", query_string=params)
+        assert response.status_code == 200
+        data = response.get_json()
+        seen.extend(job["id"] for job in data["jobs"])
+        if data["next_cursor"] is None:
+            break
+        params["cursor"] = data["next_cursor"]
+
+    assert sorted(seen) == sorted(jobs)
+
+
+def test_api_rejects_a_bad_cursor(user_client, jobs):
+    response = user_client.get("/api/jobs", query_string={"cursor": "bogus"})
+    assert response.status_code == 400
@@ -0,0 +1,80 @@
+import hashlib
+import hmac
+import json
+import time
+
+from employee_portal import db
+from employee_portal.models.application import Application
+from employee_portal.models.user import User
+from employee_portal.services.application_status_service import verify_signature
+
+from tests.conftest import register
+
+
+def _signature(body: bytes, timestamp: str, secret: str = "test-secret") -> str:
+    digest = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def _post(client, payload, timestamp: str | None = None, signature: str | None = None):  # noqa: ANN001, ANN201
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    timestamp = timestamp or str(int(time.time()))
+    return client.post(
+        "/applications/webhooks/status",
+        data=body,
+        content_type="application/json",
+        headers={
+            "X-Webhook-Timestamp": timestamp,
+            "X-Webhook-Signature": signature or _signature(body, timestamp),
+        },
+    )
+
+
+def test_verify_signature(app):
+    body = b'{"updates": []}'
+    now = str(int(time.time()))
+    assert verify_signature(body, now, _signature(body, now))
+    assert not verify_signature(body + b" ", now, _signature(body, now))
+    assert not verify_signature(body, now, _signature(body, now, secret="other"))
+    assert not verify_signature(body, now, None)
+    assert not verify_signature(body, "soon", _signature(body, "soon"))
+
+    stale = str(int(time.time()) - 3600)
+    assert not verify_signature(body, stale, _signature(body, stale))
+
+
+def test_rejects_bad_signatures(client):
+    response = _post(client, {"updates": []}, signature="sha256=0")
+    assert response.status_code == 401
+
+
+def test_rejects_malformed_bodies(client):
+    assert _post(client, [1, 2]).status_code == 400
+    assert _post(client, {"updates": "x"}).status_code == 400
+
+
+def test_applies_status_updates(client, jobs):
+    register(client, "user0", "user0@example.com")
+    user = User.query.filter_by(email="user0@example.com").one()
+    db.session.add(
+        Application(user=user, job_id=jobs[0], skills=[], certifications=[], external_id="ext-1"),
+    )
+    db.session.commit()
+
+    response = _post(
+        client,
+        {
+            "updates": [
+                {"application_id": "ext-1", "status": "interview"},
+                {"application_id": "missing", "status": "rejected"},
+                {"application_id": ["ext-1"], "status": "hired"},
+                {"application_id": "ext-1"},
+                "not an entry",
+            ],
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.get_json() == {"updated": 1, "unchanged": 0, "unknown": ["missing"], "invalid": 3}
+    db.session.expire_all()
+    assert Application.query.filter_by(external_id="ext-1").one().status == "interview"